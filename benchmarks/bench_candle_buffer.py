@@ -0,0 +1,38 @@
+"""
+Бенчмарк CandleBuffer: вартість append має лишатися сталою на 1M додаваннях.
+
+    python -m benchmarks.bench_candle_buffer [--appends 1000000] [--capacity 5000]
+"""
+import argparse
+import time
+
+from core.candle_buffer import CandleBuffer
+
+
+def run(appends: int = 1_000_000, capacity: int = 5000, chunks: int = 10) -> list:
+    buf = CandleBuffer(capacity)
+    chunk = appends // chunks
+    results = []
+    t = 0
+    for i in range(chunks):
+        start = time.perf_counter()
+        for _ in range(chunk):
+            buf.append(t, 1.0, 1.1, 0.9, 1.05, 100.0)
+            t += 60_000
+        elapsed = time.perf_counter() - start
+        results.append((chunk * (i + 1), elapsed / chunk * 1e9))
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--appends", type=int, default=1_000_000)
+    parser.add_argument("--capacity", type=int, default=5000)
+    args = parser.parse_args()
+
+    rows = run(args.appends, args.capacity)
+    print(f"CandleBuffer(capacity={args.capacity}), {args.appends} appends")
+    for total, ns in rows:
+        print(f"  after {total:>9}: {ns:8.0f} ns/append")
+    first, last = rows[0][1], rows[-1][1]
+    print(f"last/first chunk ratio: {last / first:.2f}")
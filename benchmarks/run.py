@@ -0,0 +1,234 @@
+"""
+Набір бенчмарків: індикатори, стратегії, бектести та live-обробка kline.
+
+    python -m benchmarks.run --size 100000 --output bench.json
+    python -m benchmarks.run --size 100000 --baseline bench.json --threshold 0.25
+
+Працює офлайн: дані синтетичні, без Tk і без звернень до біржі.
+З --baseline код виходу 1, якщо якийсь бенчмарк повільніший за базу більше ніж на threshold.
+"""
+import argparse
+import atexit
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.synthetic import kline_messages, synthetic_ohlcv, write_message_log
+from core import backtest, indicators, montecarlo, portfolio, signals
+from core.archive import CandleArchive
+from core.candle_buffer import CandleBuffer
+from core.daemon import SignalDaemon
+from core.indicator_cache import cache
+from core.instrumentation import tracer
+from core.live import LiveSession
+import run_daemon
+from run_replay import replay_headless
+
+GROUPS = ("indicators", "signals", "backtest", "live", "archive")
+
+
+def timeit(func, repeat: int = 3) -> dict:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return {"best": min(times), "mean": sum(times) / len(times), "repeat": repeat}
+
+
+class _NullSink:
+    """Sink для LiveSession, що лише рахує події (замість черги GUI)."""
+
+    def __init__(self):
+        self.events = 0
+
+    def set_candle(self, *args):
+        self.events += 1
+
+    def add_signal(self, *args):
+        self.events += 1
+
+    def log(self, *args):
+        self.events += 1
+
+
+def benchmarks(df: pd.DataFrame, messages: int) -> dict:
+    """Назва → функція без аргументів. Групи - префікс до крапки."""
+    replay_df = df.tail(messages + 100)
+    history, stream = replay_df.iloc[:100], list(kline_messages(replay_df.iloc[100:], ticks_per_bar=2))
+    closes = df["close"].to_numpy()
+    ema_sigs = signals.ema_crossover_series(df)
+    # 10 000 "угод" з дохідностей барів - незалежно від кількості сигналів на синтетиці
+    mc_closes = closes[:10_001]
+    mc_returns = np.diff(mc_closes) / mc_closes[:-1]
+    # 10 пар з різним початком історії - вирівнювання на об'єднаний індекс
+    portfolio_frames = {f"SYM{i}": df.iloc[i:] for i in range(10)}
+
+    def live_replay(strategy, traced=False):
+        def run():
+            session = LiveSession(capacity=5000, strategy=strategy, sink=_NullSink())
+            session.load(history)
+            tracer.enabled = traced
+            try:
+                for msg in stream:
+                    session.process_kline(msg, tracer.now())
+            finally:
+                tracer.enabled = False
+                tracer.reset()
+        return run
+
+    # журнал для реплею (core/recorder.py) з тих самих повідомлень
+    fd, log_path = tempfile.mkstemp(suffix=".bin")
+    os.close(fd)
+    os.remove(log_path)
+    write_message_log(log_path, replay_df.iloc[100:], ticks_per_bar=2)
+    atexit.register(os.remove, log_path)
+
+    # 100 пар в одному потоці для headless-демона: ті самі повідомлення загалом
+    symbols = [f"SYM{i:03d}USDT" for i in range(100)]
+    fd, daemon_log = tempfile.mkstemp(suffix=".bin")
+    os.close(fd)
+    os.remove(daemon_log)
+    write_message_log(daemon_log, replay_df.iloc[100:100 + max(1, messages // len(symbols))], ticks_per_bar=2,
+                      symbols=symbols)
+    atexit.register(os.remove, daemon_log)
+
+    def daemon_replay():
+        daemon = SignalDaemon(symbols, ("1m", "5m", "15m"))
+        for symbol in symbols:
+            daemon.warm_up(symbol, history)
+        run_daemon.run_replay(daemon, daemon_log)
+
+    # колонковий архів з тих самих свічок: memmap-подання проти читання в пам'ять
+    archive_root = tempfile.mkdtemp()
+    archive = CandleArchive("BENCH", "1m", root=archive_root)
+    archive.append_frame(df)
+    atexit.register(shutil.rmtree, archive_root, True)
+
+    def ema_sweep():
+        # спільні періоди рахуються один раз за прогін
+        cache.clear()
+        for fast in range(5, 15, 2):
+            for slow in range(20, 40, 4):
+                signals.ema_crossover_series(df, fast, slow)
+
+    def cold(func, *args, **kwargs):
+        # кожен прогін з порожнім кешем індикаторів - інакше best-of-N міряє влучання в кеш
+        def run():
+            cache.clear()
+            return func(*args, **kwargs)
+        return run
+
+    def buffer_append():
+        buf = CandleBuffer(5000)
+        for i in range(messages):
+            buf.append(i, 1.0, 1.1, 0.9, 1.05, 100.0)
+
+    return {
+        "indicators.sma": lambda: indicators.sma(df, 14),
+        "indicators.ema": lambda: indicators.ema(df, 14),
+        "indicators.rsi": lambda: indicators.rsi(df, 14),
+        "indicators.macd": lambda: indicators.macd(df),
+        "indicators.bollinger_bands": lambda: indicators.bollinger_bands(df),
+        "signals.ema_crossover": cold(signals.ema_crossover, df),
+        "signals.rsi_strategy": cold(signals.rsi_strategy, df),
+        "signals.macd_strategy": cold(signals.macd_strategy, df),
+        "signals.ema_crossover_series": cold(signals.ema_crossover_series, df),
+        "signals.rsi_strategy_series": cold(signals.rsi_strategy_series, df),
+        "signals.macd_strategy_series": cold(signals.macd_strategy_series, df),
+        # ті самі ряди з кешу (влучання: звірка контрольної суми без перерахунку)
+        "signals.ema_crossover_series_cached": lambda: signals.ema_crossover_series(df),
+        "signals.macd_strategy_series_cached": lambda: signals.macd_strategy_series(df),
+        "signals.ema_crossover_sweep": ema_sweep,
+        "backtest.backtest_ema_crossover": cold(backtest.backtest_ema_crossover, df),
+        "backtest.run_backtest_pipeline": cold(lambda: backtest.long_only_backtest(df, backtest.strategy_signals("EMA", df))),
+        "backtest.simulate": lambda: backtest.simulate(closes, ema_sigs, long_short=True, taker_fee=0.0004),
+        "backtest.monte_carlo_1000": lambda: montecarlo.monte_carlo(mc_returns, 1000, seed=0),
+        "backtest.portfolio_10_symbols": cold(portfolio.portfolio_backtest, portfolio_frames, "EMA"),
+        "live.handle_kline_ema": live_replay("EMA"),
+        "live.handle_kline_rsi": live_replay("RSI"),
+        "live.handle_kline_macd": live_replay("MACD"),
+        "live.handle_kline_macd_traced": live_replay("MACD", traced=True),
+        "live.replay_log_macd": lambda: replay_headless(log_path, "MACD"),
+        "live.candle_buffer_append": buffer_append,
+        "live.daemon_replay_100_symbols": daemon_replay,
+        "archive.frame": lambda: archive.frame(),
+        "archive.load": lambda: archive.load(),
+        "archive.frame_ema": lambda: indicators.ema(archive.frame(), 14),
+    }
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list:
+    """Повертає [(назва, база, зараз, відношення)] для бенчмарків, що сповільнились понад threshold."""
+    regressions = []
+    for name, current in results.items():
+        base = baseline.get(name)
+        if not base:
+            continue
+        ratio = current["best"] / base["best"] if base["best"] > 0 else float("inf")
+        if ratio > 1 + threshold:
+            regressions.append((name, base["best"], current["best"], ratio))
+    return regressions
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="DogeTrade benchmarks")
+    parser.add_argument("--size", type=int, default=100_000, help="Кількість свічок (до 10M)")
+    parser.add_argument("--messages", type=int, default=10_000, help="Kline-свічок для live-реплею")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--only", help=f"Групи через кому: {','.join(GROUPS)}")
+    parser.add_argument("--output", help="Записати результати в JSON")
+    parser.add_argument("--baseline", help="JSON попереднього запуску для порівняння")
+    parser.add_argument("--threshold", type=float, default=0.25, help="Допустиме сповільнення (0.25 = +25%%)")
+    args = parser.parse_args(argv)
+
+    df = synthetic_ohlcv(args.size, seed=args.seed)
+    groups = set(args.only.split(",")) if args.only else set(GROUPS)
+
+    results = {}
+    for name, func in benchmarks(df, min(args.messages, args.size - 100)).items():
+        if name.split(".")[0] not in groups:
+            continue
+        results[name] = timeit(func, args.repeat)
+        print(f"{name:<36} {results[name]['best'] * 1000:10.2f} ms")
+
+    report = {
+        "meta": {
+            "size": args.size,
+            "messages": args.messages,
+            "seed": args.seed,
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "pandas": pd.__version__,
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        if baseline.get("meta", {}).get("size") != args.size:
+            print("⚠️ baseline was recorded with a different --size")
+        regressions = compare(results, baseline.get("results", {}), args.threshold)
+        for name, base, current, ratio in regressions:
+            print(f"REGRESSION {name}: {base * 1000:.2f} ms → {current * 1000:.2f} ms (x{ratio:.2f})")
+        if regressions:
+            return 1
+        print("No regressions against baseline")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,118 @@
+"""
+Бенчмарк старту: час імпорту модулів (розбивка як у `python -X importtime`) і час до
+першого кадру вікна (`main.py --offline --probe-startup`).
+
+    python -m benchmarks.startup --output startup.json
+    python -m benchmarks.startup --baseline startup.json --threshold 0.25
+    python -m benchmarks.startup --no-gui --top 20
+
+Кожен замір - окремий процес (холодний інтерпретатор), мережа не потрібна.
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+
+from benchmarks.run import compare
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MODULES = ("core.database", "core.binance_api", "core.live", "core.backtest", "ui.main_window")
+
+
+def import_time(module: str) -> list:
+    """[(self_us, cumulative_us, модуль)] з `-X importtime` для `import module` у новому процесі."""
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                          cwd=ROOT, capture_output=True, text=True)
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else "import failed")
+    rows = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        rows.append((int(self_us), int(cumulative_us), name.rstrip()))
+    return rows
+
+
+def first_frame_time(timeout: float = 60.0) -> float:
+    """Секунди від запуску процесу до першого намальованого кадру (разом зі стартом інтерпретатора)."""
+    start = time.perf_counter()
+    proc = subprocess.Popen([sys.executable, "main.py", "--offline", "--probe-startup"], cwd=ROOT,
+                            stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+    try:
+        for line in proc.stdout:
+            if line.startswith("first_frame_ms="):
+                return time.perf_counter() - start
+        raise RuntimeError(proc.stderr.read().strip().splitlines()[-1] if proc.returncode else "no frame")
+    finally:
+        try:
+            proc.wait(timeout)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+
+
+def best_of(func, repeat: int) -> dict:
+    times = [func() for _ in range(repeat)]
+    return {"best": min(times), "mean": sum(times) / len(times), "repeat": repeat}
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="DogeTrade startup benchmark")
+    parser.add_argument("--modules", nargs="*", default=list(MODULES))
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--top", type=int, default=10, help="Скільки найповільніших імпортів показати")
+    parser.add_argument("--no-gui", action="store_true", help="Без заміру першого кадру (немає дисплея)")
+    parser.add_argument("--output", help="Записати результати в JSON")
+    parser.add_argument("--baseline", help="JSON попереднього запуску для порівняння")
+    parser.add_argument("--threshold", type=float, default=0.25, help="Допустиме сповільнення (0.25 = +25%%)")
+    args = parser.parse_args(argv)
+
+    results = {}
+    for module in args.modules:
+        try:
+            runs = [import_time(module) for _ in range(args.repeat)]
+        except RuntimeError as e:
+            print(f"import.{module:<30} skipped: {e}")
+            continue
+        totals = [next(cum for _, cum, name in rows if name.strip() == module) / 1e6 for rows in runs]
+        results[f"import.{module}"] = {"best": min(totals), "mean": sum(totals) / len(totals), "repeat": args.repeat}
+        print(f"import.{module:<30} {min(totals) * 1000:10.2f} ms")
+        fastest = runs[totals.index(min(totals))]
+        for self_us, cumulative_us, name in sorted(fastest, reverse=True)[:args.top]:
+            print(f"    {self_us / 1000:8.2f} ms self {cumulative_us / 1000:9.2f} ms cum  {name.strip()}")
+
+    if not args.no_gui:
+        try:
+            results["startup.first_frame"] = best_of(first_frame_time, args.repeat)
+            print(f"{'startup.first_frame':<37} {results['startup.first_frame']['best'] * 1000:10.2f} ms")
+        except (RuntimeError, OSError) as e:
+            print(f"startup.first_frame skipped: {e}")
+
+    report = {
+        "meta": {
+            "python": platform.python_version(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline.get("results", {}), args.threshold)
+        for name, base, current, ratio in regressions:
+            print(f"REGRESSION {name}: {base * 1000:.2f} ms → {current * 1000:.2f} ms (x{ratio:.2f})")
+        if regressions:
+            return 1
+        print("No regressions against baseline")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
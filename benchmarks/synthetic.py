@@ -0,0 +1,70 @@
+"""Детермінований синтетичний генератор OHLCV (випадкове блукання) для бенчмарків."""
+import numpy as np
+import pandas as pd
+
+from core.recorder import MessageRecorder
+
+MAX_BARS = 10_000_000
+
+
+def synthetic_ohlcv(n: int, seed: int = 0, start: str = "2024-01-01", freq: str = "1min",
+                    start_price: float = 0.1, volatility: float = 0.002) -> pd.DataFrame:
+    """
+    Повертає n свічок у форматі `get_historical_futures_klines`.
+    Однаковий seed → однакові дані, тож результати бенчмарків порівнювані між запусками.
+    """
+    if not 0 < n <= MAX_BARS:
+        raise ValueError(f"n must be in 1..{MAX_BARS}")
+    rng = np.random.default_rng(seed)
+    close = start_price * np.exp(np.cumsum(rng.normal(0.0, volatility, n)))
+    open_ = np.empty(n)
+    open_[0] = start_price
+    open_[1:] = close[:-1]
+    spread = np.abs(rng.normal(0.0, volatility, n)) * close
+    high = np.maximum(open_, close) + spread
+    low = np.minimum(open_, close) - spread
+    volume = rng.lognormal(10.0, 1.0, n)
+    index = pd.date_range(start, periods=n, freq=freq, name="timestamp")
+    return pd.DataFrame({"open": open_, "high": high, "low": low, "close": close, "volume": volume},
+                        index=index)
+
+
+def kline_messages(df: pd.DataFrame, symbol: str = "DOGEUSDT", interval: str = "1m", ticks_per_bar: int = 1):
+    """
+    Генерує multiplex-повідомлення kline (як від `start_futures_multiplex_socket`) зі свічок df:
+    для кожної свічки `ticks_per_bar - 1` оновлень усередині бару і одне закриття.
+    """
+    times = df.index.values.astype("datetime64[ms]").astype(np.int64)
+    stream = f"{symbol.lower()}@kline_{interval}"
+    for t, (o, h, l, c, v) in zip(times, df[["open", "high", "low", "close", "volume"]].to_numpy()):
+        for tick in range(ticks_per_bar):
+            closed = tick == ticks_per_bar - 1
+            price = c if closed else o + (c - o) * (tick + 1) / ticks_per_bar
+            yield {"stream": stream, "data": {"e": "kline", "s": symbol, "k": {
+                "t": int(t), "i": interval, "o": f"{o:.8f}", "h": f"{h:.8f}", "l": f"{l:.8f}",
+                "c": f"{price:.8f}", "v": f"{v:.3f}", "x": closed,
+            }}}
+
+
+def multiplexed_messages(df: pd.DataFrame, symbols: list, interval: str = "1m", ticks_per_bar: int = 1):
+    """Повідомлення кількох пар упереміш, як з одного multiplex-з'єднання (у пар однакові свічки)."""
+    streams = [kline_messages(df, symbol, interval, ticks_per_bar) for symbol in symbols]
+    for batch in zip(*streams):
+        yield from batch
+
+
+def write_message_log(path: str, df: pd.DataFrame, symbol: str = "DOGEUSDT", interval: str = "1m",
+                      ticks_per_bar: int = 1, step: float = 0.01, symbols: list = None) -> int:
+    """
+    Пише kline-повідомлення зі свічок df у журнал `core/recorder.py` (кожне через step секунд).
+    З `symbols` - потік кількох пар (`multiplexed_messages`) замість однієї `symbol`.
+    """
+    recorder = MessageRecorder(path)
+    messages = (multiplexed_messages(df, symbols, interval, ticks_per_bar) if symbols
+                else kline_messages(df, symbol, interval, ticks_per_bar))
+    try:
+        for i, msg in enumerate(messages):
+            recorder.record("kline", msg, received=i * step)
+    finally:
+        recorder.close()
+    return recorder.count
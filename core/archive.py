@@ -0,0 +1,168 @@
+import json
+import os
+import shutil
+
+import numpy as np
+import pandas as pd
+
+# Колонковий архів свічок: для кожної пари symbol/interval - окремий каталог,
+# у якому кожна колонка лежить у власному "сирому" файлі фіксованої ширини.
+# Архів лише дописується в кінець, рядки відсортовані за open_time, тож відсортований
+# open_time.bin і є індексом за часом (пошук діапазону - бінарний).
+# OHLCV зберігаються як float64 або float32 (тип записаний у meta.json; без нього - float64).
+ARCHIVE_DIR = os.path.join(os.path.dirname(__file__), "..", "data")
+
+TIME_DTYPE = "<i8"
+DTYPES = ("<f8", "<f4")
+COLUMNS = ["open", "high", "low", "close", "volume"]
+FIELDS = [("open_time", TIME_DTYPE)] + [(name, "<f8") for name in COLUMNS]
+META_FILE = "meta.json"
+
+
+class CandleArchive:
+    """
+    Append-only колонковий архів свічок однієї пари та інтервалу.
+
+    `load` читає діапазон у пам'ять; `arrays`/`frame` повертають zero-copy `numpy.memmap`
+    подання, тож бектест на будь-якому відрізку торкається лише сторінок, які читає.
+    dtype - тип OHLCV для нового архіву ("<f8" або "<f4"); для наявного береться з meta.json.
+    """
+
+    def __init__(self, symbol: str, interval: str, root: str = None, path: str = None, dtype: str = None):
+        self.symbol = symbol.upper()
+        self.interval = interval
+        self.path = path or os.path.join(root or ARCHIVE_DIR, self.symbol, interval)
+        stored = self._stored_dtype()
+        if dtype is not None and np.dtype(dtype).str not in DTYPES:
+            raise ValueError(f"Unsupported archive dtype: {dtype}")
+        if dtype is not None and stored is not None and np.dtype(dtype) != np.dtype(stored):
+            raise ValueError(f"{self.path}: archive stores {stored}, not {dtype}")
+        self.dtype = np.dtype(stored or dtype or "<f8").str
+
+    def _file(self, name: str) -> str:
+        return os.path.join(self.path, f"{name}.bin")
+
+    def _stored_dtype(self):
+        try:
+            with open(os.path.join(self.path, META_FILE), encoding="utf-8") as f:
+                return json.load(f)["dtype"]
+        except FileNotFoundError:
+            # старі архіви без meta.json - float64
+            return "<f8" if os.path.exists(self._file("open_time")) else None
+
+    def _dtype_of(self, name: str) -> str:
+        return TIME_DTYPE if name == "open_time" else self.dtype
+
+    def __len__(self) -> int:
+        try:
+            return os.path.getsize(self._file("open_time")) // 8
+        except OSError:
+            return 0
+
+    def _read_time(self, position: int) -> int:
+        with open(self._file("open_time"), "rb") as f:
+            f.seek(position * 8)
+            return int(np.frombuffer(f.read(8), dtype="<i8")[0])
+
+    def first_open_time(self):
+        return self._read_time(0) if len(self) else None
+
+    def last_open_time(self):
+        n = len(self)
+        return self._read_time(n - 1) if n else None
+
+    def append(self, open_time, open_, high, low, close, volume) -> int:
+        """Дописує колонки в кінець; рядки, не новіші за останній, відкидаються."""
+        open_time = np.asarray(open_time, dtype="<i8")
+        last = self.last_open_time()
+        mask = slice(None) if last is None else open_time > last
+        columns = [open_time, open_, high, low, close, volume]
+        columns = [np.asarray(col)[mask] for col in columns]
+        if not len(columns[0]):
+            return 0
+
+        self._create()
+        for (name, _), col in zip(FIELDS, columns):
+            with open(self._file(name), "ab") as f:
+                f.write(np.ascontiguousarray(col, dtype=self._dtype_of(name)).tobytes())
+        return len(columns[0])
+
+    def _create(self):
+        os.makedirs(self.path, exist_ok=True)
+        meta = os.path.join(self.path, META_FILE)
+        if not os.path.exists(meta):
+            with open(meta, "w", encoding="utf-8") as f:
+                json.dump({"dtype": self.dtype}, f)
+
+    def append_frame(self, df: pd.DataFrame) -> int:
+        """Дописує свічки DataFrame у форматі `get_historical_futures_klines`."""
+        times = df.index.values.astype("datetime64[ms]").astype("<i8")
+        return self.append(times, *(df[name].to_numpy() for name in COLUMNS))
+
+    def append_klines(self, klines: list) -> int:
+        """Дописує сирі свічки у форматі відповіді `Client.futures_klines`."""
+        if not klines:
+            return 0
+        raw = np.array([k[:6] for k in klines], dtype=object)
+        return self.append(
+            raw[:, 0].astype("<i8"),
+            *(raw[:, i].astype("<f8") for i in range(1, 6)),
+        )
+
+    def append_archive(self, other: "CandleArchive"):
+        """Дописує в кінець усі рядки іншого архіву (потоково, без завантаження в пам'ять)."""
+        last = self.last_open_time()
+        first = other.first_open_time()
+        if first is None:
+            return
+        if last is not None and first <= last:
+            raise ValueError("append_archive: архіви перекриваються за часом")
+        if other.dtype != self.dtype:
+            raise ValueError("append_archive: різні типи колонок")
+        self._create()
+        for name, _ in FIELDS:
+            with open(other._file(name), "rb") as src, open(self._file(name), "ab") as dst:
+                shutil.copyfileobj(src, dst)
+
+    def replace_with(self, other: "CandleArchive"):
+        """Атомарно підміняє вміст цього архіву вмістом `other` (каталог переноситься)."""
+        backup = self.path + ".old"
+        if os.path.exists(self.path):
+            os.replace(self.path, backup)
+        os.replace(other.path, self.path)
+        shutil.rmtree(backup, ignore_errors=True)
+
+    def _range(self, times: np.ndarray, start_ms: int = None, end_ms: int = None) -> tuple:
+        lo = 0 if start_ms is None else int(np.searchsorted(times, start_ms, side="left"))
+        hi = len(times) if end_ms is None else int(np.searchsorted(times, end_ms, side="right"))
+        return lo, max(lo, hi)
+
+    def arrays(self, start_ms: int = None, end_ms: int = None) -> dict:
+        """
+        Zero-copy подання колонок (read-only `numpy.memmap`) для open_time у [start_ms, end_ms].
+        Відкриття не читає дані: сторінки підтягуються з диска при зверненні.
+        """
+        n = len(self)
+        if not n:
+            return {name: np.empty(0, dtype=self._dtype_of(name)) for name, _ in FIELDS}
+        maps = {name: np.memmap(self._file(name), dtype=self._dtype_of(name), mode="r", shape=(n,))
+                for name, _ in FIELDS}
+        lo, hi = self._range(maps["open_time"], start_ms, end_ms)
+        return {name: column[lo:hi] for name, column in maps.items()}
+
+    def frame(self, start_ms: int = None, end_ms: int = None) -> pd.DataFrame:
+        """
+        pandas-подання діапазону поверх memmap без копіювання (для `core/indicators.py`
+        і бектестів). Дані лише для читання; для змін - `load` або `.copy()`.
+        """
+        arrays = self.arrays(start_ms, end_ms)
+        index = pd.DatetimeIndex(arrays["open_time"].view("datetime64[ms]"), name="timestamp", copy=False)
+        return pd.DataFrame({name: arrays[name] for name in COLUMNS}, index=index, copy=False)
+
+    def load(self, start_ms: int = None, end_ms: int = None) -> pd.DataFrame:
+        """Читає свічки з open_time у [start_ms, end_ms] у форматі `get_historical_futures_klines`."""
+        if not len(self):
+            return pd.DataFrame(columns=COLUMNS, index=pd.DatetimeIndex([], name="timestamp"), dtype=float)
+        arrays = self.arrays(start_ms, end_ms)
+        index = pd.DatetimeIndex(pd.to_datetime(np.array(arrays["open_time"]), unit="ms"), name="timestamp")
+        return pd.DataFrame({name: np.array(arrays[name]) for name in COLUMNS}, index=index)
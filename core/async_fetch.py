@@ -0,0 +1,182 @@
+import argparse
+import asyncio
+import time
+
+from core import binance_api, kline_store
+from core.downloader import DEFAULT_WEIGHT_PER_MINUTE, _pages, klines_weight, to_ms
+
+try:
+    import aiohttp
+except ImportError:  # необов'язкова залежність: потрібна лише для пакетного завантаження
+    aiohttp = None
+
+# Пакетне завантаження історії для багатьох пар та інтервалів одночасно:
+# один пул HTTP-з'єднань (keep-alive), кілька запитів у польоті на з'єднання-пул
+# і спільний token bucket за вагою запитів.
+
+BASE_URL = "https://fapi.binance.com"
+KLINES_PATH = "/fapi/v1/klines"
+# Ліміт ваги біржі на IP; якщо заголовок X-MBX-USED-WEIGHT-1M наближається до нього
+# (напр. через інші процеси), бюджет обнуляється до відновлення
+EXCHANGE_WEIGHT_LIMIT = 2400
+DEFAULT_CONCURRENCY = 8
+MAX_RETRIES = 5
+
+
+class AsyncWeightBudget:
+    """Async token bucket для ваги запитів; черга очікування - у порядку надходження."""
+
+    def __init__(self, weight_per_minute: int = DEFAULT_WEIGHT_PER_MINUTE):
+        self.capacity = float(weight_per_minute)
+        self.rate = weight_per_minute / 60.0
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    async def acquire(self, weight: int):
+        async with self._lock:
+            while True:
+                self._refill()
+                if self.tokens >= weight:
+                    self.tokens -= weight
+                    return
+                await asyncio.sleep((weight - self.tokens) / self.rate)
+
+    def observe(self, used_weight: int):
+        """Враховує фактичну вагу, яку біржа вже нарахувала цьому IP за хвилину."""
+        if used_weight >= EXCHANGE_WEIGHT_LIMIT * 0.9:
+            self._refill()
+            self.tokens = min(self.tokens, 0.0)
+
+
+def _resolve_range(interval: str, rng, now_ms: int) -> tuple:
+    """Діапазон запиту → (start_ms, end_ms) open_time. rng - кількість останніх свічок або (start, end)."""
+    step = kline_store.INTERVAL_MS[interval]
+    if isinstance(rng, int):
+        end_ms = now_ms // step * step
+        return end_ms - (rng - 1) * step, end_ms
+    start, end = rng
+    end_ms = now_ms if end is None else to_ms(end)
+    return to_ms(start) // step * step, end_ms // step * step
+
+
+async def _fetch_page(session, budget: AsyncWeightBudget, base_url: str, symbol: str, interval: str,
+                      start_ms: int, end_ms: int, limit: int) -> list:
+    params = {"symbol": symbol, "interval": interval, "startTime": start_ms, "endTime": end_ms, "limit": limit}
+    weight = klines_weight(limit)
+    for attempt in range(MAX_RETRIES):
+        await budget.acquire(weight)
+        async with session.get(base_url + KLINES_PATH, params=params) as resp:
+            used = resp.headers.get("X-MBX-USED-WEIGHT-1M")
+            if used is not None:
+                budget.observe(int(used))
+            if resp.status in (418, 429):
+                # ліміт перевищено: біржа каже, скільки чекати
+                await asyncio.sleep(float(resp.headers.get("Retry-After", 2 ** attempt)))
+                continue
+            if resp.status >= 500:
+                await asyncio.sleep(0.5 * 2 ** attempt)
+                continue
+            if resp.status != 200:
+                raise RuntimeError(f"{symbol} {interval}: HTTP {resp.status}: {await resp.text()}")
+            return await resp.json()
+    raise RuntimeError(f"{symbol} {interval}: no response after {MAX_RETRIES} attempts")
+
+
+def _open_session(concurrency: int):
+    if aiohttp is None:
+        raise ImportError("fetch_many requires aiohttp: pip install aiohttp")
+    connector = aiohttp.TCPConnector(limit=concurrency, keepalive_timeout=30)
+    return aiohttp.ClientSession(connector=connector, timeout=aiohttp.ClientTimeout(total=30))
+
+
+async def fetch_many_async(requests: list, concurrency: int = DEFAULT_CONCURRENCY,
+                           weight_per_minute: int = DEFAULT_WEIGHT_PER_MINUTE,
+                           page_size: int = binance_api.MAX_KLINES_PER_REQUEST, use_cache: bool = True,
+                           db_path: str = None, base_url: str = BASE_URL, session=None) -> dict:
+    """
+    Завантажує історію для списку [(symbol, interval, rng), ...] паралельно.
+
+    rng - кількість останніх свічок (як `limit` у `get_historical_futures_klines`) або
+    (start, end) у форматах `downloader.to_ms` (end=None - до зараз). З `use_cache`
+    качаються лише відсутні в `kline_store` діапазони, а результат зберігається туди ж.
+    Повертає {(symbol, interval): DataFrame}. `session` - готова aiohttp-сумісна сесія.
+    """
+    now_ms = int(time.time() * 1000)
+    budget = AsyncWeightBudget(weight_per_minute)
+    plan = []  # (key, start_ms, end_ms, [(page_start, page_end), ...])
+    for symbol, interval, rng in requests:
+        step = kline_store.INTERVAL_MS[interval]
+        start_ms, end_ms = _resolve_range(interval, rng, now_ms)
+        gaps = [(start_ms, end_ms)]
+        if use_cache:
+            cached = kline_store.load_klines(symbol, interval, start_ms, end_ms, db_path=db_path, with_closed=True)
+            gaps = kline_store.missing_ranges(cached, start_ms, end_ms, step)
+        pages = [page for gap in gaps for page in _pages(gap[0], gap[1], step, page_size)]
+        plan.append(((symbol, interval), start_ms, end_ms, pages))
+
+    own_session = session is None
+    if own_session:
+        session = _open_session(concurrency)
+    limiter = asyncio.Semaphore(concurrency)
+
+    async def fetch(symbol, interval, page_start, page_end):
+        step = kline_store.INTERVAL_MS[interval]
+        async with limiter:
+            return await _fetch_page(session, budget, base_url, symbol, interval, page_start, page_end,
+                                     (page_end - page_start) // step + 1)
+
+    try:
+        tasks = [[asyncio.ensure_future(fetch(key[0], key[1], s, e)) for s, e in pages] for key, _, _, pages in plan]
+        try:
+            fetched = [await asyncio.gather(*group) if group else [] for group in tasks]
+        except BaseException:
+            for group in tasks:
+                for task in group:
+                    task.cancel()
+            raise
+    finally:
+        if own_session:
+            await session.close()
+
+    results = {}
+    for ((symbol, interval), start_ms, end_ms, _), pages in zip(plan, fetched):
+        klines = [k for page in pages for k in page]
+        if not use_cache:
+            results[(symbol, interval)] = binance_api._klines_to_df(klines)
+            continue
+        if klines:
+            kline_store.save_klines(symbol, interval, klines, now_ms, db_path=db_path)
+        results[(symbol, interval)] = kline_store.load_klines(symbol, interval, start_ms, end_ms, db_path=db_path)
+    return results
+
+
+def fetch_many(requests: list, **kwargs) -> dict:
+    """Синхронна обгортка `fetch_many_async` (для GUI-потоків і CLI)."""
+    return asyncio.run(fetch_many_async(requests, **kwargs))
+
+
+if __name__ == "__main__":
+    # прогрів кешу для пакетних бектестів:
+    # python -m core.async_fetch --symbols DOGEUSDT SOLUSDT --intervals 1m 1h --limit 1500
+    parser = argparse.ArgumentParser(description="Batch history fetch into the local kline cache")
+    parser.add_argument("--symbols", nargs="+", default=["DOGEUSDT"])
+    parser.add_argument("--intervals", nargs="+", default=["1m"])
+    parser.add_argument("--limit", type=int, default=1500, help="Останні N свічок (якщо не задано --start)")
+    parser.add_argument("--start", type=str, default=None)
+    parser.add_argument("--end", type=str, default=None)
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY)
+    args = parser.parse_args()
+
+    rng = (args.start, args.end) if args.start else args.limit
+    started = time.perf_counter()
+    frames = fetch_many([(s, i, rng) for s in args.symbols for i in args.intervals], concurrency=args.concurrency)
+    for (symbol, interval), df in frames.items():
+        first = df.index[0] if len(df) else "-"
+        print(f"{symbol:<10} {interval:<4} {len(df):>8} candles from {first}")
+    print(f"Done in {time.perf_counter() - started:.2f}s")
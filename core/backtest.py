@@ -1,5 +1,150 @@
+import numpy as np
 import pandas as pd
-from core import signals
+from core import signals, strategies
+
+
+
+def strategy_signals(strategy: str, df: pd.DataFrame, **kwargs) -> pd.Series:
+    """
+    Сигнали BUY/SELL/HOLD обраної стратегії з реєстру (`core/strategies.py`) для кожної свічки.
+    Параметри, яких стратегія не має, ігноруються; не задані - типові.
+    """
+    return strategies.get(strategy).signals(df, **kwargs)
+
+
+def signal_codes(sigs, long_short: bool = False) -> np.ndarray:
+    """
+    Переводить сигнали у цільову позицію: BUY → 1, SELL → -1 (long/short) або 0 (long-only),
+    HOLD → NaN (позиція не змінюється). Приймає рядки BUY/SELL/HOLD або вже числові коди.
+    """
+    arr = np.asarray(sigs)
+    if arr.dtype.kind in "fiu":
+        return arr.astype(float)
+    codes = np.full(len(arr), np.nan)
+    codes[arr == "BUY"] = 1.0
+    codes[arr == "SELL"] = -1.0 if long_short else 0.0
+    return codes
+
+
+def simulate(close, sigs, long_short: bool = False, initial_capital: float = 1000.0,
+             taker_fee: float = 0.0, maker_fee: float = 0.0, use_maker: bool = False,
+             slippage: float = 0.0, periods_per_year: float = None) -> dict:
+    """
+    Спільний симулятор позицій і PnL на масивах NumPy.
+
+    Параметри:
+        close: ціни закриття.
+        sigs: сигнали BUY/SELL/HOLD (або коди з `signal_codes`).
+        long_short: False - лише LONG (SELL закриває), True - SELL відкриває SHORT.
+        taker_fee / maker_fee: комісія за кожну сторону угоди (частка, 0.0004 = 0.04%).
+        use_maker: рахувати угоди за maker-комісією замість taker.
+        slippage: прослизання ціни виконання (частка, проти нас).
+        periods_per_year: кількість барів на рік для річного Sharpe (None - Sharpe на бар).
+
+    Угода виконується по close бару з сигналом; відкрита в кінці позиція закривається
+    по останньому close. Стан-машина позицій повністю векторна (ffill цільової позиції),
+    тож циклу по барах немає.
+    Повертає словник з балансом, кривою капіталу, таблицею угод та метриками.
+    """
+    close = np.asarray(close, dtype=float)
+    n = len(close)
+    fee = maker_fee if use_maker else taker_fee
+
+    codes = signal_codes(sigs, long_short)
+    # Позиція після бару i = остання не-HOLD ціль (до першого сигналу - 0)
+    valid = ~np.isnan(codes)
+    last = np.maximum.accumulate(np.where(valid, np.arange(n), -1)) if n else np.array([], dtype=int)
+    position = np.where(last >= 0, codes[np.maximum(last, 0)], 0.0)
+
+    prev = np.concatenate(([0.0], position[:-1]))
+    starts = np.flatnonzero(position != prev)  # бари, де починається новий сегмент позиції
+    side = position[starts]
+    ends = np.append(starts[1:], n - 1)  # сегмент закривається на старті наступного або в кінці
+
+    # Ціни виконання з прослизанням: купуємо дорожче, продаємо дешевше
+    entry_fill = close[starts] * (1 + side * slippage)
+    exit_fill = close[ends] * (1 - side * slippage)
+    ratio = np.divide(exit_fill, entry_fill, out=np.ones_like(entry_fill), where=side != 0)
+    gross = np.where(side > 0, ratio, np.where(side < 0, 2 - ratio, 1.0))
+    mult = np.where(side != 0, gross * (1 - fee) * (1 - fee), 1.0)
+
+    # Баланс на старті кожного сегмента (послідовне множення, як у циклі)
+    balances = np.cumprod(np.concatenate(([initial_capital], mult)))
+    start_balance = balances[:-1]
+    final_balance = float(balances[-1]) if n else float(initial_capital)
+
+    # Крива капіталу: mark-to-market відкритої позиції
+    seg = np.searchsorted(starts, np.arange(n), side="right") - 1
+    in_seg = seg >= 0
+    seg_c = np.maximum(seg, 0)
+    bar_side = np.where(in_seg, side[seg_c] if len(side) else 0.0, 0.0)
+    mark = np.divide(close, entry_fill[seg_c] if len(side) else close,
+                     out=np.ones(n), where=bar_side != 0)
+    mark = np.where(bar_side > 0, mark, np.where(bar_side < 0, 2 - mark, 1.0))
+    base = np.where(in_seg, start_balance[seg_c] if len(side) else initial_capital, initial_capital)
+    equity = np.where(bar_side != 0, base * (1 - fee) * mark, base)
+    if n:
+        equity[-1] = final_balance
+
+    is_trade = side != 0
+    trades = pd.DataFrame({
+        "entry_index": starts[is_trade],
+        "exit_index": ends[is_trade],
+        "side": np.where(side[is_trade] > 0, "LONG", "SHORT"),
+        "entry_price": close[starts[is_trade]],
+        "exit_price": close[ends[is_trade]],
+        "return": mult[is_trade] - 1,
+        "balance": balances[1:][is_trade],
+        # False - позицію закрито примусово в кінці даних, а не сигналом
+        "closed_by_signal": np.append(np.ones(len(starts) - 1, dtype=bool), False)[is_trade]
+        if len(starts) else np.array([], dtype=bool),
+    })
+
+    returns = np.diff(equity) / equity[:-1] if n > 1 else np.array([])
+    std = returns.std() if len(returns) else 0.0
+    sharpe = returns.mean() / std * np.sqrt(periods_per_year or 1) if std > 0 else 0.0
+    peak = np.maximum.accumulate(equity) if n else equity
+    drawdown = 1 - equity / peak if n else equity
+
+    return {
+        "Initial Capital": initial_capital,
+        "Final Balance": final_balance,
+        "Net Profit": final_balance - initial_capital,
+        "Return %": (final_balance / initial_capital - 1) * 100,
+        "Trades Count": int(is_trade.sum()),
+        "Winrate %": float((trades["return"] > 0).mean() * 100) if len(trades) else 0.0,
+        "Max Drawdown %": float(drawdown.max() * 100) if n else 0.0,
+        "Sharpe": float(sharpe),
+        "Exposure %": float((position != 0).mean() * 100) if n else 0.0,
+        "position": position,
+        "equity": equity,
+        "trades": trades,
+    }
+
+
+def trade_actions(trades: pd.DataFrame) -> list:
+    """Таблиця угод `simulate` → список [(дія, ціна), ...] у форматі `run_backtest.py`."""
+    actions = []
+    for row in trades.itertuples(index=False):
+        actions.append(("BUY" if row.side == "LONG" else "SELL", row.entry_price))
+        exit_action = "SELL" if row.side == "LONG" else "BUY"
+        actions.append((exit_action if row.closed_by_signal else f"{exit_action} (final)", row.exit_price))
+    return actions
+
+
+def long_only_backtest(df: pd.DataFrame, sigs: pd.Series, capital: float = 1000, with_stats: bool = False,
+                       **costs) -> tuple:
+    """
+    Long-only емуляція угод (як у `run_backtest.py`): BUY відкриває позицію,
+    SELL закриває, у кінці відкрита позиція закривається по останньому close.
+    `costs` - комісії/прослизання для `simulate`.
+    Повертає (фінальний баланс, список угод [(дія, ціна), ...]) і, якщо with_stats,
+    третім елементом - повний результат `simulate`.
+    """
+    result = simulate(df["close"].to_numpy(), sigs, long_short=False, initial_capital=capital, **costs)
+    if with_stats:
+        return result["Final Balance"], trade_actions(result["trades"]), result
+    return result["Final Balance"], trade_actions(result["trades"])
 
 
 def backtest_ema_crossover(
@@ -19,59 +164,21 @@ def backtest_ema_crossover(
 
     Повертає словник з результатами.
     """
-    df = df.copy()
-    df["signal"] = None
-
-    # Генеруємо сигнали для кожної свічки
-    for i in range(len(df)):
-        sub_df = df.iloc[: i + 1]  # дані до поточного моменту
-        df.iloc[i, df.columns.get_loc("signal")] = signals.ema_crossover(sub_df, fast, slow)
-
-    # Емуляція "угод" (тільки вхід/вихід, без комісій)
-    position = None
-    entry_price = 0.0
-    trades = []
-    balance = initial_capital
-    coin_amount = 0.0
-
-    for i, row in df.iterrows():
-        signal = row["signal"]
-        price = row["close"]
-
-        if signal == "BUY" and position != "LONG":
-            # Закриваємо попередню SHORT, якщо була
-            if position == "SHORT":
-                balance += coin_amount * (entry_price - price)
-                trades.append(balance)
-                coin_amount = 0.0
-            # Відкриваємо LONG
-            entry_price = price
-            position = "LONG"
-            coin_amount = balance / price
-
-        elif signal == "SELL" and position != "SHORT":
-            # Закриваємо попередній LONG, якщо був
-            if position == "LONG":
-                balance = coin_amount * price
-                trades.append(balance)
-                coin_amount = 0.0
-            # Відкриваємо SHORT
-            entry_price = price
-            position = "SHORT"
-            coin_amount = balance / price
-
-    # Фіналізація — переводимо все у баланс
-    if position == "LONG":
-        balance = coin_amount * df["close"].iloc[-1]
-    elif position == "SHORT":
-        balance += coin_amount * (entry_price - df["close"].iloc[-1])
+    # Генеруємо сигнали для всіх свічок за один векторний прохід
+    sigs = signals.ema_crossover_series(df, fast, slow)
+
+    # Емуляція "угод" LONG/SHORT (без комісій)
+    sim = simulate(df["close"].to_numpy(), sigs, long_short=True, initial_capital=initial_capital)
+    trades = sim["trades"]
+    closed = trades[trades["closed_by_signal"]]["balance"]  # баланс після кожної закритої угоди
+    balance = sim["Final Balance"]
 
     result = {
         "Initial Capital": initial_capital,
         "Final Balance": balance,
         "Net Profit": balance - initial_capital,
         "Return %": (balance / initial_capital - 1) * 100,
-        "Trades Count": len(trades),
-        "Winrate %": (sum(1 for x in trades if x > initial_capital) / len(trades) * 100) if trades else 0,
+        "Trades Count": len(closed),
+        "Winrate %": ((closed > initial_capital).sum() / len(closed) * 100) if len(closed) else 0,
     }
     return result
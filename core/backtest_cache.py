@@ -0,0 +1,236 @@
+import hashlib
+import json
+import pickle
+import sqlite3
+import time
+
+import numpy as np
+import pandas as pd
+
+from core import backtest, strategies
+from core.database import DB_PATH
+
+# Кеш результатів бектесту (таблиця `backtest_cache` у `dogetrade.db`).
+# Ключ - хеш конфігурації: пара, інтервал, перша свічка даних, стратегія, параметри, модель
+# комісій і капітал. Запис містить відбиток даних (хеш свічок, на яких його пораховано),
+# стан симулятора на останній свічці (позиція, ціна входу, баланс, агрегати кривої капіталу)
+# і закриті угоди. Якщо ті самі дані доповнено новими свічками, сигнали рахуються лише на
+# хвості (з warm-up стратегії з реєстру), а симуляція продовжується зі збереженого стану.
+
+CACHE_MAX_BYTES = 64 * 1024 * 1024
+
+
+def _connect(db_path: str = None) -> sqlite3.Connection:
+    conn = sqlite3.connect(db_path or DB_PATH)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS backtest_cache (
+            key TEXT PRIMARY KEY,
+            bars INTEGER NOT NULL,
+            last_time INTEGER NOT NULL,
+            fingerprint TEXT NOT NULL,
+            state BLOB NOT NULL,
+            size INTEGER NOT NULL,
+            used REAL NOT NULL
+        )
+    """)
+    return conn
+
+
+def _time_ms(ts) -> int:
+    return int(pd.Timestamp(ts).value // 1_000_000)
+
+
+def config_key(symbol: str, interval: str, first_time: int, strategy: str, params: dict, costs: dict,
+               capital: float, long_short: bool = False) -> str:
+    """Хеш конфігурації прогону (без кінця даних - його перевіряє відбиток)."""
+    config = {"symbol": symbol, "interval": interval, "first_time": first_time, "strategy": strategy,
+              "params": params, "costs": costs, "capital": capital, "long_short": long_short}
+    return hashlib.sha256(json.dumps(config, sort_keys=True, default=str).encode()).hexdigest()
+
+
+def fingerprint(df: pd.DataFrame, columns) -> str:
+    """Хеш часу та потрібних колонок свічок."""
+    digest = hashlib.sha256(np.ascontiguousarray(df.index.values.astype("datetime64[ms]").astype(np.int64)))
+    for column in columns:
+        digest.update(np.ascontiguousarray(df[column].to_numpy(dtype=float)))
+    return digest.hexdigest()
+
+
+def _mark(balance: float, side: float, entry_price: float, close: float, fee: float, slippage: float) -> float:
+    """Mark-to-market капіталу з відкритою позицією (як крива капіталу `backtest.simulate`)."""
+    mark = close / (entry_price * (1 + side * slippage))
+    return balance * (1 - fee) * (mark if side > 0 else 2 - mark)
+
+
+def _accumulate(state: dict, points: np.ndarray):
+    """
+    Додає точки кривої капіталу до агрегатів (кількість, сума й сума квадратів дохідностей,
+    пік, максимальна просадка). Остання точка лишається відкладеною: у звіті її замінює
+    фінальний баланс із примусовим закриттям позиції.
+    """
+    seq = np.concatenate((state["last_points"], points))
+    done = seq[:-1]
+    returns = np.diff(done) / done[:-1]
+    state["ret_count"] += len(returns)
+    state["ret_sum"] += float(returns.sum())
+    state["ret_sumsq"] += float((returns * returns).sum())
+    new = done[len(state["last_points"]) - 1:] if len(state["last_points"]) else done
+    if len(new):
+        peak = np.maximum.accumulate(np.concatenate(([state["peak"]], new)))[1:]
+        state["peak"] = float(peak[-1])
+        state["max_dd"] = max(state["max_dd"], float((1 - new / peak).max()))
+    state["last_points"] = seq[-2:]
+
+
+def _advance(state: dict, result: dict, close: np.ndarray, offset: int, fee: float, slippage: float):
+    """
+    Переносить у стан результат `simulate` на свічках, що починаються з індексу `offset`
+    (для продовження перша свічка - остання з кешу з позицією, відкритою по ціні входу).
+    """
+    position, equity = result["position"], result["equity"].copy()
+    trades = result["trades"].copy()
+    trades["entry_index"] += offset
+    trades["exit_index"] += offset
+    if offset and state["position"] and len(trades) and trades["entry_index"].iloc[0] == offset:
+        trades.iloc[0, trades.columns.get_loc("entry_index")] = state["entry_index"]
+
+    closed = trades[trades["closed_by_signal"]]
+    state["trades"] = pd.concat([state["trades"], closed], ignore_index=True) if len(state["trades"]) else closed
+    side = float(position[-1])
+    state["position"] = side
+    state["final_balance"] = result["Final Balance"]
+    state["open_trade"] = trades.iloc[-1].to_dict() if side else None
+    balance = float(state["trades"]["balance"].iloc[-1]) if len(state["trades"]) else state["capital"]
+    if side:
+        state["entry_index"] = int(trades["entry_index"].iloc[-1])
+        state["entry_price"] = float(trades["entry_price"].iloc[-1])
+        equity[-1] = _mark(balance, side, state["entry_price"], close[-1], fee, slippage)
+    state["balance"] = balance
+    state["exposure"] += int(np.count_nonzero(position[1:] if offset else position))
+    _accumulate(state, equity[1:] if offset else equity)
+
+
+def _report(state: dict, periods_per_year: float = None) -> dict:
+    """Метрики як у `backtest.simulate` (без покадрових масивів "position" та "equity")."""
+    capital, final = state["capital"], state["final_balance"]
+    count, total, squares = state["ret_count"], state["ret_sum"], state["ret_sumsq"]
+    if len(state["last_points"]) == 2:
+        r = final / state["last_points"][0] - 1
+        count, total, squares = count + 1, total + r, squares + r * r
+    mean = total / count if count else 0.0
+    std = np.sqrt(max(squares / count - mean * mean, 0.0)) if count else 0.0
+    sharpe = mean / std * np.sqrt(periods_per_year or 1) if std > 0 else 0.0
+    max_dd = max(state["max_dd"], 1 - final / max(state["peak"], final))
+
+    trades = state["trades"]
+    if state["open_trade"] is not None:
+        trades = pd.concat([trades, pd.DataFrame([state["open_trade"]])], ignore_index=True)
+    trades = trades.astype({"entry_index": int, "exit_index": int, "closed_by_signal": bool})
+    return {
+        "Initial Capital": capital,
+        "Final Balance": final,
+        "Net Profit": final - capital,
+        "Return %": (final / capital - 1) * 100,
+        "Trades Count": len(trades),
+        "Winrate %": float((trades["return"] > 0).mean() * 100) if len(trades) else 0.0,
+        "Max Drawdown %": float(max_dd * 100),
+        "Sharpe": float(sharpe),
+        "Exposure %": state["exposure"] / state["bars"] * 100,
+        "trades": trades,
+    }
+
+
+def _load(conn: sqlite3.Connection, key: str):
+    row = conn.execute("SELECT bars, last_time, fingerprint, state FROM backtest_cache WHERE key = ?",
+                       (key,)).fetchone()
+    return (row[0], row[1], row[2], pickle.loads(row[3])) if row else None
+
+
+def _store(conn: sqlite3.Connection, key: str, state: dict, fp: str, max_bytes: int):
+    blob = pickle.dumps(state, protocol=pickle.HIGHEST_PROTOCOL)
+    last_time = state["last_time"]
+    with conn:
+        conn.execute("INSERT OR REPLACE INTO backtest_cache VALUES (?, ?, ?, ?, ?, ?, ?)",
+                     (key, state["bars"], last_time, fp, blob, len(blob), time.time()))
+        evict(conn, max_bytes)
+
+
+def evict(conn: sqlite3.Connection, max_bytes: int = CACHE_MAX_BYTES) -> int:
+    """Видаляє найдавніше використані записи, поки кеш більший за max_bytes."""
+    total, stale = 0, []
+    for key, size in conn.execute("SELECT key, size FROM backtest_cache ORDER BY used DESC"):
+        total += size
+        if total > max_bytes:
+            stale.append((key,))
+    conn.executemany("DELETE FROM backtest_cache WHERE key = ?", stale)
+    return len(stale)
+
+
+def clear(db_path: str = None):
+    conn = _connect(db_path)
+    with conn:
+        conn.execute("DELETE FROM backtest_cache")
+    conn.close()
+
+
+def cached_simulate(df: pd.DataFrame, symbol: str, interval: str, strategy: str, capital: float = 1000.0,
+                    params: dict = None, long_short: bool = False, db_path: str = None,
+                    max_bytes: int = CACHE_MAX_BYTES, **costs) -> dict:
+    """
+    `backtest.simulate` стратегії з реєстру з кешем результату.
+
+    Ті самі свічки → результат із кешу; ті самі свічки + нові в кінці → сигнали лише на
+    хвості з warm-up, симуляція продовжується зі збереженого стану; інакше - повний прогін.
+    `costs` - комісії/прослизання/periods_per_year як у `simulate`.
+    Повертає метрики й таблицю угод як `simulate` та "Cache": hit / extended / miss.
+    """
+    spec = strategies.get(strategy)
+    params = spec.bind(**(params or {}))
+    periods_per_year = costs.get("periods_per_year")
+    fee = costs.get("maker_fee", 0.0) if costs.get("use_maker") else costs.get("taker_fee", 0.0)
+    slippage = costs.get("slippage", 0.0)
+    columns = list(dict.fromkeys(("close",) + spec.columns))
+    n = len(df)
+    if n < 2:
+        result = backtest.simulate(df["close"].to_numpy(), spec.signals(df, **params), long_short, capital, **costs)
+        return {**result, "Cache": "miss"}
+
+    key = config_key(symbol, interval, _time_ms(df.index[0]), strategy, params, costs, capital, long_short)
+    conn = _connect(db_path)
+    try:
+        cached = _load(conn, key)
+        status = "miss"
+        if cached is not None:
+            bars, last_time, fp, state = cached
+            if bars <= n and _time_ms(df.index[bars - 1]) == last_time and fingerprint(df.iloc[:bars], columns) == fp:
+                status = "hit" if bars == n else "extended"
+
+        close = df["close"].to_numpy()
+        if status == "miss":
+            state = {"capital": capital, "bars": 0, "trades": pd.DataFrame(), "position": 0.0, "exposure": 0,
+                     "ret_count": 0, "ret_sum": 0.0, "ret_sumsq": 0.0, "peak": -np.inf, "max_dd": 0.0,
+                     "last_points": np.array([])}
+            result = backtest.simulate(close, spec.signals(df, **params), long_short, capital, **costs)
+            _advance(state, result, close, 0, fee, slippage)
+        elif status == "extended":
+            # хвіст: сигнали нових свічок з warm-up, перша свічка - остання з кешу
+            bars = state["bars"]
+            start = max(0, bars - spec.warmup_length(**params))
+            codes = backtest.signal_codes(spec.signals(df.iloc[start:], **params).to_numpy()[bars - start:],
+                                          long_short)
+            tail_close = close[bars - 1:].copy()
+            if state["position"]:
+                tail_close[0] = state["entry_price"]
+            result = backtest.simulate(tail_close, np.concatenate(([state["position"]], codes)), long_short,
+                                       state["balance"], **costs)
+            _advance(state, result, tail_close, bars - 1, fee, slippage)
+
+        if status != "hit":
+            state["bars"], state["last_time"] = n, _time_ms(df.index[-1])
+            _store(conn, key, state, fingerprint(df, columns), max_bytes)
+        else:
+            with conn:
+                conn.execute("UPDATE backtest_cache SET used = ? WHERE key = ?", (time.time(), key))
+    finally:
+        conn.close()
+    return {**_report(state, periods_per_year), "Cache": status}
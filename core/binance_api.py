@@ -1,17 +1,28 @@
+import time
+
 import pandas as pd
-from binance.client import Client
 
+from core import kline_store
+from core.instrumentation import tracer
 
-# Binance Futures client (публічний, без ключів)
-client = Client()
+# Максимум свічок за один запит futures_klines
+MAX_KLINES_PER_REQUEST = 1500
 
+# Binance Futures client (публічний, без ключів); створюється при першому запиті,
+# бо конструктор Client() робить мережевий виклик. Пакет binance теж імпортується
+# лише тоді: сам імпорт займає помітну частину старту програми.
+client = None
 
-def get_historical_futures_klines(symbol: str, interval: str, limit: int = 100) -> pd.DataFrame:
-    """
-    Завантажує історичні свічки з Binance Futures (USDT-M).
-    """
-    klines = client.futures_klines(symbol=symbol, interval=interval, limit=limit)
 
+def get_client():
+    global client
+    if client is None:
+        from binance.client import Client
+        client = Client()
+    return client
+
+
+def _klines_to_df(klines) -> pd.DataFrame:
     df = pd.DataFrame(klines, columns=[
         "timestamp", "open", "high", "low", "close", "volume",
         "close_time", "quote_asset_volume", "number_of_trades",
@@ -23,3 +34,60 @@ def get_historical_futures_klines(symbol: str, interval: str, limit: int = 100)
 
     df = df[["open", "high", "low", "close", "volume"]].astype(float)
     return df
+
+
+def _fetch_range(api, symbol: str, interval: str, start_ms: int, end_ms: int, step_ms: int) -> list:
+    """Завантажує свічки з open_time у [start_ms, end_ms], розбиваючи на запити по 1500."""
+    klines = []
+    while start_ms <= end_ms:
+        count = min((end_ms - start_ms) // step_ms + 1, MAX_KLINES_PER_REQUEST)
+        with tracer.span("rest.futures_klines"):
+            page = api.futures_klines(symbol=symbol, interval=interval,
+                                      startTime=start_ms, endTime=end_ms, limit=count)
+        if not page:
+            break
+        klines.extend(page)
+        start_ms = int(page[-1][0]) + step_ms
+    return klines
+
+
+def get_historical_futures_klines(symbol: str, interval: str, limit: int = 100,
+                                  use_cache: bool = True, api=None, db_path: str = None) -> pd.DataFrame:
+    """
+    Завантажує історичні свічки з Binance Futures (USDT-M).
+
+    Свічки кешуються у локальному сховищі (`core/kline_store.py`): з мережі
+    докачуються лише відсутні діапазони та незакриті свічки. Якщо мережа
+    недоступна, повертаються кешовані свічки.
+    `api` - об'єкт з методом `futures_klines` (за замовчуванням `get_client()`).
+    """
+    with tracer.span("rest.get_historical_futures_klines"):
+        return _get_historical_futures_klines(symbol, interval, limit, use_cache, api, db_path)
+
+
+def _get_historical_futures_klines(symbol, interval, limit, use_cache, api, db_path) -> pd.DataFrame:
+    step_ms = kline_store.INTERVAL_MS.get(interval)
+    if not use_cache or step_ms is None:
+        api = api or get_client()
+        return _klines_to_df(api.futures_klines(symbol=symbol, interval=interval, limit=limit))
+
+    now_ms = int(time.time() * 1000)
+    end_ms = now_ms // step_ms * step_ms  # open_time поточної (незакритої) свічки
+    start_ms = end_ms - (limit - 1) * step_ms
+
+    cached = kline_store.load_klines(symbol, interval, start_ms, end_ms, db_path=db_path, with_closed=True)
+    gaps = kline_store.missing_ranges(cached, start_ms, end_ms, step_ms)
+    if gaps:
+        try:
+            api = api or get_client()
+            for gap_start, gap_end in gaps:
+                klines = _fetch_range(api, symbol, interval, gap_start, gap_end, step_ms)
+                kline_store.save_klines(symbol, interval, klines, now_ms, db_path=db_path)
+        except Exception:
+            if not len(cached):
+                raise
+            # офлайн: віддаємо те, що є у кеші
+            return cached[kline_store.COLUMNS]
+        cached = kline_store.load_klines(symbol, interval, start_ms, end_ms, db_path=db_path)
+
+    return cached[kline_store.COLUMNS].tail(limit)
@@ -0,0 +1,99 @@
+import numpy as np
+import pandas as pd
+
+COLUMNS = ("open", "high", "low", "close", "volume")
+
+
+class CandleBuffer:
+    """
+    Кільцевий буфер OHLCV фіксованої місткості на попередньо виділених масивах NumPy.
+
+    Кожне значення пишеться двічі (у позиції i та i + capacity), тому останні N
+    свічок завжди лежать у пам'яті суцільно: `view()` / `to_frame()` повертають
+    представлення без копіювання, а `append()` коштує O(1) незалежно від довжини сесії.
+    Представлення дійсні до наступних записів - беріть їх заново на кожну свічку.
+    """
+
+    __slots__ = ("capacity", "_time", "_data", "_pos", "_size", "version", "__weakref__")
+
+    def __init__(self, capacity: int = 5000):
+        if capacity < 1:
+            raise ValueError("capacity must be positive")
+        self.capacity = capacity
+        self._time = np.zeros(2 * capacity, dtype=np.int64)  # open_time, мс
+        self._data = np.zeros((len(COLUMNS), 2 * capacity), dtype=np.float64)
+        self._pos = 0   # куди піде наступний запис
+        self._size = 0
+        self.version = 0  # лічильник змін (для кешів)
+
+    def __len__(self) -> int:
+        return self._size
+
+    def _write(self, index: int, t: int, values):
+        self._time[index] = t
+        self._time[index + self.capacity] = t
+        self._data[:, index] = values
+        self._data[:, index + self.capacity] = values
+
+    def append(self, t: int, o: float, h: float, l: float, c: float, v: float):
+        """Додає нову свічку (open_time у мс); найстаріша витісняється при заповненні."""
+        self._write(self._pos, t, (o, h, l, c, v))
+        self._pos = (self._pos + 1) % self.capacity
+        if self._size < self.capacity:
+            self._size += 1
+        self.version += 1
+
+    def update_last(self, o: float, h: float, l: float, c: float, v: float):
+        """Перезаписує останню свічку (оновлення всередині бару)."""
+        last = (self._pos - 1) % self.capacity
+        self._write(last, self._time[last], (o, h, l, c, v))
+        self.version += 1
+
+    def push(self, t: int, o: float, h: float, l: float, c: float, v: float):
+        """Як `df.loc[t] = [...]`: свічка з тим самим часом замінює останню, нова - додається."""
+        if self._size and self.last_time() == t:
+            self.update_last(o, h, l, c, v)
+        else:
+            self.append(t, o, h, l, c, v)
+
+    def last_time(self):
+        if not self._size:
+            return None
+        return int(self._time[(self._pos - 1) % self.capacity])
+
+    def _window(self, n: int = None) -> slice:
+        n = self._size if n is None else min(n, self._size)
+        end = self._pos + self.capacity
+        return slice(end - n, end)
+
+    def times(self, n: int = None) -> np.ndarray:
+        """open_time (мс) останніх n свічок - представлення без копії."""
+        return self._time[self._window(n)]
+
+    def column(self, name: str, n: int = None) -> np.ndarray:
+        """Колонка останніх n свічок - представлення без копії."""
+        return self._data[COLUMNS.index(name), self._window(n)]
+
+    def view(self, n: int = None) -> np.ndarray:
+        """Масив (5, n) останніх n свічок - представлення без копії."""
+        return self._data[:, self._window(n)]
+
+    def to_frame(self, n: int = None) -> pd.DataFrame:
+        """DataFrame останніх n свічок у форматі `get_historical_futures_klines`."""
+        window = self._window(n)
+        index = pd.DatetimeIndex(self._time[window].view("datetime64[ms]"), name="timestamp")
+        return pd.DataFrame({name: self._data[i, window] for i, name in enumerate(COLUMNS)},
+                            index=index, copy=False)
+
+    def extend_frame(self, df: pd.DataFrame):
+        """Додає свічки з DataFrame (індекс - timestamp, колонки open..volume)."""
+        times = df.index.values.astype("datetime64[ms]").astype(np.int64)
+        values = df[list(COLUMNS)].to_numpy(dtype=np.float64)
+        for t, row in zip(times, values):
+            self.push(int(t), *row)
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, capacity: int = 5000) -> "CandleBuffer":
+        buf = cls(capacity)
+        buf.extend_frame(df.tail(capacity))
+        return buf
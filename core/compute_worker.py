@@ -0,0 +1,103 @@
+import queue
+import threading
+
+
+class ComputeWorker:
+    """
+    Окремий потік для обчислень над подіями з websocket.
+
+    Події кладуться в обмежену чергу (`submit` не блокує потік сокета). Якщо
+    обробник не встигає і черга повна, відкидається найстаріша подія, для якої
+    `droppable(подія)` істинне (напр. проміжне оновлення незакритої свічки), або сама
+    нова подія, якщо вона така ж. Решта подій (закриті свічки) не губиться ніколи:
+    без місця для них черга росте понад maxsize. Без `droppable` відкидати можна будь-яку.
+    Відкинуті рахуються в `dropped`; `stats()` показує глибину черги та лічильники.
+    """
+
+    def __init__(self, handler, maxsize: int = 1000, on_error=None, name: str = "compute-worker",
+                 droppable=None):
+        self.handler = handler
+        self.on_error = on_error
+        self.droppable = droppable or (lambda item: True)
+        self.queue = queue.Queue(maxsize=maxsize)
+        self.processed = 0
+        self.dropped = 0
+        self.max_depth = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self, timeout: float = 1.0):
+        self._stop.set()
+        try:
+            self.queue.put_nowait(None)  # розбудити потік
+        except queue.Full:
+            pass
+        if self._thread.is_alive():
+            self._thread.join(timeout)
+
+    def submit(self, item) -> bool:
+        """Кладе подію в чергу; повертає False, якщо довелося відкинути подію (стару чи цю)."""
+        try:
+            self.queue.put_nowait(item)
+            accepted = True
+        except queue.Full:
+            accepted = self._make_room(item)
+        depth = self.queue.qsize()
+        if depth > self.max_depth:
+            self.max_depth = depth
+        return accepted
+
+    def _make_room(self, item) -> bool:
+        q = self.queue
+        with q.mutex:
+            pending = q.queue
+            victim = next((i for i, old in enumerate(pending) if old is not None and self.droppable(old)), None)
+            if victim is None and self.droppable(item):
+                self.dropped += 1
+                return False
+            if victim is not None:
+                del pending[victim]
+                self.dropped += 1
+            else:
+                q.unfinished_tasks += 1
+            # вставка в обхід maxsize: подію, яку не можна втратити, кладемо завжди
+            pending.append(item)
+            q.not_empty.notify()
+        return victim is None
+
+    def clear(self, predicate=None) -> int:
+        """Прибирає з черги події, для яких `predicate(подія)` істинне (None - усі); повертає кількість."""
+        q = self.queue
+        with q.mutex:
+            pending = q.queue
+            kept = [item for item in pending if item is None or (predicate is not None and not predicate(item))]
+            removed = len(pending) - len(kept)
+            pending.clear()
+            pending.extend(kept)
+            q.unfinished_tasks -= removed
+            q.not_full.notify_all()
+        return removed
+
+    def _run(self):
+        while not self._stop.is_set():
+            item = self.queue.get()
+            if item is None:
+                continue
+            try:
+                self.handler(item)
+            except Exception as e:
+                if self.on_error is not None:
+                    self.on_error(e)
+            self.processed += 1
+
+    def stats(self) -> dict:
+        return {
+            "depth": self.queue.qsize(),
+            "max_depth": self.max_depth,
+            "processed": self.processed,
+            "dropped": self.dropped,
+        }
@@ -0,0 +1,141 @@
+import json
+import sys
+import time
+
+import pandas as pd
+
+from core import strategies as strategy_registry
+from core.database import SignalStore
+from core.live import make_live_strategy, parse_kline
+from core.resample import BASE_INTERVAL, KlineAggregator, resample_ohlcv
+
+# Headless-сигнали для багатьох пар і таймфреймів з одного потоку 1m-свічок.
+# На пару зберігається лише потоковий стан: агрегатор поточної свічки для кожного
+# інтервалу та стан стратегій (кілька EMA/SMA) - без буферів свічок, тож сотні
+# пар займають одиниці мегабайт.
+
+
+class _SymbolState:
+    """Потоковий стан однієї пари: {інтервал: агрегатор} і {інтервал: [(стратегія, стан)]}."""
+
+    __slots__ = ("aggregators", "strategies")
+
+    def __init__(self, intervals, strategies):
+        self.aggregators = {interval: KlineAggregator(interval) for interval in intervals}
+        self.strategies = {interval: [(name, make_live_strategy(name)) for name in strategies]
+                           for interval in intervals}
+
+
+class SignalDaemon:
+    """
+    Оцінює стратегії (None - усі з реєстру `core/strategies.py`) для всіх пар і інтервалів
+    з kline-повідомлень 1m (multiplex: пара береться з поля "s"). Кожен сигнал закритої
+    свічки йде в кожен sink: `write(time, symbol, interval, strategy, signal, price)` і `close()`.
+    """
+
+    def __init__(self, symbols, intervals=(BASE_INTERVAL,), strategies=None, sinks=()):
+        self.intervals = tuple(intervals)
+        self.strategies = tuple(strategies or strategy_registry.names())
+        self.sinks = list(sinks)
+        self.states = {symbol.upper(): _SymbolState(self.intervals, self.strategies) for symbol in symbols}
+        self.messages = 0
+        self.candles = 0  # закриті свічки всіх інтервалів
+        self.signals = 0
+
+    @property
+    def symbols(self) -> list:
+        return list(self.states)
+
+    def warm_up(self, symbol: str, base: pd.DataFrame, history: dict = None):
+        """
+        Прогріває стан пари: `base` - останні 1m-свічки (для поточної свічки кожного
+        інтервалу), `history` - {інтервал: свічки}; без нього свічки будуються з `base`.
+        """
+        state = self.states[symbol.upper()]
+        history = history or {}
+        for interval in self.intervals:
+            state.aggregators[interval] = KlineAggregator(interval).seed(base)
+            df = history.get(interval)
+            if df is None:
+                df = resample_ohlcv(base, interval)
+            state.strategies[interval] = [(name, make_live_strategy(name, df)) for name in self.strategies]
+
+    def handle_kline(self, msg: dict):
+        """Обробляє одне kline-повідомлення; повертає кількість закритих свічок."""
+        self.messages += 1
+        data = msg.get("data", msg)
+        symbol = data.get("s", "").upper()
+        state = self.states.get(symbol)
+        if state is None or not data["k"]["x"]:
+            # відкриті оновлення нічого не закривають, а закрита хвилина несе повні o/h/l/c/v
+            return 0
+        open_time, o, h, l, c, v, closed = parse_kline(msg)
+        now = time.time()
+        bars = 0
+        for interval in self.intervals:
+            t, _, _, _, c_, _, bar_closed = state.aggregators[interval].update(open_time, o, h, l, c, v, closed)
+            if not bar_closed:
+                continue
+            bars += 1
+            ts = pd.Timestamp(t, unit="ms")
+            for name, live in state.strategies[interval]:
+                signal = live.update(ts, c_)
+                self.signals += 1
+                for sink in self.sinks:
+                    sink.write(now, symbol, interval, name, signal, c_)
+        self.candles += bars
+        return bars
+
+    def close(self):
+        for sink in self.sinks:
+            sink.close()
+
+
+class SqliteSink:
+    """
+    Сигнали в таблицю daemon_signals (`core/database.py`, окремо від історії GUI), пачками
+    з фонового потоку. HOLD не зберігається, якщо не `include_hold`.
+    """
+
+    def __init__(self, include_hold: bool = False):
+        self.include_hold = include_hold
+        self.store = SignalStore(table="daemon_signals")
+
+    def write(self, ts, symbol, interval, strategy, signal, price):
+        if signal == "HOLD" and not self.include_hold:
+            return
+        self.store.add(ts, signal, price, symbol, interval, strategy)
+
+    def close(self):
+        self.store.close()
+
+
+class StdoutSink:
+    """Рядок на сигнал; HOLD пропускається, якщо не `include_hold`."""
+
+    def __init__(self, include_hold: bool = False, stream=None):
+        self.include_hold = include_hold
+        self.stream = stream or sys.stdout
+
+    def write(self, ts, symbol, interval, strategy, signal, price):
+        if signal == "HOLD" and not self.include_hold:
+            return
+        stamp = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(ts))
+        self.stream.write(f"{stamp} {symbol:<10} {interval:<4} {strategy:<5} {signal:<4} {price:.5f}\n")
+
+    def close(self):
+        self.stream.flush()
+
+
+class JsonlSink:
+    """JSON lines: один об'єкт на сигнал (буферизований запис у файл)."""
+
+    def __init__(self, path: str):
+        self._file = open(path, "a", encoding="utf-8")
+
+    def write(self, ts, symbol, interval, strategy, signal, price):
+        self._file.write(json.dumps({"time": ts, "symbol": symbol, "interval": interval, "strategy": strategy,
+                                     "signal": signal, "price": price}) + "\n")
+
+    def close(self):
+        self._file.close()
@@ -1,12 +1,23 @@
 import sqlite3
 import os
+import threading
 
 DB_PATH = os.path.join(os.path.dirname(__file__), "..", "dogetrade.db")
 
+# Одне довготривале з'єднання на процес (WAL: читання не блокуються записом);
+# створюється при першому зверненні, а не при імпорті
+_conn = None
+_lock = threading.RLock()
 
-def init_db():
-    """Створює таблицю settings, якщо її ще немає."""
-    conn = sqlite3.connect(DB_PATH)
+# Як часто SignalStore скидає накопичені сигнали в БД (с) і максимальний розмір пачки
+SIGNAL_FLUSH_INTERVAL = 1.0
+SIGNAL_MAX_BATCH = 500
+# signals - історія GUI; daemon_signals - headless-демон (`core/daemon.py`), щоб його
+# сотні пар не змішувались з історією вікна
+SIGNAL_TABLES = ("signals", "daemon_signals")
+
+
+def _create_tables(conn: sqlite3.Connection):
     cursor = conn.cursor()
     cursor.execute("""
         CREATE TABLE IF NOT EXISTS settings (
@@ -24,30 +35,66 @@ def init_db():
             INSERT INTO settings (api_key, api_secret, trading_pair, default_timeframe)
             VALUES (?, ?, ?, ?)
         """, ("", "", "DOGEUSDT", "1m"))
+    for table in SIGNAL_TABLES:
+        cursor.execute(f"""
+            CREATE TABLE IF NOT EXISTS {table} (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                time REAL NOT NULL,
+                symbol TEXT,
+                interval TEXT,
+                strategy TEXT,
+                signal TEXT NOT NULL,
+                price REAL
+            )
+        """)
     conn.commit()
-    conn.close()
+
+
+def get_connection() -> sqlite3.Connection:
+    """Спільне з'єднання (WAL); звертатись до нього - під `_lock`."""
+    global _conn
+    with _lock:
+        if _conn is None:
+            conn = sqlite3.connect(DB_PATH, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            _create_tables(conn)
+            _conn = conn
+        return _conn
+
+
+def init_db():
+    """Створює таблиці settings, signals та daemon_signals, якщо їх ще немає."""
+    get_connection()
+
+
+def close_db():
+    global _conn
+    with _lock:
+        if _conn is not None:
+            _conn.close()
+            _conn = None
 
 
 def save_settings(api_key: str, api_secret: str, trading_pair: str, timeframe: str):
     """Зберігає нові налаштування у таблицю settings (завжди 1 запис)."""
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
-    cursor.execute("DELETE FROM settings")  # завжди тримаємо тільки 1 рядок
-    cursor.execute("""
-        INSERT INTO settings (api_key, api_secret, trading_pair, default_timeframe)
-        VALUES (?, ?, ?, ?)
-    """, (api_key, api_secret, trading_pair, timeframe))
-    conn.commit()
-    conn.close()
+    with _lock:
+        conn = get_connection()
+        cursor = conn.cursor()
+        cursor.execute("DELETE FROM settings")  # завжди тримаємо тільки 1 рядок
+        cursor.execute("""
+            INSERT INTO settings (api_key, api_secret, trading_pair, default_timeframe)
+            VALUES (?, ?, ?, ?)
+        """, (api_key, api_secret, trading_pair, timeframe))
+        conn.commit()
 
 
 def get_settings():
     """Повертає збережені налаштування (dict)."""
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
-    cursor.execute("SELECT api_key, api_secret, trading_pair, default_timeframe FROM settings LIMIT 1")
-    row = cursor.fetchone()
-    conn.close()
+    with _lock:
+        cursor = get_connection().cursor()
+        cursor.execute("SELECT api_key, api_secret, trading_pair, default_timeframe FROM settings LIMIT 1")
+        row = cursor.fetchone()
     if row:
         return {
             "api_key": row[0],
@@ -58,5 +105,101 @@ def get_settings():
     return None
 
 
-# Виконуємо ініціалізацію при імпорті
-init_db()
+class SignalStore:
+    """
+    Історія сигналів у таблиці `table` (одна з SIGNAL_TABLES).
+
+    `add` лише кладе сигнал у пам'ять; фоновий потік раз на `flush_interval` (або коли
+    набралось `max_batch`) записує пачку однією транзакцією. `count`/`page` бачать і ще
+    не записані сигнали, тож для GUI історія виглядає суцільною. У таблицю можуть писати
+    й інші процеси: кількість рядків щоразу доочитується з БД (лише рядки з id, більшим за
+    вже бачений), а сторінки читаються за порядком id через LIMIT/OFFSET - з початку або
+    з кінця таблиці, залежно від того, що ближче.
+    """
+
+    def __init__(self, flush_interval: float = SIGNAL_FLUSH_INTERVAL, max_batch: int = SIGNAL_MAX_BATCH,
+                 table: str = "signals"):
+        if table not in SIGNAL_TABLES:
+            raise ValueError(f"Unknown signal table: {table}")
+        self.table = table
+        self.flush_interval = flush_interval
+        self.max_batch = max_batch
+        self._pending = []  # (time, symbol, interval, strategy, signal, price)
+        self._db_count = 0
+        self._last_id = 0  # найбільший id, уже врахований у _db_count
+        self._sync()
+        self._stop = threading.Event()
+        self._wake = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="signal-writer", daemon=True)
+        self._thread.start()
+
+    def _sync(self):
+        """Доочитує кількість рядків, дописаних після останньої звірки (будь-яким записувачем)."""
+        with _lock:
+            added, last = get_connection().execute(
+                f"SELECT COUNT(*), MAX(id) FROM {self.table} WHERE id > ?", (self._last_id,)).fetchone()
+            if added:
+                self._db_count += added
+                self._last_id = last
+
+    def add(self, ts: float, signal: str, price: float, symbol: str = None, interval: str = None,
+            strategy: str = None):
+        with _lock:
+            self._pending.append((ts, symbol, interval, strategy, signal, price))
+            if len(self._pending) >= self.max_batch:
+                self._wake.set()
+
+    def flush(self):
+        with _lock:
+            if not self._pending:
+                return
+            conn = get_connection()
+            with conn:
+                conn.executemany(
+                    f"INSERT INTO {self.table} (time, symbol, interval, strategy, signal, price) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    self._pending)
+            self._pending = []
+
+    def _run(self):
+        while not self._stop.is_set():
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            try:
+                self.flush()
+            except sqlite3.Error:
+                pass  # спробуємо на наступному тіку; сигнали лишаються в пам'яті
+
+    def count(self) -> int:
+        with _lock:
+            self._sync()
+            return self._db_count + len(self._pending)
+
+    def page(self, offset: int, limit: int) -> list:
+        """Рядки (time, signal, price) на позиціях [offset, offset + limit) у хронологічному порядку."""
+        with _lock:
+            self._sync()
+            rows = []
+            if offset < self._db_count:
+                limit_db = min(limit, self._db_count - offset)
+                from_end = self._db_count - offset - limit_db
+                conn = get_connection()
+                if from_end < offset:
+                    # ближче до кінця (GUI зазвичай стоїть на хвості) - OFFSET від останнього id
+                    rows = conn.execute(
+                        f"SELECT time, signal, price FROM {self.table} WHERE id <= ? ORDER BY id DESC LIMIT ? OFFSET ?",
+                        (self._last_id, limit_db, from_end)).fetchall()[::-1]
+                else:
+                    rows = conn.execute(
+                        f"SELECT time, signal, price FROM {self.table} WHERE id <= ? ORDER BY id LIMIT ? OFFSET ?",
+                        (self._last_id, limit_db, offset)).fetchall()
+            pending_from = max(0, offset - self._db_count)
+            pending_to = max(0, offset + limit - self._db_count)
+            rows += [(p[0], p[4], p[5]) for p in self._pending[pending_from:pending_to]]
+        return rows
+
+    def close(self):
+        self._stop.set()
+        self._wake.set()
+        self._thread.join(1.0)
+        self.flush()
@@ -0,0 +1,144 @@
+import shutil
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+from core import binance_api
+from core.archive import CandleArchive
+from core.kline_store import INTERVAL_MS
+
+# Ліміт ваги запитів Binance Futures - 2400/хв; беремо половину із запасом
+DEFAULT_WEIGHT_PER_MINUTE = 1200
+
+
+def klines_weight(limit: int) -> int:
+    """Вага запиту futures_klines залежно від limit (за документацією Binance)."""
+    if limit < 100:
+        return 1
+    if limit < 500:
+        return 2
+    if limit <= 1000:
+        return 5
+    return 10
+
+
+class WeightBudget:
+    """Token bucket для ваги запитів: `acquire(weight)` блокує, поки бюджету не вистачає."""
+
+    def __init__(self, weight_per_minute: int = DEFAULT_WEIGHT_PER_MINUTE):
+        self.capacity = float(weight_per_minute)
+        self.rate = weight_per_minute / 60.0
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self, weight: int):
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= weight:
+                    self.tokens -= weight
+                    return
+                wait = (weight - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+def to_ms(value) -> int:
+    """Перетворює дату ('2024-01-01', datetime, Timestamp або мс) у мс UTC."""
+    if isinstance(value, (int, float)):
+        return int(value)
+    ts = pd.Timestamp(value)
+    if ts.tzinfo is None:
+        ts = ts.tz_localize("UTC")
+    return int(ts.timestamp() * 1000)
+
+
+def _pages(start_ms: int, end_ms: int, step_ms: int, page_size: int):
+    span = step_ms * page_size
+    t = start_ms
+    while t <= end_ms:
+        yield t, min(t + span - step_ms, end_ms)
+        t += span
+
+
+def download_range(symbol: str, interval: str, start, end, archive: CandleArchive = None,
+                   workers: int = 4, weight_per_minute: int = DEFAULT_WEIGHT_PER_MINUTE,
+                   page_size: int = binance_api.MAX_KLINES_PER_REQUEST, api=None, progress=None) -> int:
+    """
+    Завантажує свічки за довільний діапазон [start, end] у колонковий архів.
+
+    Діапазон ділиться на сторінки по `page_size` свічок, які качаються пулом
+    з `workers` потоків у межах бюджету ваги `weight_per_minute`. Сторінки
+    записуються в архів по порядку одразу після отримання, тож у пам'яті
+    тримається не більше ~2*workers сторінок. Записуються лише закриті свічки.
+    Повертає кількість дописаних рядків.
+    """
+    step_ms = INTERVAL_MS[interval]
+    start_ms = to_ms(start) // step_ms * step_ms
+    now_ms = int(time.time() * 1000)
+    end_ms = min(to_ms(end), now_ms - step_ms) // step_ms * step_ms  # лише закриті свічки
+    if archive is None:
+        archive = CandleArchive(symbol, interval)
+    api = api or binance_api.get_client()
+    budget = WeightBudget(weight_per_minute)
+    weight = klines_weight(page_size)
+
+    def fetch(page):
+        budget.acquire(weight)
+        page_start, page_end = page
+        return api.futures_klines(symbol=symbol, interval=interval,
+                                  startTime=page_start, endTime=page_end, limit=page_size)
+
+    def run(target: CandleArchive, range_start: int, range_end: int) -> int:
+        written = 0
+        pages = _pages(range_start, range_end, step_ms, page_size)
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            inflight = deque()
+            for page in pages:
+                inflight.append(pool.submit(fetch, page))
+                if len(inflight) >= workers * 2:
+                    written += target.append_klines(inflight.popleft().result())
+                    if progress:
+                        progress(written)
+            while inflight:
+                written += target.append_klines(inflight.popleft().result())
+                if progress:
+                    progress(written)
+        return written
+
+    total = 0
+    first = archive.first_open_time()
+    last = archive.last_open_time()
+    if first is None:
+        return run(archive, start_ms, end_ms)
+
+    # архів суцільний: докачуємо аж до його меж, навіть якщо [start, end] їх не торкається,
+    # інакше проміжок між діапазоном і архівом лишився б усередині назавжди
+    if start_ms < first:
+        # архів лише дописується, тому старішу частину качаємо в окремий архів і зшиваємо
+        older = CandleArchive(symbol, interval, path=archive.path + ".tmp", dtype=archive.dtype)
+        shutil.rmtree(older.path, ignore_errors=True)
+        total += run(older, start_ms, first - step_ms)
+        older.append_archive(archive)
+        archive.replace_with(older)
+    if end_ms > last:
+        total += run(archive, last + step_ms, end_ms)
+    return total
+
+
+def load_history(symbol: str, interval: str, start, end=None, **kwargs) -> pd.DataFrame:
+    """
+    Докачує відсутні свічки у колонковий архів і повертає діапазон [start, end]
+    як zero-copy memmap-подання (`CandleArchive.frame`, лише для читання).
+    """
+    end = end if end is not None else int(time.time() * 1000)
+    archive = kwargs.pop("archive", None)
+    if archive is None:
+        archive = CandleArchive(symbol, interval)
+    download_range(symbol, interval, start, end, archive=archive, **kwargs)
+    return archive.frame(to_ms(start), to_ms(end))
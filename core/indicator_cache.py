@@ -0,0 +1,302 @@
+import copy
+import threading
+import weakref
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from core import indicators, streaming
+from core.candle_buffer import CandleBuffer
+
+# Спільний кеш індикаторів: ключ - (джерело даних, індикатор, параметри).
+#
+# Джерело - сам DataFrame (або явний `source`, напр. `CandleBuffer`, чиї кадри
+# `to_frame()` щоразу нові). Якщо нові рядки лише дописуються в кінець, а остання
+# (незакрита) свічка перезаписується, кешований ряд не перераховується, а добудовується
+# потоковими індикаторами з `core/streaming.py` (їхні формули збігаються з pandas до біта).
+# `CandleBuffer` інакше змінюватись не вміє; для решти джерел незмінність уже порахованих
+# рядків перевіряється позиційною контрольною сумою, і будь-яка правка всередині - промах.
+
+DEFAULT_MAXSIZE = 256
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+
+def _same(a, b) -> bool:
+    return a == b or (a != a and b != b)  # NaN == NaN
+
+
+_GOLDEN = np.uint64(0x9E3779B97F4A7C15)
+_multipliers = np.empty(0, dtype=np.uint64)
+
+
+def _checksum(values: np.ndarray, start: int = 0) -> int:
+    """
+    Позиційна контрольна сума рядків start..start+len(values) (біти float64 x непарний
+    множник рядка, за модулем 2^64): зміна будь-якого одного значення її змінює. O(n) без копій.
+    """
+    global _multipliers
+    end = start + len(values)
+    if len(_multipliers) < end:
+        size = max(end, 2 * len(_multipliers))
+        _multipliers = np.arange(1, size + 1, dtype=np.uint64) * _GOLDEN | np.uint64(1)
+    bits = np.ascontiguousarray(values, dtype=np.float64).view(np.uint64)
+    return int((bits * _multipliers[start:end]).sum(dtype=np.uint64))
+
+
+class _Entry:
+    """
+    Кешований ряд: значення для рядків [0, length), стан потокового індикатора - до length - 1.
+    checksum - контрольна сума вхідних рядків [0, length - 1) (None - джерело лише дописується).
+    """
+
+    __slots__ = ("start", "length", "committed_key", "committed_value", "last_key", "last_value",
+                 "outputs", "state", "nbytes", "checksum")
+
+    def __init__(self, index, column: np.ndarray, outputs: dict, verify: bool):
+        self.start = index[0]
+        self.length = len(column)
+        self.outputs = outputs
+        self.state = None  # будується ліниво при першому добудовуванні
+        self.checksum = _checksum(column[:-1]) if verify else None
+        self._mark(index, column)
+
+    def _mark(self, index, column):
+        n = self.length
+        self.committed_key = index[n - 2] if n > 1 else None
+        self.committed_value = column[n - 2] if n > 1 else None
+        self.last_key = index[n - 1]
+        self.last_value = column[n - 1]
+        self.nbytes = sum(values.nbytes for values in self.outputs.values())
+
+
+class _Recipe:
+    """Як порахувати індикатор пакетно і як добудувати його потоково."""
+
+    def __init__(self, name, batch, stream, outputs=None):
+        self.name = name
+        self.batch = batch      # (cache, df, column, source, **params) → {вихід: np.ndarray}
+        self.stream = stream    # (**params) → потоковий індикатор; None - лише перерахунок
+        self.outputs = outputs  # None - один ряд, інакше назви колонок DataFrame
+
+
+def _ema_batch(cache, df, column, source, period):
+    return {None: indicators.ema(df, period, column).to_numpy(dtype=float)}
+
+
+def _sma_batch(cache, df, column, source, period):
+    return {None: indicators.sma(df, period, column).to_numpy(dtype=float)}
+
+
+def _rsi_batch(cache, df, column, source, period):
+    return {None: indicators.rsi(df, period, column).to_numpy(dtype=float)}
+
+
+def _macd_batch(cache, df, column, source, fast, slow, signal):
+    # швидка та повільна EMA беруться з кешу - спільні з EMA crossover та іншими MACD
+    macd_line = cache.ema(df, fast, column, source).to_numpy() - cache.ema(df, slow, column, source).to_numpy()
+    signal_line = pd.Series(macd_line).ewm(span=signal, adjust=False).mean().to_numpy()
+    return {"macd": macd_line, "signal": signal_line, "hist": macd_line - signal_line}
+
+
+def _bollinger_batch(cache, df, column, source, period, std_factor):
+    bands = indicators.bollinger_bands(df, period, std_factor, column)
+    return {name: bands[name].to_numpy(dtype=float) for name in ("middle", "upper", "lower")}
+
+
+def _macd_state(entry, column, fast, slow, signal):
+    # стан EMA - лише попереднє значення, тож його можна взяти з готових рядів
+    state = streaming.StreamingMACD(fast, slow, signal)
+    n = entry.length - 1
+    if n:
+        closes = pd.Series(column[:n])
+        state.fast.value = closes.ewm(span=fast, adjust=False).mean().iloc[-1]
+        state.slow.value = closes.ewm(span=slow, adjust=False).mean().iloc[-1]
+        state.signal_ema.value = entry.outputs["signal"][n - 1]
+    return state
+
+
+def _ema_state(entry, column, period):
+    state = streaming.StreamingEMA(period)
+    if entry.length > 1:
+        state.value = entry.outputs[None][entry.length - 2]
+    return state
+
+
+RECIPES = {
+    "ema": _Recipe("ema", _ema_batch, streaming.StreamingEMA),
+    "sma": _Recipe("sma", _sma_batch, streaming.StreamingSMA),
+    "rsi": _Recipe("rsi", _rsi_batch, streaming.StreamingRSI),
+    "macd": _Recipe("macd", _macd_batch, streaming.StreamingMACD, ("macd", "signal", "hist")),
+    # rolling std у pandas після серії однакових close залежить від внутрішнього стану
+    # інакше, ніж StreamingBollinger, тож смуги при зміні даних перераховуються
+    "bollinger": _Recipe("bollinger", _bollinger_batch, None, ("middle", "upper", "lower")),
+}
+
+# Швидка побудова стану без прогону всієї історії (для решти - seed по рядках)
+_STATE_BUILDERS = {"ema": _ema_state, "macd": _macd_state}
+
+
+class IndicatorCache:
+    """
+    LRU-кеш рядів індикаторів з обмеженням за кількістю записів і обсягом пам'яті.
+
+    Повернуті Series/DataFrame ділять пам'ять із кешем - не змінюйте їх на місці.
+    `stats` рахує влучання, промахи, добудовування та витіснення.
+    """
+
+    def __init__(self, maxsize: int = DEFAULT_MAXSIZE, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.maxsize = maxsize
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self.stats = {"hits": 0, "misses": 0, "extended": 0, "evicted": 0}
+        self._entries = OrderedDict()
+        self._sources = {}  # id(джерела) → (weakref, токен)
+        self._next_token = 0
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.nbytes = 0
+
+    # ===== ідентичність джерела =====
+    def _token(self, source) -> int:
+        key = id(source)
+        known = self._sources.get(key)
+        if known is not None and known[0]() is source:
+            return known[1]
+        token = self._next_token
+        self._next_token += 1
+        self._sources[key] = (weakref.ref(source, lambda _, k=key, t=token: self._forget(k, t)), token)
+        return token
+
+    def _forget(self, key: int, token: int):
+        """Джерело знищено збирачем сміття - його ряди більше не знадобляться."""
+        with self._lock:
+            known = self._sources.get(key)
+            if known is not None and known[1] == token:
+                del self._sources[key]
+            for entry_key in [k for k in self._entries if k[0] == token]:
+                self._drop(entry_key)
+
+    def _drop(self, key):
+        entry = self._entries.pop(key)
+        self.nbytes -= entry.nbytes
+
+    def _evict(self):
+        while self._entries and (len(self._entries) > self.maxsize or self.nbytes > self.max_bytes):
+            self._drop(next(iter(self._entries)))
+            self.stats["evicted"] += 1
+
+    # ===== обчислення =====
+    def get(self, df: pd.DataFrame, name: str, column: str = "close", source=None, **params):
+        """
+        Індикатор `name` ("ema", "sma", "rsi", "macd", "bollinger") з параметрами `params`.
+        Повертає Series (або DataFrame для macd/bollinger), як відповідна функція `core/indicators.py`.
+        """
+        recipe = RECIPES[name]
+        values = df[column].to_numpy(dtype=float)
+        with self._lock:
+            if not len(values):
+                return self._wrap(recipe, recipe.batch(self, df, column, source, **params), df.index, column)
+            key = (self._token(df if source is None else source), name, column, tuple(sorted(params.items())))
+            entry = self._entries.get(key)
+            if entry is not None and not self._refresh(entry, recipe, df.index, values, params):
+                self._drop(key)
+                entry = None
+
+            if entry is None:
+                self.stats["misses"] += 1
+                entry = _Entry(df.index, values, recipe.batch(self, df, column, source, **params),
+                               verify=not isinstance(source, CandleBuffer))
+                self._entries[key] = entry
+                self.nbytes += entry.nbytes
+            else:
+                self._entries.move_to_end(key)
+            self._evict()
+            outputs = {k: v[:len(values)] for k, v in entry.outputs.items()}
+        return self._wrap(recipe, outputs, df.index, column)
+
+    def _refresh(self, entry: _Entry, recipe: _Recipe, index, values: np.ndarray, params: dict) -> bool:
+        """Звіряє запис з поточними даними і за потреби добудовує; False - запис застарів."""
+        n = len(values)
+        if index[0] != entry.start or n < entry.length:
+            return False
+        m = entry.length
+        # рядки до передостаннього кешованого не мають змінитись ні для влучання, ні для добудовування
+        if entry.checksum is not None and _checksum(values[:m - 1]) != entry.checksum:
+            return False
+        if n == m and index[-1] == entry.last_key and _same(values[-1], entry.last_value):
+            self.stats["hits"] += 1
+            return True
+        if recipe.stream is None or m < 2 or index[m - 2] != entry.committed_key or not _same(values[m - 2], entry.committed_value):
+            return False
+
+        if entry.state is None:
+            builder = _STATE_BUILDERS.get(recipe.name)
+            if builder is not None:
+                entry.state = builder(entry, values, **params)
+            else:
+                entry.state = recipe.stream(**params).seed(values[:m - 1])
+
+        state = entry.state
+        names = recipe.outputs or (None,)
+        new = {k: np.empty(n, dtype=float) for k in names}
+        for k in names:
+            new[k][:m - 1] = entry.outputs[k][:m - 1]
+        # рядки m-1 .. n-2 закриті: оновлюють постійний стан
+        for i in range(m - 1, n - 1):
+            result = state.update(float(values[i]))
+            self._store(new, names, i, result)
+        # останній рядок може ще змінитись - рахуємо на копії стану
+        self._store(new, names, n - 1, copy.deepcopy(state).update(float(values[n - 1])))
+
+        self.nbytes -= entry.nbytes
+        if entry.checksum is not None:
+            entry.checksum = (entry.checksum + _checksum(values[m - 1:n - 1], m - 1)) % 2 ** 64
+        entry.outputs = new
+        entry.length = n
+        entry._mark(index, values)
+        self.nbytes += entry.nbytes
+        self.stats["extended"] += 1
+        return True
+
+    @staticmethod
+    def _store(outputs: dict, names: tuple, i: int, result):
+        if len(names) == 1:
+            outputs[names[0]][i] = result
+        else:
+            for k, value in zip(names, result):
+                outputs[k][i] = value
+
+    @staticmethod
+    def _wrap(recipe: _Recipe, outputs: dict, index, column: str):
+        if recipe.outputs is None:
+            return pd.Series(outputs[None], index=index, name=column, copy=False)
+        return pd.DataFrame({k: outputs[k] for k in recipe.outputs}, index=index, copy=False)
+
+    # ===== обгортки з сигнатурами core/indicators.py =====
+    def ema(self, df: pd.DataFrame, period: int = 14, column: str = "close", source=None) -> pd.Series:
+        return self.get(df, "ema", column, source, period=period)
+
+    def sma(self, df: pd.DataFrame, period: int = 14, column: str = "close", source=None) -> pd.Series:
+        return self.get(df, "sma", column, source, period=period)
+
+    def rsi(self, df: pd.DataFrame, period: int = 14, column: str = "close", source=None) -> pd.Series:
+        return self.get(df, "rsi", column, source, period=period)
+
+    def macd(self, df: pd.DataFrame, fast: int = 12, slow: int = 26, signal: int = 9, column: str = "close",
+             source=None) -> pd.DataFrame:
+        return self.get(df, "macd", column, source, fast=fast, slow=slow, signal=signal)
+
+    def bollinger_bands(self, df: pd.DataFrame, period: int = 20, std_factor: float = 2.0, column: str = "close",
+                        source=None) -> pd.DataFrame:
+        return self.get(df, "bollinger", column, source, period=period, std_factor=std_factor)
+
+
+# Спільний кеш процесу (у пулі оптимізатора - свій у кожному воркері)
+cache = IndicatorCache()
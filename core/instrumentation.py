@@ -0,0 +1,125 @@
+import json
+import threading
+import time
+from collections import deque
+
+import numpy as np
+
+# Легка інструментація затримок: монотонні спани навколо етапів ticker/kline/REST.
+# Вимкнений трейсер повертає спільний no-op контекст, тож накладні витрати - один виклик.
+
+DEFAULT_WINDOW = 2048  # скільки останніх вимірів тримати на етап
+
+
+class _NoopSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NOOP = _NoopSpan()
+
+
+class _Span:
+    __slots__ = ("tracer", "name", "start")
+
+    def __init__(self, tracer, name):
+        self.tracer = tracer
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.tracer.record(self.name, time.perf_counter() - self.start)
+        return False
+
+
+class Tracer:
+    """Збирає тривалості етапів у ковзні вікна і рахує p50/p95/p99."""
+
+    def __init__(self, enabled: bool = False, window: int = DEFAULT_WINDOW):
+        self.enabled = enabled
+        self.window = window
+        self.samples = {}
+        self.counts = {}
+        self._export_thread = None
+        self._export_stop = threading.Event()
+
+    @staticmethod
+    def now() -> float:
+        return time.perf_counter()
+
+    def span(self, name: str):
+        """`with tracer.span("kline.parse"): ...`"""
+        if not self.enabled:
+            return _NOOP
+        return _Span(self, name)
+
+    def record(self, name: str, seconds: float):
+        if not self.enabled:
+            return
+        samples = self.samples.get(name)
+        if samples is None:
+            samples = self.samples.setdefault(name, deque(maxlen=self.window))
+        samples.append(seconds)
+        self.counts[name] = self.counts.get(name, 0) + 1
+
+    def record_since(self, name: str, start: float):
+        """Записує час від моменту `start` (значення `Tracer.now()`) до зараз."""
+        if self.enabled and start is not None:
+            self.record(name, time.perf_counter() - start)
+
+    def reset(self):
+        self.samples = {}
+        self.counts = {}
+
+    def snapshot(self) -> dict:
+        """{етап: {count, p50, p95, p99, max}} у мілісекундах."""
+        result = {}
+        for name, samples in list(self.samples.items()):
+            values = np.array(list(samples)) * 1000
+            if not len(values):
+                continue
+            p50, p95, p99 = np.percentile(values, [50, 95, 99])
+            result[name] = {
+                "count": self.counts.get(name, len(values)),
+                "p50": float(p50),
+                "p95": float(p95),
+                "p99": float(p99),
+                "max": float(values.max()),
+            }
+        return dict(sorted(result.items()))
+
+    def export(self, path: str):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"), "stages": self.snapshot()}, f, indent=2)
+
+    def start_export(self, path: str, interval: float = 30.0):
+        """Періодично записує знімок у файл у фоновому потоці."""
+        if self._export_thread is not None and self._export_thread.is_alive():
+            return
+        self._export_stop.clear()
+
+        def run():
+            while not self._export_stop.wait(interval):
+                if self.enabled:
+                    try:
+                        self.export(path)
+                    except OSError:
+                        pass
+
+        self._export_thread = threading.Thread(target=run, name="tracer-export", daemon=True)
+        self._export_thread.start()
+
+    def stop_export(self):
+        self._export_stop.set()
+
+
+# Спільний трейсер програми
+tracer = Tracer()
@@ -0,0 +1,121 @@
+import sqlite3
+
+import pandas as pd
+
+from core.database import DB_PATH
+
+# Тривалість свічки у мс для інтервалів Binance, що вирівняні від епохи
+INTERVAL_MS = {
+    "1m": 60_000,
+    "3m": 3 * 60_000,
+    "5m": 5 * 60_000,
+    "15m": 15 * 60_000,
+    "30m": 30 * 60_000,
+    "1h": 60 * 60_000,
+    "2h": 2 * 60 * 60_000,
+    "4h": 4 * 60 * 60_000,
+    "6h": 6 * 60 * 60_000,
+    "8h": 8 * 60 * 60_000,
+    "12h": 12 * 60 * 60_000,
+    "1d": 24 * 60 * 60_000,
+}
+
+COLUMNS = ["open", "high", "low", "close", "volume"]
+
+
+def _connect(db_path: str = None) -> sqlite3.Connection:
+    conn = sqlite3.connect(db_path or DB_PATH)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS klines (
+            symbol TEXT NOT NULL,
+            interval TEXT NOT NULL,
+            open_time INTEGER NOT NULL,
+            open REAL,
+            high REAL,
+            low REAL,
+            close REAL,
+            volume REAL,
+            close_time INTEGER,
+            closed INTEGER DEFAULT 0,
+            PRIMARY KEY (symbol, interval, open_time)
+        ) WITHOUT ROWID
+    """)
+    return conn
+
+
+def save_klines(symbol: str, interval: str, klines: list, now_ms: int, db_path: str = None) -> int:
+    """
+    Зберігає сирі свічки з `Client.futures_klines` (upsert за open_time).
+    Свічка позначається закритою, якщо її close_time вже минув на момент `now_ms`.
+    """
+    rows = [
+        (symbol, interval, int(k[0]), float(k[1]), float(k[2]), float(k[3]), float(k[4]), float(k[5]),
+         int(k[6]), int(int(k[6]) < now_ms))
+        for k in klines
+    ]
+    if not rows:
+        return 0
+    conn = _connect(db_path)
+    with conn:
+        conn.executemany("""
+            INSERT OR REPLACE INTO klines
+                (symbol, interval, open_time, open, high, low, close, volume, close_time, closed)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, rows)
+    conn.close()
+    return len(rows)
+
+
+def load_klines(symbol: str, interval: str, start_ms: int = None, end_ms: int = None,
+                db_path: str = None, with_closed: bool = False) -> pd.DataFrame:
+    """Читає свічки зі сховища у форматі `get_historical_futures_klines` (індекс - timestamp)."""
+    query = "SELECT open_time, open, high, low, close, volume, closed FROM klines WHERE symbol = ? AND interval = ?"
+    params = [symbol, interval]
+    if start_ms is not None:
+        query += " AND open_time >= ?"
+        params.append(int(start_ms))
+    if end_ms is not None:
+        query += " AND open_time <= ?"
+        params.append(int(end_ms))
+    query += " ORDER BY open_time"
+
+    conn = _connect(db_path)
+    rows = conn.execute(query, params).fetchall()
+    conn.close()
+
+    df = pd.DataFrame(rows, columns=["timestamp"] + COLUMNS + ["closed"])
+    df["timestamp"] = pd.to_datetime(df["timestamp"], unit="ms")
+    df.set_index("timestamp", inplace=True)
+    df[COLUMNS] = df[COLUMNS].astype(float)
+    if not with_closed:
+        df = df[COLUMNS]
+    return df
+
+
+def missing_ranges(df: pd.DataFrame, start_ms: int, end_ms: int, step_ms: int) -> list:
+    """
+    Повертає список діапазонів [(from_ms, to_ms), ...] open_time, яких бракує у сховищі
+    між start_ms та end_ms включно. Незакриті свічки теж вважаються відсутніми.
+    """
+    have = set()
+    if len(df):
+        times = df.index.values.astype("datetime64[ms]").astype("int64")
+        closed = df["closed"].to_numpy() if "closed" in df else [1] * len(df)
+        have = {int(t) for t, c in zip(times, closed) if c}
+
+    ranges = []
+    current = None
+    t = start_ms
+    while t <= end_ms:
+        if t not in have:
+            if current is None:
+                current = [t, t]
+            else:
+                current[1] = t
+        elif current is not None:
+            ranges.append(tuple(current))
+            current = None
+        t += step_ms
+    if current is not None:
+        ranges.append(tuple(current))
+    return ranges
@@ -0,0 +1,204 @@
+import threading
+
+import pandas as pd
+
+from core import strategies
+from core.candle_buffer import CandleBuffer
+from core.instrumentation import tracer
+from core.resample import BASE_INTERVAL, KlineAggregator, combine_history, resample_ohlcv
+
+# Скільки базових 1m-свічок тримати в пам'яті (7 днів)
+BASE_CAPACITY = 7 * 24 * 60
+
+
+def parse_kline(msg: dict) -> tuple:
+    """Повідомлення kline (multiplex або пряме) → (open_time_ms, o, h, l, c, v, closed)."""
+    data = msg.get("data", msg)
+    k = data["k"]
+    return (int(k["t"]), float(k["o"]), float(k["h"]), float(k["l"]), float(k["c"]), float(k["v"]),
+            bool(k["x"]))
+
+
+def is_open_update(msg) -> bool:
+    """Проміжне оновлення незакритої свічки (його можна відкинути: наступне містить свіжіші дані)."""
+    data = msg.get("data", msg)
+    k = data.get("k")
+    return k is not None and not k["x"]
+
+
+def make_live_strategy(name: str, history: pd.DataFrame = None):
+    """
+    Потокова стратегія з реєстру з типовими параметрами (None - невідома назва),
+    прогріта лише на хвості `history` довжини її warm-up.
+    """
+    strategy = strategies.REGISTRY.get(name)
+    return strategy.make_live(history) if strategy is not None else None
+
+
+class _Timeframe:
+    """Свічки одного інтервалу, похідні від 1m-потоку, та потокова стратегія на них."""
+
+    __slots__ = ("interval", "capacity", "candles", "aggregator", "strategy_name", "strategy", "last_signal")
+
+    def __init__(self, interval: str, capacity: int, strategy: str):
+        self.interval = interval
+        self.capacity = capacity
+        self.candles = CandleBuffer(capacity)
+        self.aggregator = KlineAggregator(interval)
+        self.strategy_name = strategy
+        self.strategy = None
+        self.last_signal = "HOLD"
+
+    def load(self, base: pd.DataFrame, older: pd.DataFrame = None):
+        df = combine_history(older, resample_ohlcv(base, self.interval))
+        self.candles = CandleBuffer.from_frame(df, self.capacity)
+        self.aggregator = KlineAggregator(self.interval).seed(base)
+        self.set_strategy(self.strategy_name)
+
+    def set_strategy(self, name: str):
+        self.strategy_name = name
+        self.strategy = make_live_strategy(name, self.candles.to_frame())
+
+
+class LiveSession:
+    """
+    Стан live-сесії без залежності від Tk: кільцевий буфер базових 1m-свічок,
+    похідні від нього таймфрейми (`core/resample.py`) з потоковими стратегіями та
+    обробка kline-повідомлень 1m. Основний інтервал (`interval`) іде в `sink` - об'єкт
+    з методами `set_candle`, `add_signal` та `log` (напр. `ui.update_queue.UiUpdateQueue`);
+    додаткові (`watch`) лише пишуть сигнали в лог.
+
+    Зміна інтервалу не потребує мережі: свічки перераховуються з 1m-буфера.
+    `symbol` - пара сесії: повідомлення іншої пари чи не 1m-інтервалу відкидаються
+    (рахуються в `ignored`); None - приймати будь-яку пару.
+    """
+
+    def __init__(self, capacity: int = 5000, strategy: str = "EMA", sink=None, interval: str = BASE_INTERVAL,
+                 base_capacity: int = BASE_CAPACITY, symbol: str = None):
+        self.capacity = capacity
+        self.sink = sink
+        self.symbol = symbol.upper() if symbol else None
+        self.ignored = 0
+        self.interval = interval
+        self.base = CandleBuffer(base_capacity)
+        self.frames = {interval: _Timeframe(interval, capacity, strategy)}
+        self.watched = set()
+        self._lock = threading.Lock()
+
+    @property
+    def candles(self) -> CandleBuffer:
+        return self.frames[self.interval].candles
+
+    @property
+    def strategy(self):
+        return self.frames[self.interval].strategy
+
+    @property
+    def strategy_name(self) -> str:
+        return self.frames[self.interval].strategy_name
+
+    def load(self, df: pd.DataFrame, older: pd.DataFrame = None):
+        """
+        Заповнює 1m-буфер історією, перераховує таймфрейми і прогріває стратегії.
+        `older` - старші свічки основного інтервалу, яких не покриває 1m-історія.
+        """
+        with self._lock:
+            self.base = CandleBuffer.from_frame(df, self.base.capacity)
+            base = self.base.to_frame()
+            for interval, frame in self.frames.items():
+                frame.load(base, older if interval == self.interval else None)
+
+    def set_symbol(self, symbol: str):
+        """Нова пара сесії; свічки для неї завантажує `load`."""
+        with self._lock:
+            self.symbol = symbol.upper() if symbol else None
+
+    def accepts(self, msg: dict) -> bool:
+        """Повідомлення для пари сесії та базового 1m-інтервалу."""
+        data = msg.get("data", msg)
+        symbol = data.get("s")
+        if self.symbol is not None and symbol is not None and symbol.upper() != self.symbol:
+            return False
+        return data["k"].get("i", BASE_INTERVAL) == BASE_INTERVAL
+
+    def set_interval(self, interval: str, older: pd.DataFrame = None):
+        """Робить `interval` основним; свічки будуються з 1m-буфера без запитів до біржі."""
+        with self._lock:
+            if interval == self.interval:
+                return
+            current = self.frames[self.interval]
+            frame = self.frames.get(interval)
+            if frame is None or older is not None:
+                frame = _Timeframe(interval, self.capacity, current.strategy_name)
+                frame.load(self.base.to_frame(), older)
+                self.frames[interval] = frame
+            if self.interval not in self.watched:
+                del self.frames[self.interval]
+            self.interval = interval
+
+    def watch(self, interval: str, strategy: str = None):
+        """Додатковий таймфрейм зі своєю стратегією з тієї ж підписки 1m."""
+        with self._lock:
+            self.watched.add(interval)
+            if interval not in self.frames:
+                frame = _Timeframe(interval, self.capacity, strategy or self.strategy_name)
+                frame.load(self.base.to_frame())
+                self.frames[interval] = frame
+            elif strategy is not None:
+                self.frames[interval].set_strategy(strategy)
+
+    def unwatch(self, interval: str):
+        with self._lock:
+            self.watched.discard(interval)
+            if interval != self.interval:
+                self.frames.pop(interval, None)
+
+    def set_strategy(self, name: str):
+        with self._lock:
+            self.frames[self.interval].set_strategy(name)
+
+    def to_frame(self, n: int = None) -> pd.DataFrame:
+        """Копія останніх n свічок основного інтервалу (безпечно читати з іншого потоку)."""
+        with self._lock:
+            return self.candles.to_frame(n).copy()
+
+    def process_kline(self, msg: dict, received: float = None):
+        """
+        Обробляє одне kline-повідомлення 1m; повертає сигнал основного інтервалу,
+        якщо його свічка закрилась, інакше None.
+        `received` - `tracer.now()` у момент отримання кадру (для наскрізної затримки).
+        """
+        with tracer.span("kline.parse"):
+            open_time, o, h, l, c, v, closed = parse_kline(msg)
+        sink = self.sink
+        signal = None
+        with self._lock:
+            if not self.accepts(msg):
+                # кадр старої пари (з черги чи до перепідписки сокета) не має потрапити в буфер
+                self.ignored += 1
+                return None
+            with tracer.span("kline.buffer_push"):
+                self.base.push(open_time, o, h, l, c, v)
+            for interval, frame in self.frames.items():
+                with tracer.span("kline.aggregate"):
+                    t, o_, h_, l_, c_, v_, bar_closed = frame.aggregator.update(open_time, o, h, l, c, v, closed)
+                    frame.candles.push(t, o_, h_, l_, c_, v_)
+                primary = interval == self.interval
+                if primary and sink is not None:
+                    sink.set_candle(t, o_, h_, l_, c_)
+                if not bar_closed:
+                    continue
+
+                # 🔹 потокова стратегія: O(1) від попереднього стану
+                ts = pd.Timestamp(t, unit="ms")
+                live = frame.strategy
+                with tracer.span("kline.strategy"):
+                    frame.last_signal = live.update(ts, c_) if live is not None else "HOLD"
+                if primary:
+                    signal = frame.last_signal
+                    if sink is not None:
+                        sink.add_signal(signal, c_, received)
+                        sink.log(f"New Futures candle: {ts} Close={c_:.5f}", True)
+                elif sink is not None:
+                    sink.log(f"[{interval}] {frame.strategy_name} signal: {frame.last_signal} Close={c_:.5f}", True)
+        return signal
@@ -0,0 +1,105 @@
+import numpy as np
+import pandas as pd
+
+# Monte Carlo стійкості бектесту: з дохідностей угод (або барів) будується багато
+# випадкових перестановок/вибірок, і для кожного шляху рахуються фінальний капітал,
+# максимальна просадка та чи досягнуто рівня "руїни". Шляхи обробляються пачками як
+# 2-D масиви (paths x кроки), без циклу по угодах.
+
+METHODS = ("bootstrap", "block", "shuffle")
+# Скільки елементів (шляхи x кроки) обробляти за раз: ~8 МБ на масив float64
+DEFAULT_CHUNK_ELEMENTS = 1_000_000
+PERCENTILES = (5, 25, 50, 75, 95)
+
+
+def trade_returns(result) -> np.ndarray:
+    """
+    Дохідності угод із результату бектесту: словник `backtest.simulate`, таблиця його угод
+    або список [(дія, ціна), ...] з `long_only_backtest`/`run_backtest` (вхід, вихід по парах).
+    """
+    if isinstance(result, dict):
+        result = result["trades"]
+    if isinstance(result, pd.DataFrame):
+        return result["return"].to_numpy(dtype=float)
+    actions = list(result)
+    entries, exits = actions[0::2], actions[1::2]
+    returns = [exit_price / entry_price - 1 if action.startswith("BUY") else 1 - exit_price / entry_price
+               for (action, entry_price), (_, exit_price) in zip(entries, exits)]
+    return np.asarray(returns, dtype=float)
+
+
+def bar_returns(result: dict) -> np.ndarray:
+    """Дохідності по барах із кривої капіталу `backtest.simulate`."""
+    equity = np.asarray(result["equity"], dtype=float)
+    return np.diff(equity) / equity[:-1] if len(equity) > 1 else np.array([])
+
+
+def _sample(rng: np.random.Generator, log_returns: np.ndarray, paths: int, method: str, block: int) -> np.ndarray:
+    n = len(log_returns)
+    if method == "bootstrap":
+        return log_returns[rng.integers(0, n, size=(paths, n))]
+    if method == "block":
+        # циклічний блоковий бутстреп: зберігає автокореляцію всередині блоків
+        blocks = -(-n // block)
+        starts = rng.integers(0, n, size=(paths, blocks, 1))
+        index = (starts + np.arange(block)) % n
+        return log_returns[index.reshape(paths, blocks * block)[:, :n]]
+    if method == "shuffle":
+        # ті самі угоди в іншому порядку: фінальний капітал незмінний, змінюється просадка
+        return rng.permuted(np.broadcast_to(log_returns, (paths, n)), axis=1)
+    raise ValueError(f"Unknown method: {method}")
+
+
+def monte_carlo(returns, paths: int = 10_000, method: str = "bootstrap", block: int = 20,
+                capital: float = 1000.0, ruin: float = 0.5, seed: int = None,
+                chunk: int = None) -> dict:
+    """
+    Monte Carlo по дохідностях угод/барів (частки, 0.01 = +1%).
+
+    method: bootstrap - вибірка з поверненням; block - блоками по `block` підряд;
+    shuffle - перестановка без повернення. ruin - частка втраченого капіталу, після
+    якої шлях вважається "руїною" (0.5 = капітал хоч раз упав нижче 50%).
+    chunk - шляхів за раз (None - щоб пачка мала ~DEFAULT_CHUNK_ELEMENTS елементів).
+    Повертає метрики розподілу та масиви по шляхах ("final_equity", "max_drawdown", "ruined").
+    """
+    if method not in METHODS:
+        raise ValueError(f"Unknown method: {method}")
+    returns = np.asarray(returns, dtype=float)
+    n = len(returns)
+    rng = np.random.default_rng(seed)
+    final = np.full(paths, capital, dtype=float)
+    max_dd = np.zeros(paths)
+    ruined = np.zeros(paths, dtype=bool)
+
+    if n:
+        # у логарифмах шлях капіталу - кумулятивна сума
+        log_returns = np.log1p(np.maximum(returns, -1 + 1e-12))
+        ruin_level = np.log1p(-ruin) if ruin < 1 else -np.inf
+        chunk = chunk or max(1, DEFAULT_CHUNK_ELEMENTS // n)
+        for start in range(0, paths, chunk):
+            stop = min(start + chunk, paths)
+            log_equity = _sample(rng, log_returns, stop - start, method, block)
+            np.cumsum(log_equity, axis=1, out=log_equity)
+            final[start:stop] = capital * np.exp(log_equity[:, -1])
+            ruined[start:stop] = log_equity.min(axis=1) <= ruin_level
+            # пік рахується разом зі стартовим капіталом (лог = 0)
+            peak = np.maximum.accumulate(np.maximum(log_equity, 0.0), axis=1)
+            np.subtract(log_equity, peak, out=log_equity)
+            max_dd[start:stop] = 1 - np.exp(log_equity.min(axis=1))
+
+    result = {
+        "Paths": paths,
+        "Steps": n,
+        "Method": method,
+        "Initial Capital": capital,
+        "Final Equity (mean)": float(final.mean()),
+        **{f"Final Equity p{p}": float(v) for p, v in zip(PERCENTILES, np.percentile(final, PERCENTILES))},
+        "Probability of Loss %": float((final < capital).mean() * 100),
+        "Max Drawdown % (median)": float(np.median(max_dd) * 100),
+        "Max Drawdown % p95": float(np.percentile(max_dd, 95) * 100),
+        "Risk of Ruin %": float(ruined.mean() * 100),
+        "final_equity": final,
+        "max_drawdown": max_dd,
+        "ruined": ruined,
+    }
+    return result
@@ -0,0 +1,125 @@
+import itertools
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+
+from core import backtest, strategies
+
+OHLCV = ["open", "high", "low", "close", "volume"]
+
+
+def parse_range(text: str) -> list:
+    """'5:20:5' → [5, 10, 15, 20] (кінець включно); '9' → [9]; '9,12,21' → [9, 12, 21]."""
+    if "," in text:
+        return [int(x) for x in text.split(",")]
+    parts = [int(x) for x in text.split(":")]
+    if len(parts) == 1:
+        return parts
+    start, stop = parts[0], parts[1]
+    step = parts[2] if len(parts) > 2 else 1
+    return list(range(start, stop + 1, step))
+
+
+def param_grid(strategy: str, ranges: dict) -> list:
+    """
+    Повна сітка комбінацій для параметрів стратегії з реєстру; для параметрів без
+    діапазону в `ranges` - типове значення. Некоректні (fast >= slow) відкидаються.
+    """
+    defaults = strategies.get(strategy).params
+    names = list(defaults)
+    grid = []
+    for values in itertools.product(*(ranges.get(name) or [defaults[name]] for name in names)):
+        params = dict(zip(names, values))
+        if "fast" in params and params["fast"] >= params["slow"]:
+            continue
+        grid.append(params)
+    return grid
+
+
+def random_subset(grid: list, n: int, seed: int = None) -> list:
+    """Випадкова підмножина сітки з n комбінацій."""
+    if n >= len(grid):
+        return list(grid)
+    return random.Random(seed).sample(grid, n)
+
+
+# ===== спільна пам'ять для воркерів =====
+
+class SharedCandles:
+    """
+    OHLCV-масив у `multiprocessing.shared_memory`: батьківський процес копіює
+    свічки один раз, воркери підключаються за іменем без pickle даних.
+    """
+
+    def __init__(self, df: pd.DataFrame):
+        data = np.ascontiguousarray(df[OHLCV].to_numpy(dtype=np.float64).T)  # (5, n), колонки суцільні
+        self.shape = data.shape
+        self.shm = shared_memory.SharedMemory(create=True, size=max(data.nbytes, 1))
+        np.ndarray(self.shape, dtype=np.float64, buffer=self.shm.buf)[:] = data
+
+    @property
+    def name(self) -> str:
+        return self.shm.name
+
+    def close(self):
+        self.shm.close()
+        self.shm.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+_worker_shm = None
+_worker_df = None
+
+
+def _init_worker(shm_name: str, shape: tuple):
+    global _worker_shm, _worker_df
+    _worker_shm = shared_memory.SharedMemory(name=shm_name)
+    data = np.ndarray(shape, dtype=np.float64, buffer=_worker_shm.buf)
+    _worker_df = pd.DataFrame({name: data[i] for i, name in enumerate(OHLCV)}, copy=False)
+
+
+def evaluate(df: pd.DataFrame, strategy: str, params: dict, capital: float = 1000) -> dict:
+    """Один прогін long-only бектесту: дохідність, кількість угод та winrate."""
+    sigs = backtest.strategy_signals(strategy, df, **params)
+    balance, trades, stats = backtest.long_only_backtest(df, sigs, capital, with_stats=True)
+    return {
+        **params,
+        "Return %": (balance / capital - 1) * 100,
+        "Trades Count": len(trades),
+        "Winrate %": stats["Winrate %"],
+    }
+
+
+def _evaluate_task(task):
+    strategy, params, capital = task
+    return evaluate(_worker_df, strategy, params, capital)
+
+
+def optimize(df: pd.DataFrame, strategy: str, combos: list, capital: float = 1000,
+             processes: int = None, chunksize: int = None) -> pd.DataFrame:
+    """
+    Оцінює всі комбінації параметрів у пулі процесів. Свічки кладуться у спільну
+    пам'ять один раз. Повертає таблицю, відсортовану за дохідністю.
+    """
+    processes = processes or os.cpu_count() or 1
+    chunksize = chunksize or max(1, len(combos) // (processes * 4))
+    tasks = [(strategy, params, capital) for params in combos]
+
+    with SharedCandles(df) as shared:
+        with ProcessPoolExecutor(max_workers=processes, initializer=_init_worker,
+                                 initargs=(shared.name, shared.shape)) as pool:
+            results = list(pool.map(_evaluate_task, tasks, chunksize=chunksize))
+
+    table = pd.DataFrame(results)
+    if len(table):
+        table = table.sort_values("Return %", ascending=False).reset_index(drop=True)
+    return table
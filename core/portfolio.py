@@ -0,0 +1,129 @@
+import numpy as np
+import pandas as pd
+
+from core import backtest, strategies
+
+# Портфельний бектест кількох пар на спільній часовій осі.
+# Ціни всіх пар вирівнюються в матрицю (час x пара) з forward-fill пропущених барів;
+# сигнали кожної пари рахуються стратегією з реєстру на її власних свічках (лінійно за
+# кількістю пар), а позиції, ваги й PnL портфеля - векторно по 2-D масивах без циклу по барах.
+
+SIZING = ("equal", "active", "fixed")
+
+
+def align(frames: dict) -> pd.DataFrame:
+    """
+    {пара: свічки} → close-матриця на об'єднаному індексі часу (колонки - пари).
+    Пропущені бари заповнюються попереднім close; до першої свічки пари - NaN.
+    """
+    closes = pd.concat({symbol: df["close"] for symbol, df in frames.items()}, axis=1, sort=True)
+    return closes.ffill()
+
+
+def positions(frames: dict, index: pd.Index, strategy: str, long_short: bool = False, **params) -> np.ndarray:
+    """
+    Цільові позиції (1 / -1 / 0) матрицею int8 (час x пара) на індексі `index`.
+    Сигнали кожної пари рахуються стратегією з реєстру на її власних свічках; на
+    заповнених барах позиція тримається, до першої свічки пари - 0.
+    """
+    spec = strategies.get(strategy)
+    n = len(index)
+    position = np.zeros((n, len(frames)), dtype=np.int8)
+    for j, df in enumerate(frames.values()):
+        codes = backtest.signal_codes(spec.signals(df, **params).to_numpy(), long_short)
+        # ціль = останній не-HOLD сигнал (як у `backtest.simulate`)
+        valid = ~np.isnan(codes)
+        last = np.maximum.accumulate(np.where(valid, np.arange(len(codes)), -1))
+        own = np.where(last >= 0, codes[np.maximum(last, 0)], 0.0).astype(np.int8)
+        # власна свічка пари, що діє на кожному барі спільного індексу
+        rows = np.searchsorted(index.get_indexer(df.index), np.arange(n), side="right") - 1
+        position[:, j] = np.where(rows >= 0, own[np.maximum(rows, 0)], 0)
+    return position
+
+
+def _weights_scale(position: np.ndarray, sizing: str, fraction: float) -> np.ndarray:
+    """Вага однієї позиції на кожному барі (однакова для всіх відкритих позицій бару)."""
+    n_symbols = position.shape[1]
+    if sizing == "equal":
+        # фіксована частка капіталу на пару; невикористане лежить у кеші
+        return np.full(len(position), 1.0 / n_symbols)
+    active = np.count_nonzero(position, axis=1)
+    if sizing == "active":
+        # увесь капітал порівну між відкритими позиціями
+        return np.divide(1.0, active, out=np.zeros(len(position)), where=active > 0)
+    if sizing == "fixed":
+        # `fraction` капіталу на позицію, але разом не більше 100%
+        return np.minimum(fraction, np.divide(1.0, active, out=np.full(len(position), fraction), where=active > 0))
+    raise ValueError(f"Unknown sizing rule: {sizing}")
+
+
+def portfolio_backtest(frames: dict, strategy: str, capital: float = 1000.0, sizing: str = "equal",
+                       fraction: float = 0.1, long_short: bool = False, taker_fee: float = 0.0,
+                       maker_fee: float = 0.0, use_maker: bool = False, slippage: float = 0.0,
+                       periods_per_year: float = None, **params) -> dict:
+    """
+    Бектест стратегії з реєстру на кількох парах зі спільним капіталом.
+
+    sizing: equal - 1/N капіталу на кожну пару; active - капітал порівну між відкритими
+    позиціями; fixed - `fraction` капіталу на позицію (разом не більше 100%).
+    Позиція відкривається по close бару з сигналом (як у `backtest.simulate`); ваги
+    тримаються на цільовому рівні на кожному барі, комісія та прослизання (як у `simulate`)
+    беруться з обороту - зміни ваг. Повертає метрики портфеля, криву капіталу, позиції
+    (час x пара), вагу однієї позиції на кожному барі та внесок кожної пари.
+    """
+    if sizing not in SIZING:
+        raise ValueError(f"Unknown sizing rule: {sizing}")
+    cost = (maker_fee if use_maker else taker_fee) + slippage
+    closes = align(frames)
+    index, symbols = closes.index, list(closes.columns)
+    price = closes.to_numpy()
+    n = len(price)
+
+    position = positions(frames, index, strategy, long_short, **params)
+    scale = _weights_scale(position, sizing, fraction)
+    # дохідність пар за бар (t-1 → t); до лістингу пари - 0
+    contrib = np.zeros_like(price)
+    np.divide(price[1:], price[:-1], out=contrib[1:])
+    contrib[1:] -= 1
+    np.nan_to_num(contrib, copy=False, nan=0.0)
+    del closes, price
+    # внесок пар: позиція попереднього бару x вага x дохідність (на місці, без копій матриці)
+    contrib[1:] *= position[:-1]
+    contrib[1:] *= scale[:-1, None]
+    bar_return = contrib.sum(axis=1)
+    # оборот: зміна ваг (вхід із нуля на першому барі)
+    turnover = np.diff(position * scale[:, None], axis=0, prepend=0.0)
+    bar_return -= np.abs(turnover, out=turnover).sum(axis=1) * cost
+    del turnover
+
+    equity = capital * np.cumprod(1 + bar_return)
+    final_balance = float(equity[-1]) if n else float(capital)
+    per_bar = bar_return[1:] if n > 1 else np.array([])
+    std = per_bar.std() if len(per_bar) else 0.0
+    sharpe = per_bar.mean() / std * np.sqrt(periods_per_year or 1) if std > 0 else 0.0
+    peak = np.maximum.accumulate(np.maximum(equity, capital)) if n else equity
+    # угода = бар, на якому позиція пари змінюється на ненульову
+    entries = np.count_nonzero((np.diff(position, axis=0, prepend=0) != 0) & (position != 0), axis=0)
+
+    per_symbol = pd.DataFrame({
+        "Contribution %": contrib.sum(axis=0) * 100,
+        "Trades Count": entries,
+        "Exposure %": (position != 0).mean(axis=0) * 100 if n else 0.0,
+    }, index=pd.Index(symbols, name="symbol"))
+
+    return {
+        "Initial Capital": capital,
+        "Final Balance": final_balance,
+        "Net Profit": final_balance - capital,
+        "Return %": (final_balance / capital - 1) * 100,
+        "Trades Count": int(entries.sum()),
+        "Max Drawdown %": float((1 - equity / peak).max() * 100) if n else 0.0,
+        "Sharpe": float(sharpe),
+        "Exposure %": float((position != 0).any(axis=1).mean() * 100) if n else 0.0,
+        "index": index,
+        "symbols": symbols,
+        "equity": equity,
+        "positions": position,
+        "weight": scale,
+        "per_symbol": per_symbol,
+    }
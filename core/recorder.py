@@ -0,0 +1,113 @@
+import json
+import struct
+import threading
+import time
+
+# Журнал websocket-повідомлень: заголовок MAGIC, далі записи
+#   <f8 час отримання (time.time())> <u1 тип> <u4 довжина> <JSON повідомлення>
+# Файл лише дописується, тож обірваний останній запис просто ігнорується при читанні.
+
+MAGIC = b"DTREC\x01"
+_HEADER = struct.Struct("<dBI")
+
+KINDS = ("ticker", "kline")
+_KIND_CODES = {kind: code for code, kind in enumerate(KINDS)}
+
+
+class MessageRecorder:
+    """
+    Дописує сирі повідомлення ticker/kline у бінарний журнал.
+    `wrap(kind, callback)` повертає callback для `ThreadedWebsocketManager`, який
+    спершу пише повідомлення, а потім передає його оригінальному обробнику.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.count = 0
+        self._lock = threading.Lock()
+        self._file = open(path, "ab")
+        if self._file.tell() == 0:
+            self._file.write(MAGIC)
+
+    def record(self, kind: str, msg: dict, received: float = None):
+        payload = json.dumps(msg, separators=(",", ":")).encode("utf-8")
+        header = _HEADER.pack(time.time() if received is None else received, _KIND_CODES[kind], len(payload))
+        with self._lock:
+            if self._file is None:
+                return
+            self._file.write(header)
+            self._file.write(payload)
+            self.count += 1
+
+    def wrap(self, kind: str, callback):
+        def recorded(msg):
+            try:
+                self.record(kind, msg)
+            except (TypeError, ValueError, OSError):
+                pass  # запис не повинен ламати live-обробку
+            return callback(msg)
+        return recorded
+
+    def flush(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.flush()
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+def read_log(path: str):
+    """Генерує (час отримання, тип, повідомлення) із журналу."""
+    with open(path, "rb") as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{path}: not a message log")
+        while True:
+            header = f.read(_HEADER.size)
+            if len(header) < _HEADER.size:
+                return
+            received, code, length = _HEADER.unpack(header)
+            payload = f.read(length)
+            if len(payload) < length:
+                return
+            yield received, KINDS[code], json.loads(payload)
+
+
+def replay(path: str, handlers: dict, speed: float = 1.0, stop: threading.Event = None) -> dict:
+    """
+    Відтворює журнал через `handlers` ({"ticker": f, "kline": g}).
+
+    speed=1 - реальний час, N - у N разів швидше, 0/None - без пауз (максимальна швидкість).
+    Повертає кількість повідомлень, тривалість, пропускну здатність (msg/s) і
+    найбільше відставання від розкладу (для режимів з паузами).
+    """
+    count = 0
+    max_lag = 0.0
+    first = None
+    start = time.perf_counter()
+    for received, kind, msg in read_log(path):
+        if stop is not None and stop.is_set():
+            break
+        if speed:
+            if first is None:
+                first = received
+            due = start + (received - first) / speed
+            delay = due - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            else:
+                max_lag = max(max_lag, -delay)
+        handler = handlers.get(kind)
+        if handler is not None:
+            handler(msg)
+        count += 1
+    seconds = time.perf_counter() - start
+    return {
+        "messages": count,
+        "seconds": seconds,
+        "messages_per_sec": count / seconds if seconds > 0 else 0.0,
+        "max_lag": max_lag,
+    }
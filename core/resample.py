@@ -0,0 +1,102 @@
+import numpy as np
+import pandas as pd
+
+from core.kline_store import INTERVAL_MS
+
+# Старші таймфрейми з базових 1m-свічок.
+# Межі свічок як на біржі: open_time кратний тривалості інтервалу від епохи Unix
+# (1h - на початку години, 4h - о 00/04/08.. UTC, 1d - о 00:00 UTC).
+
+BASE_INTERVAL = "1m"
+MINUTE_MS = INTERVAL_MS[BASE_INTERVAL]
+
+
+def bucket_start(open_time_ms: int, interval: str) -> int:
+    step = INTERVAL_MS[interval]
+    return open_time_ms // step * step
+
+
+def resample_ohlcv(df: pd.DataFrame, interval: str) -> pd.DataFrame:
+    """
+    1m-свічки (формат `get_historical_futures_klines`) → свічки інтервалу.
+    Перша свічка відкидається, якщо історія починається не з її першої хвилини
+    (на біржі вона повніша); остання може бути незакритою, як і на біржі.
+    """
+    if interval == BASE_INTERVAL or not len(df):
+        return df[["open", "high", "low", "close", "volume"]]
+    step = INTERVAL_MS[interval]
+    times = df.index.values.astype("datetime64[ms]").astype(np.int64)
+    buckets = times // step * step
+    starts = np.flatnonzero(np.r_[True, buckets[1:] != buckets[:-1]])
+    ends = np.r_[starts[1:], len(times)] - 1
+
+    out = pd.DataFrame({
+        "open": df["open"].to_numpy()[starts],
+        "high": np.maximum.reduceat(df["high"].to_numpy(dtype=float), starts),
+        "low": np.minimum.reduceat(df["low"].to_numpy(dtype=float), starts),
+        "close": df["close"].to_numpy()[ends],
+        "volume": np.add.reduceat(df["volume"].to_numpy(dtype=float), starts),
+    }, index=pd.DatetimeIndex(buckets[starts].astype("datetime64[ms]"), name="timestamp"))
+    if times[0] != buckets[0]:
+        out = out.iloc[1:]
+    return out
+
+
+def combine_history(older: pd.DataFrame, derived: pd.DataFrame) -> pd.DataFrame:
+    """Доповнює похідні свічки старшими (напр. з кешу `kline_store`) до їхнього початку."""
+    if older is None or not len(older):
+        return derived
+    if not len(derived):
+        return older
+    return pd.concat([older[older.index < derived.index[0]][derived.columns], derived])
+
+
+class KlineAggregator:
+    """
+    Інкрементальна агрегація потоку 1m-свічок в інтервал.
+
+    `update` приймає кожне kline-оновлення (включно з незакритими) і повертає
+    поточний стан свічки інтервалу; closed=True - коли закрилась її остання хвилина.
+    """
+
+    __slots__ = ("interval", "step", "bucket", "closed_part", "last_closed")
+
+    def __init__(self, interval: str):
+        self.interval = interval
+        self.step = INTERVAL_MS[interval]
+        self.bucket = None
+        self.closed_part = None  # (o, h, l, v) закритих хвилин поточної свічки
+        self.last_closed = None  # open_time останньої врахованої закритої хвилини
+
+    def update(self, open_time: int, o: float, h: float, l: float, c: float, v: float, closed: bool) -> tuple:
+        bucket = open_time // self.step * self.step
+        if bucket != self.bucket:
+            self.bucket = bucket
+            self.closed_part = None
+
+        part = self.closed_part
+        if self.last_closed is not None and open_time <= self.last_closed:
+            # хвилина вже врахована як закрита (напр. після seed) - повторно не додаємо
+            o_, h_, l_, v_ = part if part is not None else (o, h, l, v)
+        elif part is None:
+            o_, h_, l_, v_ = o, h, l, v
+        else:
+            o_, h_, l_, v_ = part[0], max(part[1], h), min(part[2], l), part[3] + v
+
+        if closed and (self.last_closed is None or open_time > self.last_closed):
+            self.closed_part = (o_, h_, l_, v_)
+            self.last_closed = open_time
+        bar_closed = closed and open_time + MINUTE_MS >= bucket + self.step
+        return bucket, o_, h_, l_, c, v_, bar_closed
+
+    def seed(self, df: pd.DataFrame) -> "KlineAggregator":
+        """Підхоплює поточну свічку інтервалу з історії 1m (остання хвилина вважається відкритою)."""
+        if not len(df):
+            return self
+        times = df.index.values.astype("datetime64[ms]").astype(np.int64)
+        bucket = times[-1] // self.step * self.step
+        first = int(np.searchsorted(times, bucket))
+        values = df[["open", "high", "low", "close", "volume"]].to_numpy(dtype=float)
+        for i in range(first, len(times)):
+            self.update(int(times[i]), *values[i], closed=i < len(times) - 1)
+        return self
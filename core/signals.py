@@ -1,6 +1,20 @@
+import numpy as np
 import pandas as pd
-from core import indicators
-from core.indicators import macd
+from core import streaming
+from core.indicator_cache import cache
+
+
+def _crossover_labels(upper: pd.Series, lower: pd.Series, warmup: int) -> pd.Series:
+    """
+    Векторна розмітка перетину двох рядів для кожної свічки:
+    BUY, якщо upper > lower; SELL, якщо upper < lower; HOLD, інакше.
+    Перші `warmup` свічок завжди HOLD (мало даних).
+    """
+    a = upper.to_numpy(dtype=float)
+    b = lower.to_numpy(dtype=float)
+    labels = np.where(a > b, "BUY", np.where(a < b, "SELL", "HOLD")).astype(object)
+    labels[:warmup] = "HOLD"
+    return pd.Series(labels, index=upper.index, dtype=object)
 
 
 def ema_crossover(df: pd.DataFrame, fast: int = 9, slow: int = 21, column: str = "close") -> str:
@@ -13,8 +27,8 @@ def ema_crossover(df: pd.DataFrame, fast: int = 9, slow: int = 21, column: str =
     if len(df) < slow:
         return "HOLD"  # мало даних
 
-    ema_fast = indicators.ema(df, fast, column)
-    ema_slow = indicators.ema(df, slow, column)
+    ema_fast = cache.ema(df, fast, column)
+    ema_slow = cache.ema(df, slow, column)
 
     if ema_fast.iloc[-1] > ema_slow.iloc[-1]:
         return "BUY"
@@ -24,6 +38,16 @@ def ema_crossover(df: pd.DataFrame, fast: int = 9, slow: int = 21, column: str =
         return "HOLD"
 
 
+def ema_crossover_series(df: pd.DataFrame, fast: int = 9, slow: int = 21, column: str = "close") -> pd.Series:
+    """
+    Серійна форма `ema_crossover`: сигнал для кожної свічки за один прохід.
+    Значення в рядку i збігається з `ema_crossover(df.iloc[: i + 1], ...)`.
+    """
+    ema_fast = cache.ema(df, fast, column)
+    ema_slow = cache.ema(df, slow, column)
+    return _crossover_labels(ema_fast, ema_slow, warmup=slow - 1)
+
+
 def rsi_strategy(df: pd.DataFrame, period: int = 14, overbought: int = 70, oversold: int = 30,
                  column: str = "close") -> str:
     """
@@ -35,7 +59,7 @@ def rsi_strategy(df: pd.DataFrame, period: int = 14, overbought: int = 70, overs
     if len(df) < period:
         return "HOLD"
 
-    rsi = indicators.rsi(df, period, column)
+    rsi = cache.rsi(df, period, column)
     last_rsi = rsi.iloc[-1]
 
     if last_rsi < oversold:
@@ -46,6 +70,18 @@ def rsi_strategy(df: pd.DataFrame, period: int = 14, overbought: int = 70, overs
         return "HOLD"
 
 
+def rsi_strategy_series(df: pd.DataFrame, period: int = 14, overbought: int = 70, oversold: int = 30,
+                        column: str = "close") -> pd.Series:
+    """
+    Серійна форма `rsi_strategy`: сигнал для кожної свічки за один прохід.
+    Значення в рядку i збігається з `rsi_strategy(df.iloc[: i + 1], ...)`.
+    """
+    rsi = cache.rsi(df, period, column).to_numpy(dtype=float)
+    labels = np.where(rsi < oversold, "BUY", np.where(rsi > overbought, "SELL", "HOLD")).astype(object)
+    labels[:period - 1] = "HOLD"
+    return pd.Series(labels, index=df.index, dtype=object)
+
+
 def macd_strategy(df, fast=12, slow=26, signal=9):
     """
     Стратегія MACD crossover:
@@ -53,12 +89,128 @@ def macd_strategy(df, fast=12, slow=26, signal=9):
     SELL → MACD нижче Signal
     HOLD → інакше
     """
-    macd_line, signal_line, hist = macd(df, fast, slow, signal)
-    if macd_line is None:
+    if len(df) < slow:
         return "HOLD"
 
-    if macd_line.iloc[-1] > signal_line.iloc[-1]:
+    lines = cache.macd(df, fast, slow, signal)
+    macd_line, signal_line = lines["macd"].iloc[-1], lines["signal"].iloc[-1]
+    if macd_line > signal_line:
+        return "BUY"
+    elif macd_line < signal_line:
+        return "SELL"
+    return "HOLD"
+
+
+def macd_strategy_series(df, fast=12, slow=26, signal=9):
+    """
+    Серійна форма `macd_strategy`: сигнал для кожної свічки за один прохід.
+    Значення в рядку i збігається з `macd_strategy(df.iloc[: i + 1], ...)`.
+    """
+    if len(df) < slow:
+        return pd.Series("HOLD", index=df.index, dtype=object)
+
+    lines = cache.macd(df, fast, slow, signal)
+    return _crossover_labels(lines["macd"], lines["signal"], warmup=slow - 1)
+
+
+# ===== Потокові (live) форми стратегій =====
+
+def _compare(a: float, b: float) -> str:
+    if a > b:
         return "BUY"
-    elif macd_line.iloc[-1] < signal_line.iloc[-1]:
+    elif a < b:
         return "SELL"
     return "HOLD"
+
+
+class _LiveStrategy:
+    """
+    База потокової стратегії поверх `core/streaming.py`.
+
+    `seed(df)` прогріває стан на історії, але останню свічку тримає "відкритою":
+    `get_historical_futures_klines` повертає поточну незакриту свічку, а закрита
+    свічка з тим самим часом має її замінити (як `CandleBuffer.push`).
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.last_signal = "HOLD"
+        self._pending = None  # (timestamp, close) відкритої свічки
+
+    def _step(self, close: float) -> str:
+        raise NotImplementedError
+
+    def _commit(self, close: float) -> str:
+        self.count += 1
+        self.last_signal = self._step(close)
+        return self.last_signal
+
+    def seed(self, df: pd.DataFrame, column: str = "close") -> "_LiveStrategy":
+        closes = df[column].to_numpy(dtype=float)
+        for close in closes[:-1]:
+            self._commit(close)
+        if len(closes):
+            self._pending = (df.index[-1], closes[-1])
+        return self
+
+    def update(self, timestamp, close: float) -> str:
+        """Застосовує закриту свічку і повертає сигнал (O(1))."""
+        if self._pending is not None:
+            pending_t, pending_close = self._pending
+            self._pending = None
+            if pending_t != timestamp:
+                self._commit(pending_close)
+        return self._commit(close)
+
+
+class EmaCrossoverLive(_LiveStrategy):
+    """Потокова форма `ema_crossover`."""
+
+    def __init__(self, fast: int = 9, slow: int = 21):
+        super().__init__()
+        self.slow = slow
+        self.ema_fast = streaming.StreamingEMA(fast)
+        self.ema_slow = streaming.StreamingEMA(slow)
+
+    def _step(self, close: float) -> str:
+        f = self.ema_fast.update(close)
+        s = self.ema_slow.update(close)
+        if self.count < self.slow:
+            return "HOLD"
+        return _compare(f, s)
+
+
+class RsiLive(_LiveStrategy):
+    """Потокова форма `rsi_strategy`."""
+
+    def __init__(self, period: int = 14, overbought: int = 70, oversold: int = 30):
+        super().__init__()
+        self.period = period
+        self.overbought = overbought
+        self.oversold = oversold
+        self.rsi = streaming.StreamingRSI(period)
+
+    def _step(self, close: float) -> str:
+        value = self.rsi.update(close)
+        if self.count < self.period:
+            return "HOLD"
+        if value < self.oversold:
+            return "BUY"
+        elif value > self.overbought:
+            return "SELL"
+        return "HOLD"
+
+
+class MacdLive(_LiveStrategy):
+    """Потокова форма `macd_strategy`."""
+
+    def __init__(self, fast: int = 12, slow: int = 26, signal: int = 9):
+        super().__init__()
+        self.slow = slow
+        self.macd = streaming.StreamingMACD(fast, slow, signal)
+
+    def _step(self, close: float) -> str:
+        macd_value, signal_value, _ = self.macd.update(close)
+        if self.count < self.slow:
+            return "HOLD"
+        return _compare(macd_value, signal_value)
@@ -0,0 +1,96 @@
+import pandas as pd
+
+from core import signals
+
+# Реєстр стратегій: кнопки GUI, `--strategy` у CLI, бектестер, оптимізатор і live-сесія
+# беруть список стратегій звідси. Нова стратегія = серійна форма + потокова форма
+# (`signals._LiveStrategy`) + один виклик `register`.
+
+
+class Strategy:
+    """
+    Опис стратегії.
+
+    series(df, **params) → сигнал для кожної свічки; live(**params) → потокова форма;
+    params - параметри з типовими значеннями; columns - потрібні колонки свічок;
+    warmup(params) → скільки останніх свічок достатньо, щоб останній сигнал збігся
+    з обчисленим на всій історії (для EMA - поки вплив старших свічок < 1e-8).
+    """
+
+    __slots__ = ("name", "series", "live", "params", "columns", "warmup")
+
+    def __init__(self, name: str, series, live, params: dict, warmup, columns=("close",)):
+        self.name = name
+        self.series = series
+        self.live = live
+        self.params = dict(params)
+        self.columns = tuple(columns)
+        self.warmup = warmup
+
+    def bind(self, **kwargs) -> dict:
+        """Параметри стратегії: передані (не None) або типові; чужі ключі ігноруються."""
+        return {name: kwargs[name] if kwargs.get(name) is not None else default
+                for name, default in self.params.items()}
+
+    def warmup_length(self, **kwargs) -> int:
+        return int(self.warmup(self.bind(**kwargs)))
+
+    def _check_columns(self, df: pd.DataFrame):
+        missing = [c for c in self.columns if c not in df.columns]
+        if missing:
+            raise ValueError(f"{self.name} needs columns {missing}")
+
+    def signals(self, df: pd.DataFrame, **kwargs) -> pd.Series:
+        """Сигнал для кожної свічки df (бектест)."""
+        self._check_columns(df)
+        return self.series(df, **self.bind(**kwargs))
+
+    def evaluate(self, df: pd.DataFrame, **kwargs) -> str:
+        """Сигнал на останній свічці; рахується лише на хвості довжини `warmup_length`."""
+        self._check_columns(df)
+        if not len(df):
+            return "HOLD"
+        params = self.bind(**kwargs)
+        return self.series(df.tail(int(self.warmup(params))), **params).iloc[-1]
+
+    def make_live(self, history: pd.DataFrame = None, **kwargs):
+        """Потокова форма, прогріта на хвості `history` (якщо задано)."""
+        params = self.bind(**kwargs)
+        live = self.live(**params)
+        if history is not None and len(history):
+            self._check_columns(history)
+            live.seed(history.tail(int(self.warmup(params))))
+        return live
+
+
+REGISTRY = {}
+
+
+def register(name: str, series, live, params: dict, warmup, columns=("close",)) -> Strategy:
+    strategy = Strategy(name, series, live, params, warmup, columns)
+    REGISTRY[name] = strategy
+    return strategy
+
+
+def get(name: str) -> Strategy:
+    try:
+        return REGISTRY[name]
+    except KeyError:
+        raise ValueError(f"Unknown strategy: {name}") from None
+
+
+def names() -> list:
+    return list(REGISTRY)
+
+
+# ===== вбудовані стратегії (параметри як у GUI) =====
+
+register("EMA", signals.ema_crossover_series, signals.EmaCrossoverLive,
+         {"fast": 9, "slow": 21},
+         warmup=lambda p: 10 * p["slow"])
+register("RSI", signals.rsi_strategy_series, signals.RsiLive,
+         {"period": 14, "overbought": 70, "oversold": 30},
+         warmup=lambda p: p["period"] + 1)  # SMA приростів: вікно period різниць - точно
+register("MACD", signals.macd_strategy_series, signals.MacdLive,
+         {"fast": 12, "slow": 26, "signal": 9},
+         warmup=lambda p: 10 * (p["slow"] + p["signal"]))
@@ -0,0 +1,216 @@
+import math
+from collections import deque
+
+import pandas as pd
+
+# Потокові (інкрементальні) індикатори.
+# Кожен об'єкт оновлюється за O(1) від попереднього стану та нового close,
+# а формули повторюють `core/indicators.py` (pandas ewm/rolling), тож після
+# `seed()` на історичних свічках значення збігаються з пакетними функціями.
+
+NAN = float("nan")
+
+
+class StreamingEMA:
+    """Потокова EMA (як `indicators.ema`, ewm(span=period, adjust=False))."""
+
+    __slots__ = ("period", "alpha", "value")
+
+    def __init__(self, period: int = 14):
+        self.period = period
+        self.alpha = 2.0 / (period + 1.0)
+        self.value = NAN
+
+    def update(self, x: float) -> float:
+        if self.value != self.value:  # перше значення
+            self.value = x
+        elif self.value != x:
+            # той самий порядок операцій, що й у pandas ewm
+            old_wt = 1.0 - self.alpha
+            self.value = (old_wt * self.value + self.alpha * x) / (old_wt + self.alpha)
+        return self.value
+
+    def seed(self, values) -> "StreamingEMA":
+        for x in values:
+            self.update(float(x))
+        return self
+
+
+class StreamingSMA:
+    """Потокова SMA (як `indicators.sma`, rolling(window=period).mean())."""
+
+    __slots__ = ("period", "window", "sum", "add_comp", "remove_comp", "neg_ct", "same_ct", "prev", "value")
+
+    def __init__(self, period: int = 14):
+        self.period = period
+        self.window = deque()
+        self.sum = 0.0
+        self.add_comp = 0.0     # компенсація Кехена для додавання
+        self.remove_comp = 0.0  # ... та для видалення
+        self.neg_ct = 0
+        self.same_ct = 0
+        self.prev = NAN
+        self.value = NAN
+
+    def update(self, x: float) -> float:
+        if len(self.window) == self.period:
+            old = self.window.popleft()
+            y = -old - self.remove_comp
+            t = self.sum + y
+            self.remove_comp = t - self.sum - y
+            self.sum = t
+            if math.copysign(1.0, old) < 0:
+                self.neg_ct -= 1
+
+        self.window.append(x)
+        y = x - self.add_comp
+        t = self.sum + y
+        self.add_comp = t - self.sum - y
+        self.sum = t
+        if math.copysign(1.0, x) < 0:
+            self.neg_ct += 1
+        self.same_ct = self.same_ct + 1 if x == self.prev else 1
+        self.prev = x
+
+        n = len(self.window)
+        if n < self.period:
+            self.value = NAN
+        else:
+            result = self.sum / n
+            if self.same_ct >= n:
+                result = x
+            elif self.neg_ct == 0 and result < 0:
+                result = 0.0
+            elif self.neg_ct == n and result > 0:
+                result = 0.0
+            self.value = result
+        return self.value
+
+    def seed(self, values) -> "StreamingSMA":
+        for x in values:
+            self.update(float(x))
+        return self
+
+
+class StreamingRSI:
+    """Потоковий RSI (як `indicators.rsi`, середні приросту/втрат через SMA)."""
+
+    __slots__ = ("period", "prev_close", "gain", "loss", "value")
+
+    def __init__(self, period: int = 14):
+        self.period = period
+        self.prev_close = NAN
+        self.gain = StreamingSMA(period)
+        self.loss = StreamingSMA(period)
+        self.value = NAN
+
+    def update(self, x: float) -> float:
+        delta = x - self.prev_close  # для першої свічки NaN → 0, як у pandas
+        self.prev_close = x
+        g = self.gain.update(delta if delta > 0 else 0.0)
+        l = self.loss.update(-(delta if delta < 0 else 0.0))
+
+        if g != g or l != l:
+            self.value = NAN
+        elif l == 0:
+            self.value = 100.0 if g > 0 else NAN  # g / 0 → inf (RSI = 100) або NaN
+        else:
+            self.value = 100 - (100 / (1 + g / l))
+        return self.value
+
+    def seed(self, values) -> "StreamingRSI":
+        for x in values:
+            self.update(float(x))
+        return self
+
+
+class StreamingMACD:
+    """Потоковий MACD (як `indicators.macd`): лінії macd, signal та гістограма."""
+
+    __slots__ = ("fast", "slow", "signal_ema", "macd", "signal", "hist")
+
+    def __init__(self, fast: int = 12, slow: int = 26, signal: int = 9):
+        self.fast = StreamingEMA(fast)
+        self.slow = StreamingEMA(slow)
+        self.signal_ema = StreamingEMA(signal)
+        self.macd = NAN
+        self.signal = NAN
+        self.hist = NAN
+
+    def update(self, x: float) -> tuple:
+        self.macd = self.fast.update(x) - self.slow.update(x)
+        self.signal = self.signal_ema.update(self.macd)
+        self.hist = self.macd - self.signal
+        return self.macd, self.signal, self.hist
+
+    def seed(self, values) -> "StreamingMACD":
+        for x in values:
+            self.update(float(x))
+        return self
+
+
+class StreamingBollinger:
+    """Потокові смуги Боллінджера (як `indicators.bollinger_bands`, std з ddof=1)."""
+
+    __slots__ = ("period", "std_factor", "window", "mean", "ssqdm", "add_comp", "remove_comp",
+                 "sma", "middle", "upper", "lower")
+
+    def __init__(self, period: int = 20, std_factor: float = 2.0):
+        self.period = period
+        self.std_factor = std_factor
+        self.window = deque()
+        self.mean = 0.0
+        self.ssqdm = 0.0  # сума квадратів відхилень від середнього (Велфорд)
+        self.add_comp = 0.0
+        self.remove_comp = 0.0
+        self.sma = StreamingSMA(period)
+        self.middle = NAN
+        self.upper = NAN
+        self.lower = NAN
+
+    def _std(self) -> float:
+        n = len(self.window)
+        if n < self.period or n < 2:
+            return NAN
+        var = self.ssqdm / (n - 1)
+        return math.sqrt(var) if var > 0 else 0.0
+
+    def update(self, x: float) -> tuple:
+        if len(self.window) == self.period:
+            old = self.window.popleft()
+            n = len(self.window)
+            if n:
+                prev_mean = self.mean - self.remove_comp
+                y = old - self.remove_comp
+                t = y - self.mean
+                self.remove_comp = t + self.mean - y
+                self.mean -= t / n
+                self.ssqdm -= (old - prev_mean) * (old - self.mean)
+            else:
+                self.mean = 0.0
+                self.ssqdm = 0.0
+
+        self.window.append(x)
+        n = len(self.window)
+        prev_mean = self.mean - self.add_comp
+        y = x - self.add_comp
+        t = y - self.mean
+        self.add_comp = t + self.mean - y
+        self.mean += t / n
+        self.ssqdm += (x - prev_mean) * (x - self.mean)
+
+        self.middle = self.sma.update(x)
+        std = self._std()
+        self.upper = self.middle + self.std_factor * std
+        self.lower = self.middle - self.std_factor * std
+        return self.middle, self.upper, self.lower
+
+    def seed(self, values) -> "StreamingBollinger":
+        for x in values:
+            self.update(float(x))
+        return self
+
+
+def seed_from_frame(indicator, df: pd.DataFrame, column: str = "close"):
+    """Прогріває потоковий індикатор на історичних свічках (напр. з `get_historical_futures_klines`)."""
+    return indicator.seed(df[column].to_numpy(dtype=float))
@@ -0,0 +1,116 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from core import backtest, optimizer, strategies
+
+# Walk-forward: історія ділиться на вікна in-sample/out-of-sample; на кожному in-sample
+# вікні підбираються параметри, а оцінюються вони на наступному out-of-sample вікні.
+# Вікна розподіляються між процесами пулу; свічки лежать у спільній пам'яті один раз
+# (`optimizer.SharedCandles`), воркер отримує лише межі вікна й сітку параметрів.
+
+
+def make_windows(n: int, train: int, test: int, step: int = None, anchored: bool = False) -> list:
+    """
+    Межі вікон [(train_start, train_end, test_start, test_end)] (end - не включно) для n свічок.
+    rolling - in-sample фіксованої довжини зсувається на step (типово = test);
+    anchored - in-sample завжди починається з 0 і росте.
+    """
+    if train <= 0 or test <= 0:
+        raise ValueError("train and test must be positive")
+    step = step or test
+    windows = []
+    train_end = train
+    while train_end + test <= n:
+        train_start = 0 if anchored else train_end - train
+        windows.append((train_start, train_end, train_end, train_end + test))
+        train_end += step
+    return windows
+
+
+def _score(df: pd.DataFrame, strategy: str, params: dict, start: int, end: int, capital: float,
+           costs: dict) -> dict:
+    """Бектест на свічках [start, end); сигнали рахуються з warm-up перед start."""
+    spec = strategies.get(strategy)
+    history_start = max(0, start - spec.warmup_length(**params))
+    sigs = spec.signals(df.iloc[history_start:end], **params).iloc[start - history_start:]
+    return backtest.simulate(df["close"].to_numpy()[start:end], sigs.to_numpy(), initial_capital=capital, **costs)
+
+
+def run_window(df: pd.DataFrame, strategy: str, combos: list, window: tuple, capital: float = 1000,
+               metric: str = "Return %", costs: dict = None) -> dict:
+    """Підбір параметрів на in-sample частині вікна та оцінка найкращих на out-of-sample."""
+    costs = costs or {}
+    train_start, train_end, test_start, test_end = window
+    best, best_score = None, None
+    for params in combos:
+        result = _score(df, strategy, params, train_start, train_end, capital, costs)
+        if best_score is None or result[metric] > best_score[metric]:
+            best, best_score = params, result
+    oos = _score(df, strategy, best, test_start, test_end, capital, costs)
+    return {
+        **best,
+        f"IS {metric}": best_score[metric],
+        "OOS Return %": oos["Return %"],
+        "OOS Trades": oos["Trades Count"],
+        "OOS Winrate %": oos["Winrate %"],
+        "OOS Max Drawdown %": oos["Max Drawdown %"],
+        "OOS Sharpe": oos["Sharpe"],
+    }
+
+
+def _window_task(task):
+    strategy, combos, window, capital, metric, costs = task
+    return run_window(optimizer._worker_df, strategy, combos, window, capital, metric, costs)
+
+
+def summarize(table: pd.DataFrame, metric: str = "Return %") -> dict:
+    """Зведення по вікнах: середня/медіанна OOS-дохідність, частка прибуткових вікон і т.д."""
+    if not len(table):
+        return {"Windows": 0}
+    oos = table["OOS Return %"]
+    is_mean = table[f"IS {metric}"].mean()
+    return {
+        "Windows": len(table),
+        "OOS Return % (compounded)": float((np.prod(1 + oos / 100) - 1) * 100),
+        "OOS Return % (mean)": float(oos.mean()),
+        "OOS Return % (median)": float(oos.median()),
+        "Profitable windows %": float((oos > 0).mean() * 100),
+        "OOS Trades": int(table["OOS Trades"].sum()),
+        "Worst OOS Max Drawdown %": float(table["OOS Max Drawdown %"].max()),
+        # наскільки результат in-sample переноситься на нові дані (для metric = Return %)
+        "Walk-forward efficiency": float(oos.mean() / is_mean) if metric == "Return %" and is_mean else float("nan"),
+    }
+
+
+def walk_forward(df: pd.DataFrame, strategy: str, combos: list, train: int, test: int, step: int = None,
+                 anchored: bool = False, capital: float = 1000, metric: str = "Return %",
+                 processes: int = None, costs: dict = None) -> tuple:
+    """
+    Walk-forward для стратегії з реєстру по сітці `combos` (див. `optimizer.param_grid`).
+    Повертає (таблиця по вікнах із межами в часі, зведення `summarize`).
+    """
+    if not combos:
+        # напр. --fast-range 30:40 --slow-range 10:20: жодна комбінація не проходить fast < slow
+        raise ValueError("parameter grid is empty: no combination passes the strategy constraints")
+    windows = make_windows(len(df), train, test, step, anchored)
+    tasks = [(strategy, combos, window, capital, metric, costs or {}) for window in windows]
+    processes = min(processes or os.cpu_count() or 1, max(1, len(tasks)))
+
+    results = []
+    if tasks:
+        with optimizer.SharedCandles(df) as shared:
+            with ProcessPoolExecutor(max_workers=processes, initializer=optimizer._init_worker,
+                                     initargs=(shared.name, shared.shape)) as pool:
+                results = list(pool.map(_window_task, tasks, chunksize=max(1, len(tasks) // (processes * 4))))
+
+    index = df.index
+    bounds = pd.DataFrame({
+        "train_start": [index[w[0]] for w in windows],
+        "test_start": [index[w[2]] for w in windows],
+        "test_end": [index[w[3] - 1] for w in windows],
+    })
+    table = pd.concat([bounds, pd.DataFrame(results)], axis=1)
+    return table, summarize(table, metric)
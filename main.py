@@ -1,9 +1,33 @@
+import time
+
+_START = time.perf_counter()  # для --probe-startup: час від запуску до першого кадру
+
+import argparse
+
 import customtkinter as ctk
 from ui.main_window import DogeTradeApp
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="DogeTrade Signals (Futures)")
+    parser.add_argument("--record", metavar="PATH", help="Записувати повідомлення сокетів у журнал")
+    parser.add_argument("--replay", metavar="PATH", help="Відтворити журнал замість live-сокетів")
+    parser.add_argument("--speed", type=float, default=1.0, help="Швидкість відтворення (1 - реальний час, 0 - максимальна)")
+    parser.add_argument("--offline", action="store_true", help="Лише кешовані свічки, без REST і сокетів")
+    parser.add_argument("--log-file", metavar="PATH", help="Дублювати лог у файл (з ротацією)")
+    parser.add_argument("--probe-startup", action="store_true",
+                        help="Вивести час до першого кадру і закритись (для benchmarks.startup)")
+    args = parser.parse_args()
+
     ctk.set_appearance_mode("dark")
     ctk.set_default_color_theme("blue")
 
-    app = DogeTradeApp()
+    app = DogeTradeApp(record_path=args.record, replay_path=args.replay, replay_speed=args.speed,
+                       offline=args.offline, log_path=args.log_file)
+    if args.probe_startup:
+        def first_frame():
+            app.update()  # вікно змаповане й намальоване
+            print(f"first_frame_ms={(time.perf_counter() - _START) * 1000:.1f}", flush=True)
+            app.on_closing()
+
+        app.after_idle(first_frame)
     app.mainloop()
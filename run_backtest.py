@@ -1,81 +1,202 @@
 import argparse
 import pandas as pd
 from core.binance_api import get_historical_futures_klines
-from core import signals
-
-
-def run_backtest(strategy, symbol, interval, limit, capital=1000, **kwargs):
-    df = get_historical_futures_klines(symbol, interval, limit)
-    balance = capital
-    position = None
-    entry_price = 0
-    trades = []
-
-    for i in range(len(df)):
-        sub_df = df.iloc[: i + 1]
-
-        # Виклик потрібної стратегії
-        if strategy == "EMA":
-            sig = signals.ema_crossover(sub_df, fast=kwargs.get("fast", 9), slow=kwargs.get("slow", 21))
-        elif strategy == "RSI":
-            sig = signals.rsi_strategy(sub_df, period=kwargs.get("period", 14))
-        elif strategy == "MACD":
-            sig = signals.macd_strategy(
-                sub_df,
-                fast=kwargs.get("fast", 12),
-                slow=kwargs.get("slow", 26),
-                signal=kwargs.get("signal", 9),
-            )
-        else:
-            raise ValueError(f"Unknown strategy: {strategy}")
-
-        price = sub_df["close"].iloc[-1]
-
-        if sig == "BUY" and position is None:
-            position = "LONG"
-            entry_price = price
-            trades.append(("BUY", price))
-        elif sig == "SELL" and position == "LONG":
-            balance *= price / entry_price
-            trades.append(("SELL", price))
-            position = None
-
-    if position == "LONG":  # закриваємо позицію в кінці
-        balance *= df["close"].iloc[-1] / entry_price
-        trades.append(("SELL (final)", df["close"].iloc[-1]))
-
-    return balance, trades
+from core.downloader import load_history
+from core import backtest, backtest_cache, montecarlo, optimizer, portfolio, strategies, walkforward
+
+
+def load_candles(symbol, interval, limit, start=None, end=None, workers=4):
+    if start is not None:
+        # довільний діапазон: посторінкове завантаження у колонковий архів
+        return load_history(symbol, interval, start, end, workers=workers)
+    return get_historical_futures_klines(symbol, interval, limit)
+
+
+def run_backtest(strategy, symbol, interval, limit, capital=1000, start=None, end=None, workers=4,
+                 taker_fee=0.0, maker_fee=0.0, use_maker=False, slippage=0.0, with_stats=False, use_cache=False,
+                 **kwargs):
+    df = load_candles(symbol, interval, limit, start, end, workers)
+
+    if use_cache and start is not None:
+        # той самий прогін на тих самих (або доповнених) свічках - з кешу результатів; лише з
+        # фіксованим початком: вікно --limit зсувається щоразу, і кожен прогін був би промахом
+        result = backtest_cache.cached_simulate(df, symbol, interval, strategy, capital, kwargs, taker_fee=taker_fee,
+                                                maker_fee=maker_fee, use_maker=use_maker, slippage=slippage)
+        actions = backtest.trade_actions(result["trades"])
+        return (result["Final Balance"], actions, result) if with_stats else (result["Final Balance"], actions)
+
+    # Виклик потрібної стратегії (сигнали для всіх свічок за один прохід)
+    sigs = backtest.strategy_signals(strategy, df, **kwargs)
+    return backtest.long_only_backtest(df, sigs, capital, with_stats=with_stats, taker_fee=taker_fee,
+                                       maker_fee=maker_fee, use_maker=use_maker, slippage=slippage)
+
+
+def param_combos(args) -> list:
+    """Сітка (або випадкова підмножина) параметрів з --<param>-range."""
+    params = strategies.get(args.strategy).bind(**vars(args))
+    ranges = {name: optimizer.parse_range(getattr(args, f"{name}_range") or str(value))
+              for name, value in params.items()}
+    combos = optimizer.param_grid(args.strategy, ranges)
+    if args.search == "random":
+        combos = optimizer.random_subset(combos, args.samples, seed=args.seed)
+    return combos
+
+
+def run_optimize(args):
+    """Режим optimize: перебір сітки (або випадкової підмножини) параметрів у пулі процесів."""
+    df = load_candles(args.symbol, args.interval, args.limit, args.start, args.end, args.workers)
+    combos = param_combos(args)
+
+    print(f"\n🔎 Optimizing {args.strategy}: {len(combos)} combinations on {len(df)} candles")
+    table = optimizer.optimize(df, args.strategy, combos, capital=args.capital, processes=args.processes)
+    with pd.option_context("display.max_rows", args.top, "display.width", 120):
+        print(table.head(args.top).to_string(float_format=lambda x: f"{x:.2f}"))
+    return table
+
+
+def run_walk_forward(args):
+    """Режим walk-forward: підбір на in-sample вікнах, оцінка на наступних out-of-sample."""
+    df = load_candles(args.symbol, args.interval, args.limit, args.start, args.end, args.workers)
+    combos = param_combos(args)
+    costs = {"taker_fee": args.taker_fee, "maker_fee": args.maker_fee, "use_maker": args.maker,
+             "slippage": args.slippage}
+
+    mode = "anchored" if args.anchored else "rolling"
+    print(f"\n🚶 Walk-forward {args.strategy} ({mode}): train {args.train}, test {args.test}, "
+          f"{len(combos)} combinations on {len(df)} candles")
+    try:
+        table, summary = walkforward.walk_forward(df, args.strategy, combos, args.train, args.test, args.step,
+                                                  args.anchored, args.capital, args.metric, args.processes, costs)
+    except ValueError as e:
+        print(f"⚠️ {e}")
+        raise SystemExit(1)
+    with pd.option_context("display.max_rows", None, "display.width", 160):
+        print(table.to_string(float_format=lambda x: f"{x:.2f}"))
+    print()
+    for name, value in summary.items():
+        print(f"{name}: {value:.2f}" if isinstance(value, float) else f"{name}: {value}")
+    return table, summary
+
+
+def run_portfolio(args, params: dict):
+    """Режим portfolio: одна стратегія на кількох парах зі спільним капіталом."""
+    frames = {symbol: load_candles(symbol, args.interval, args.limit, args.start, args.end, args.workers)
+              for symbol in args.portfolio}
+    result = portfolio.portfolio_backtest(frames, args.strategy, args.capital, args.sizing, args.fraction,
+                                          taker_fee=args.taker_fee, maker_fee=args.maker_fee,
+                                          use_maker=args.maker, slippage=args.slippage, **params)
+
+    print(f"\n📊 Portfolio Backtest Results ({args.strategy}, sizing: {args.sizing})")
+    print(f"Symbols: {', '.join(result['symbols'])} | Interval: {args.interval} | Bars: {len(result['index'])}")
+    for name, value in result.items():
+        if isinstance(value, (int, float)):
+            print(f"{name}: {value:.2f}" if isinstance(value, float) else f"{name}: {value}")
+    print()
+    print(result["per_symbol"].to_string(float_format=lambda x: f"{x:.2f}"))
+    return result
 
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser()
-    parser.add_argument("--strategy", choices=["EMA", "RSI", "MACD"], required=True, help="Стратегія для тесту")
+    parser.add_argument("--strategy", choices=strategies.names(), required=True, help="Стратегія для тесту")
     parser.add_argument("--symbol", default="DOGEUSDT")
     parser.add_argument("--interval", default="1h")
     parser.add_argument("--limit", type=int, default=1000)
+    parser.add_argument("--start", help="Початок діапазону (напр. 2024-01-01); замість --limit")
+    parser.add_argument("--end", help="Кінець діапазону (лише з --start; за замовчуванням - зараз)")
+    parser.add_argument("--workers", type=int, default=4, help="Потоків для завантаження історії")
     parser.add_argument("--capital", type=float, default=1000)
-    parser.add_argument("--fast", type=int, default=12)
-    parser.add_argument("--slow", type=int, default=26)
-    parser.add_argument("--signal", type=int, default=9)
-    parser.add_argument("--period", type=int, default=14)
+    # параметри всіх стратегій з реєстру; не задані - типові для обраної стратегії
+    param_names = list(dict.fromkeys(name for s in strategies.REGISTRY.values() for name in s.params))
+    for name in param_names:
+        parser.add_argument(f"--{name}", type=int, default=None)
+    parser.add_argument("--taker-fee", type=float, default=0.0, help="Комісія taker за сторону (0.0004 = 0.04%%)")
+    parser.add_argument("--maker-fee", type=float, default=0.0, help="Комісія maker за сторону")
+    parser.add_argument("--maker", action="store_true", help="Рахувати угоди за maker-комісією")
+    parser.add_argument("--slippage", type=float, default=0.0, help="Прослизання (частка ціни)")
+    parser.add_argument("--no-cache", action="store_true", help="Не брати результат з кешу бектестів")
+    # optimize mode
+    parser.add_argument("--optimize", action="store_true", help="Перебір параметрів замість одного прогону")
+    for name in param_names:
+        parser.add_argument(f"--{name}-range", help=f"Діапазон {name}, напр. 5:20:1 або 9,12")
+    parser.add_argument("--search", choices=["grid", "random"], default="grid")
+    parser.add_argument("--samples", type=int, default=500, help="Кількість комбінацій для --search random")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--processes", type=int, default=None, help="Процесів у пулі (за замовчуванням - усі ядра)")
+    parser.add_argument("--top", type=int, default=20, help="Скільки найкращих рядків показати")
+    # walk-forward mode (сітка параметрів - ті самі --<param>-range)
+    parser.add_argument("--walk-forward", action="store_true", help="Walk-forward замість одного прогону")
+    parser.add_argument("--train", type=int, default=1000, help="Свічок у in-sample вікні")
+    parser.add_argument("--test", type=int, default=250, help="Свічок у out-of-sample вікні")
+    parser.add_argument("--step", type=int, default=None, help="Зсув вікон (за замовчуванням = --test)")
+    parser.add_argument("--anchored", action="store_true", help="In-sample завжди від початку історії")
+    parser.add_argument("--metric", default="Return %", choices=["Return %", "Sharpe", "Winrate %"],
+                        help="За чим обирати параметри на in-sample")
+    # Monte Carlo по угодах одного прогону
+    parser.add_argument("--monte-carlo", type=int, default=0, metavar="PATHS", help="Кількість шляхів Monte Carlo")
+    parser.add_argument("--mc-method", default="bootstrap", choices=montecarlo.METHODS)
+    parser.add_argument("--mc-block", type=int, default=20, help="Довжина блоку для --mc-method block")
+    parser.add_argument("--ruin", type=float, default=0.5, help="Частка втраченого капіталу, що вважається руїною")
+    # portfolio mode (та сама стратегія на кількох парах)
+    parser.add_argument("--portfolio", nargs="+", metavar="SYMBOL", help="Портфельний бектест на кількох парах")
+    parser.add_argument("--sizing", default="equal", choices=portfolio.SIZING,
+                        help="equal - 1/N капіталу на пару, active - порівну між відкритими, "
+                             "fixed - --fraction на позицію")
+    parser.add_argument("--fraction", type=float, default=0.1, help="Частка капіталу на позицію для --sizing fixed")
     args = parser.parse_args()
+    if args.end and not args.start:
+        # без --start береться вікно останніх --limit свічок, і --end нічого б не змінив
+        parser.error("--end requires --start")
 
-    final_balance, trades = run_backtest(
+    if args.optimize:
+        run_optimize(args)
+        raise SystemExit(0)
+    if args.walk_forward:
+        run_walk_forward(args)
+        raise SystemExit(0)
+    if args.portfolio:
+        run_portfolio(args, {name: getattr(args, name) for name in param_names})
+        raise SystemExit(0)
+
+    final_balance, trades, stats = run_backtest(
         args.strategy,
         args.symbol,
         args.interval,
         args.limit,
         capital=args.capital,
-        fast=args.fast,
-        slow=args.slow,
-        signal=args.signal,
-        period=args.period,
+        start=args.start,
+        end=args.end,
+        workers=args.workers,
+        **{name: getattr(args, name) for name in param_names},
+        taker_fee=args.taker_fee,
+        maker_fee=args.maker_fee,
+        use_maker=args.maker,
+        slippage=args.slippage,
+        with_stats=True,
+        use_cache=args.start is not None and not args.no_cache,
     )
 
     print(f"\n📊 Backtest Results ({args.strategy})")
-    print(f"Symbol: {args.symbol} | Interval: {args.interval} | Candles: {args.limit}")
+    if args.start:
+        print(f"Symbol: {args.symbol} | Interval: {args.interval} | Period: {args.start} → {args.end or 'now'}")
+    else:
+        print(f"Symbol: {args.symbol} | Interval: {args.interval} | Candles: {args.limit}")
     print(f"Initial Capital: {args.capital}")
     print(f"Final Balance: {final_balance}")
     print(f"Net Profit: {final_balance - args.capital}")
     print(f"Return %: {(final_balance - args.capital) / args.capital * 100:.2f}")
     print(f"Trades Count: {len(trades)}")
+    print(f"Winrate %: {stats['Winrate %']:.2f}")
+    print(f"Max Drawdown %: {stats['Max Drawdown %']:.2f}")
+    print(f"Sharpe (per bar): {stats['Sharpe']:.4f}")
+    print(f"Exposure %: {stats['Exposure %']:.2f}")
+    if "Cache" in stats:
+        print(f"Cache: {stats['Cache']}")
+
+    if args.monte_carlo:
+        mc = montecarlo.monte_carlo(montecarlo.trade_returns(stats), args.monte_carlo, args.mc_method,
+                                    args.mc_block, args.capital, args.ruin, args.seed)
+        print(f"\n🎲 Monte Carlo ({mc['Method']}, {mc['Paths']} paths over {mc['Steps']} trades)")
+        for name, value in mc.items():
+            if isinstance(value, float):
+                print(f"{name}: {value:.2f}")
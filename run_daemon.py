@@ -0,0 +1,129 @@
+import argparse
+import signal
+import threading
+import time
+
+from core import strategies
+from core.compute_worker import ComputeWorker
+from core.daemon import JsonlSink, SignalDaemon, SqliteSink, StdoutSink
+from core.database import get_settings
+from core.recorder import MessageRecorder, replay
+from core.kline_store import INTERVAL_MS
+from core.live import is_open_update
+from core.resample import BASE_INTERVAL, MINUTE_MS
+
+# Скільки подій може чекати в черзі обчислень, перш ніж найстаріші почнуть відкидатись
+DAEMON_QUEUE_SIZE = 100_000
+STATS_EVERY_SEC = 60
+# Ліміт біржі на кількість потоків в одному multiplex-з'єднанні
+MAX_STREAMS_PER_CONNECTION = 200
+
+
+def warm_up(daemon: SignalDaemon, log=print):
+    """
+    Історія для всіх пар одним пакетним завантаженням (кеш `kline_store` + REST):
+    стільки свічок кожного інтервалу, скільки потребує найдовший warm-up стратегій.
+    """
+    warmup = max(strategies.get(name).warmup_length() for name in daemon.strategies)
+    base_limit = max(warmup, max(INTERVAL_MS[i] for i in daemon.intervals) // MINUTE_MS)
+    requests = [(symbol, BASE_INTERVAL, base_limit) for symbol in daemon.symbols]
+    requests += [(symbol, interval, warmup) for symbol in daemon.symbols
+                 for interval in daemon.intervals if interval != BASE_INTERVAL]
+    try:
+        from core.async_fetch import fetch_many
+        frames = fetch_many(requests)
+    except ImportError:
+        from core.binance_api import get_historical_futures_klines  # без aiohttp - послідовно
+        frames = {(s, i): get_historical_futures_klines(s, i, n) for s, i, n in requests}
+    for symbol in daemon.symbols:
+        history = {interval: frames[(symbol, interval)] for interval in daemon.intervals
+                   if interval != BASE_INTERVAL}
+        daemon.warm_up(symbol, frames[(symbol, BASE_INTERVAL)], history)
+    log(f"Warmed up {len(daemon.symbols)} symbols x {len(daemon.intervals)} intervals")
+
+
+def run_replay(daemon: SignalDaemon, path: str, speed: float = 0.0) -> dict:
+    """Журнал `core/recorder.py` через `handle_kline`; пропускна здатність у свічках/с."""
+    stats = replay(path, {"kline": daemon.handle_kline}, speed=speed)
+    stats["candles"] = daemon.candles
+    stats["signals"] = daemon.signals
+    stats["candles_per_sec"] = daemon.candles / stats["seconds"] if stats["seconds"] > 0 else 0.0
+    return stats
+
+
+def run_live(daemon: SignalDaemon, record_path: str = None, stop: threading.Event = None):
+    """
+    Одне multiplex-з'єднання на всі пари (`<symbol>@kline_1m`; понад
+    MAX_STREAMS_PER_CONNECTION - по з'єднанню на кожні 200), обробка - у ComputeWorker.
+    """
+    from binance import ThreadedWebsocketManager
+
+    stop = stop or threading.Event()
+    worker = ComputeWorker(daemon.handle_kline, maxsize=DAEMON_QUEUE_SIZE,
+                           on_error=lambda e: print(f"Kline error: {e}", flush=True), name="daemon-worker",
+                           droppable=is_open_update).start()
+    callback = worker.submit
+    recorder = MessageRecorder(record_path) if record_path else None
+    if recorder is not None:
+        callback = recorder.wrap("kline", callback)
+
+    s = get_settings() or {}
+    twm = ThreadedWebsocketManager(api_key=s.get("api_key", ""), api_secret=s.get("api_secret", ""))
+    twm.start()
+    streams = [f"{symbol.lower()}@kline_{BASE_INTERVAL}" for symbol in daemon.symbols]
+    for i in range(0, len(streams), MAX_STREAMS_PER_CONNECTION):
+        twm.start_futures_multiplex_socket(callback=callback, streams=streams[i:i + MAX_STREAMS_PER_CONNECTION])
+    print(f"Streaming {len(streams)} symbols", flush=True)
+    started = time.perf_counter()
+    try:
+        while not stop.wait(STATS_EVERY_SEC):
+            elapsed = time.perf_counter() - started
+            print(f"{daemon.messages} messages, {daemon.candles} candles ({daemon.candles / elapsed:.1f}/s), "
+                  f"{daemon.signals} signals | queue max {worker.max_depth}, dropped {worker.dropped}", flush=True)
+    finally:
+        twm.stop()
+        worker.stop()
+        if recorder is not None:
+            recorder.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Headless multi-symbol signal daemon")
+    parser.add_argument("--symbols", nargs="+", help="Пари (за замовчуванням - з налаштувань)")
+    parser.add_argument("--intervals", nargs="+", default=[BASE_INTERVAL], choices=list(INTERVAL_MS))
+    parser.add_argument("--strategies", nargs="+", default=strategies.names(), choices=strategies.names())
+    parser.add_argument("--sink", nargs="+", default=["sqlite"], choices=["sqlite", "stdout", "jsonl"])
+    parser.add_argument("--jsonl", metavar="PATH", default="signals.jsonl", help="Файл для --sink jsonl")
+    parser.add_argument("--hold", action="store_true", help="Писати і HOLD (stdout, sqlite)")
+    parser.add_argument("--replay", metavar="PATH", help="Замість сокета відтворити журнал (заміри пропускної здатності)")
+    parser.add_argument("--speed", type=float, default=0.0, help="Швидкість відтворення (0 - максимальна)")
+    parser.add_argument("--record", metavar="PATH", help="Записувати повідомлення сокета в журнал")
+    parser.add_argument("--no-warmup", action="store_true", help="Без історії: стратегії прогріваються з потоку")
+    args = parser.parse_args()
+
+    symbols = args.symbols or [(get_settings() or {}).get("trading_pair", "DOGEUSDT")]
+    sinks = []
+    for name in args.sink:
+        if name == "sqlite":
+            sinks.append(SqliteSink(include_hold=args.hold))
+        elif name == "stdout":
+            sinks.append(StdoutSink(include_hold=args.hold))
+        else:
+            sinks.append(JsonlSink(args.jsonl))
+    daemon = SignalDaemon(symbols, args.intervals, args.strategies, sinks)
+    try:
+        if not args.no_warmup:
+            warm_up(daemon)
+        if args.replay:
+            stats = run_replay(daemon, args.replay, args.speed)
+            print(f"Messages: {stats['messages']}")
+            print(f"Time: {stats['seconds']:.3f}s")
+            print(f"Throughput: {stats['messages_per_sec']:.0f} msg/s, {stats['candles_per_sec']:.0f} candles/s")
+            print(f"Signals: {stats['signals']}")
+        else:
+            stop = threading.Event()
+            signal.signal(signal.SIGINT, lambda *_: stop.set())
+            signal.signal(signal.SIGTERM, lambda *_: stop.set())
+            run_live(daemon, args.record, stop)
+    finally:
+        daemon.close()
@@ -0,0 +1,80 @@
+import argparse
+import time
+
+from core import strategies
+from core.compute_worker import ComputeWorker
+from core.live import LiveSession, is_open_update
+from core.recorder import replay
+from ui.update_queue import UiUpdateQueue
+
+
+def replay_headless(path, strategy="EMA", speed=0.0, capacity=5000, threaded=False, interval="1m", watch=()):
+    """
+    Відтворює журнал через ті самі обробники, що й GUI, але без Tk і мережі:
+    ticker → `UiUpdateQueue.set_price`, kline → `LiveSession.process_kline`
+    (з `threaded=True` - через `ComputeWorker`, як у GUI). Журнал - потік 1m; `interval`
+    і додаткові `watch` таймфрейми будуються з нього локально.
+    """
+    sink = UiUpdateQueue()
+    session = LiveSession(capacity, strategy, sink=sink, interval=interval)
+    session.set_strategy(strategy)  # без історії стратегія прогрівається з потоку
+    for extra in watch:
+        session.watch(extra)
+    signals = []
+
+    def handle_ticker(msg):
+        data = msg.get("data", msg)
+        sink.set_price(float(data["c"]))
+
+    def handle_kline(msg):
+        signal = session.process_kline(msg)
+        if signal is not None:
+            signals.append(signal)
+        sink.drain()  # GUI забирає накопичене на тіку; тут - одразу
+
+    worker = None
+    submitted = [0]
+    kline_handler = handle_kline
+    if threaded:
+        worker = ComputeWorker(handle_kline, droppable=is_open_update).start()
+
+        def kline_handler(msg):
+            submitted[0] += 1
+            worker.submit(msg)
+
+    started = time.perf_counter()
+    stats = replay(path, {"ticker": handle_ticker, "kline": kline_handler}, speed=speed)
+    if worker is not None:
+        # чекаємо, поки воркер розбере чергу, і рахуємо повний час обробки
+        while worker.processed + worker.dropped < submitted[0]:
+            time.sleep(0.001)
+        worker.stop()
+        stats["seconds"] = time.perf_counter() - started
+        stats["messages_per_sec"] = stats["messages"] / stats["seconds"] if stats["seconds"] > 0 else 0.0
+        stats.update(worker.stats())
+    stats["signals"] = {s: signals.count(s) for s in ("BUY", "SELL", "HOLD")}
+    return stats
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Headless replay of a recorded websocket log")
+    parser.add_argument("path", help="Журнал, записаний `python main.py --record PATH`")
+    parser.add_argument("--strategy", type=str, default="EMA", choices=strategies.names())
+    parser.add_argument("--speed", type=float, default=0.0,
+                        help="1 - реальний час, N - у N разів швидше, 0 - максимальна швидкість")
+    parser.add_argument("--capacity", type=int, default=5000)
+    parser.add_argument("--interval", type=str, default="1m", help="Основний таймфрейм (з 1m-потоку)")
+    parser.add_argument("--watch", type=str, nargs="*", default=[], help="Додаткові таймфрейми, напр. 15m 1h")
+    parser.add_argument("--threaded", action="store_true", help="Обробляти kline через ComputeWorker, як у GUI")
+    args = parser.parse_args()
+
+    stats = replay_headless(args.path, args.strategy, args.speed, args.capacity, args.threaded,
+                            args.interval, args.watch)
+    print(f"Messages: {stats['messages']}")
+    print(f"Time: {stats['seconds']:.3f}s")
+    print(f"Throughput: {stats['messages_per_sec']:.0f} msg/s")
+    if args.speed:
+        print(f"Max lag behind schedule: {stats['max_lag'] * 1000:.1f} ms")
+    if args.threaded:
+        print(f"Queue max depth: {stats['max_depth']}, dropped: {stats['dropped']}")
+    print(f"Signals: {stats['signals']}")
@@ -0,0 +1,115 @@
+"""`core.async_fetch.fetch_many` проти локального aiohttp-сервера, що імітує /fapi/v1/klines."""
+import asyncio
+import time
+
+import pytest
+
+aiohttp = pytest.importorskip("aiohttp")
+from aiohttp import web  # noqa: E402
+
+from core import async_fetch  # noqa: E402
+
+STEP = 60_000
+START = 1_700_000_000_000 // STEP * STEP
+
+
+class StandIn:
+    """Стенд біржі: свічки на будь-який діапазон, журнал запитів і сценарії відповідей."""
+
+    def __init__(self, throttle_first: int = 0, used_weight: int = 0):
+        self.requests = []  # (час, startTime, endTime, limit)
+        self.throttle_first = throttle_first  # скільки перших запитів отримають 429
+        self.used_weight = used_weight
+
+    async def klines(self, request: web.Request) -> web.Response:
+        q = request.query
+        start, end, limit = int(q["startTime"]), int(q["endTime"]), int(q["limit"])
+        self.requests.append((time.monotonic(), start, end, limit))
+        headers = {"X-MBX-USED-WEIGHT-1M": str(self.used_weight)}
+        if len(self.requests) <= self.throttle_first:
+            return web.Response(status=429, headers={**headers, "Retry-After": "0"})
+        klines = [[t, "1.0", "1.5", "0.5", str(1 + (t - START) / STEP), "10.0", t + STEP - 1, "0", 1, "0", "0", "0"]
+                  for t in range(start, end + 1, STEP)][:limit]
+        return web.json_response(klines, headers=headers)
+
+
+async def _run(stand: StandIn, requests: list, **kwargs) -> dict:
+    app = web.Application()
+    app.router.add_get(async_fetch.KLINES_PATH, stand.klines)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = runner.addresses[0][1]
+    try:
+        return await async_fetch.fetch_many_async(requests, base_url=f"http://127.0.0.1:{port}", **kwargs)
+    finally:
+        await runner.cleanup()
+
+
+def test_pages_cover_range_without_overlap():
+    stand = StandIn()
+    rng = (START, START + 249 * STEP)
+    frames = asyncio.run(_run(stand, [("DOGEUSDT", "1m", rng), ("SOLUSDT", "1m", rng)],
+                              page_size=100, use_cache=False))
+
+    assert len(stand.requests) == 6  # 250 свічок по 100 на сторінку, дві пари
+    pages = sorted({(start, end) for _, start, end, _ in stand.requests})
+    assert pages == [(START, START + 99 * STEP), (START + 100 * STEP, START + 199 * STEP),
+                     (START + 200 * STEP, START + 249 * STEP)]
+    for df in frames.values():
+        assert len(df) == 250
+        assert df.index.is_monotonic_increasing and df.index.is_unique
+        assert df["close"].iloc[-1] == 250.0
+
+
+def test_cache_fetches_only_missing_ranges(tmp_path):
+    db_path = str(tmp_path / "klines.db")
+    stand = StandIn()
+    asyncio.run(_run(stand, [("DOGEUSDT", "1m", (START, START + 99 * STEP))], page_size=100, db_path=db_path))
+    stand.requests.clear()
+
+    frames = asyncio.run(_run(stand, [("DOGEUSDT", "1m", (START, START + 149 * STEP))], page_size=100,
+                              db_path=db_path))
+
+    assert [(start, end) for _, start, end, _ in stand.requests] == [(START + 100 * STEP, START + 149 * STEP)]
+    assert len(frames[("DOGEUSDT", "1m")]) == 150
+
+
+def test_retries_after_429():
+    stand = StandIn(throttle_first=2)
+    frames = asyncio.run(_run(stand, [("DOGEUSDT", "1m", (START, START + 49 * STEP))], page_size=100,
+                              use_cache=False))
+
+    assert len(stand.requests) == 3  # два 429 з Retry-After: 0, потім успіх
+    assert len(frames[("DOGEUSDT", "1m")]) == 50
+
+
+def test_gives_up_after_max_retries():
+    stand = StandIn(throttle_first=async_fetch.MAX_RETRIES)
+    with pytest.raises(RuntimeError, match="no response"):
+        asyncio.run(_run(stand, [("DOGEUSDT", "1m", (START, START + 9 * STEP))], use_cache=False))
+    assert len(stand.requests) == async_fetch.MAX_RETRIES
+
+
+def test_used_weight_header_paces_requests():
+    # біржа повідомляє, що ліміт IP майже вичерпано: далі запити йдуть зі швидкістю поповнення
+    stand = StandIn(used_weight=async_fetch.EXCHANGE_WEIGHT_LIMIT)
+    weight_per_minute = 1200  # 20 одиниць ваги на секунду; сторінка з 100 свічок важить 2
+    asyncio.run(_run(stand, [("DOGEUSDT", "1m", (START, START + 299 * STEP))], page_size=100, concurrency=1,
+                     weight_per_minute=weight_per_minute, use_cache=False))
+
+    times = [t for t, *_ in stand.requests]
+    assert len(times) == 3
+    assert times[-1] - times[0] >= 2 * 0.1 * 0.9
+
+
+def test_token_bucket_waits_for_refill():
+    async def run():
+        budget = async_fetch.AsyncWeightBudget(600)  # місткість 600, поповнення 10/с
+        await budget.acquire(600)
+        started = time.monotonic()
+        await budget.acquire(5)
+        return time.monotonic() - started
+
+    assert asyncio.run(run()) >= 0.45
@@ -0,0 +1,102 @@
+"""`core.downloader.download_range` з фейковим клієнтом і колонковим архівом у tmp_path."""
+import random
+import threading
+import time
+
+import numpy as np
+
+from core import downloader
+from core.archive import CandleArchive
+
+STEP = 60_000
+START = 1_600_000_000_000 // STEP * STEP  # давно закриті свічки
+
+
+class FakeClient:
+    """`Client.futures_klines` з випадковою затримкою: сторінки завершуються не по порядку."""
+
+    def __init__(self, seed: int = 0):
+        self.requests = []  # (startTime, endTime, limit)
+        self.lock = threading.Lock()
+        self.random = random.Random(seed)
+
+    def futures_klines(self, symbol, interval, startTime=None, endTime=None, limit=500):
+        with self.lock:
+            self.requests.append((startTime, endTime, limit))
+            delay = self.random.uniform(0, 0.01)
+        time.sleep(delay)
+        return [[t, "1.0", "1.5", "0.5", str((t - START) // STEP), "10.0", t + STEP - 1, "0", 1, "0", "0", "0"]
+                for t in range(startTime, endTime + 1, STEP)][:limit]
+
+
+def _download(archive, api, first: int, last: int) -> int:
+    return downloader.download_range("DOGEUSDT", "1m", START + first * STEP, START + last * STEP, archive=archive,
+                                     workers=4, page_size=100, api=api)
+
+
+def _assert_contiguous(archive: CandleArchive, first: int, last: int):
+    arrays = archive.arrays()
+    assert arrays["open_time"][0] == START + first * STEP
+    assert arrays["open_time"][-1] == START + last * STEP
+    assert (np.diff(arrays["open_time"]) == STEP).all()
+    # close = номер свічки: рядки стоять на своїх місцях
+    assert (arrays["close"] == np.arange(first, last + 1)).all()
+
+
+def test_pages_are_appended_in_order(tmp_path):
+    archive = CandleArchive("DOGEUSDT", "1m", root=str(tmp_path))
+    api = FakeClient()
+
+    assert _download(archive, api, 0, 1049) == 1050
+
+    assert len(api.requests) == 11  # 1050 свічок по 100 на сторінку
+    pages = sorted((start, end) for start, end, _ in api.requests)
+    assert all(b[0] - a[1] == STEP for a, b in zip(pages, pages[1:]))
+    _assert_contiguous(archive, 0, 1049)
+
+
+def test_range_before_archive_is_stitched_without_gap(tmp_path):
+    archive = CandleArchive("DOGEUSDT", "1m", root=str(tmp_path))
+    api = FakeClient()
+    _download(archive, api, 2000, 2499)
+    api.requests.clear()
+
+    # діапазон закінчується задовго до first_open_time: проміжок теж докачується
+    written = _download(archive, api, 0, 299)
+
+    assert written == 2000
+    assert min(start for start, *_ in api.requests) == START
+    assert max(end for _, end, _ in api.requests) == START + 1999 * STEP
+    _assert_contiguous(archive, 0, 2499)
+
+
+def test_range_after_archive_is_appended_without_gap(tmp_path):
+    archive = CandleArchive("DOGEUSDT", "1m", root=str(tmp_path))
+    api = FakeClient()
+    _download(archive, api, 0, 499)
+    api.requests.clear()
+
+    # діапазон починається пізніше last_open_time: дописується й проміжок
+    written = _download(archive, api, 1500, 1999)
+
+    assert written == 1500
+    assert min(start for start, *_ in api.requests) == START + 500 * STEP
+    _assert_contiguous(archive, 0, 1999)
+
+
+def test_covered_range_is_not_downloaded(tmp_path):
+    archive = CandleArchive("DOGEUSDT", "1m", root=str(tmp_path))
+    api = FakeClient()
+    _download(archive, api, 0, 499)
+    api.requests.clear()
+
+    assert _download(archive, api, 100, 399) == 0
+    assert api.requests == []
+
+
+def test_weight_budget_waits_for_refill():
+    budget = downloader.WeightBudget(600)  # місткість 600, поповнення 10/с
+    budget.acquire(600)
+    started = time.monotonic()
+    budget.acquire(5)
+    assert time.monotonic() - started >= 0.45
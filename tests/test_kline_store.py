@@ -0,0 +1,90 @@
+"""`core.binance_api.get_historical_futures_klines` з кешем `core.kline_store` проти фейкового клієнта."""
+import types
+
+import pytest
+
+from core import binance_api, kline_store
+
+STEP = 60_000
+NOW = 1_700_000_000_000 // STEP * STEP + 30_000  # посеред поточної хвилини
+OPEN = NOW // STEP * STEP  # open_time незакритої свічки
+
+
+class FakeClient:
+    """`Client.futures_klines`: свічки на будь-який діапазон і журнал запитів."""
+
+    def __init__(self):
+        self.requests = []  # (startTime, endTime, limit)
+        self.offline = False
+
+    def futures_klines(self, symbol, interval, startTime=None, endTime=None, limit=500):
+        if self.offline:
+            raise ConnectionError("network is down")
+        self.requests.append((startTime, endTime, limit))
+        return [[t, "1.0", "1.5", "0.5", str(t // STEP % 1000), "10.0", t + STEP - 1, "0", 1, "0", "0", "0"]
+                for t in range(startTime, endTime + 1, STEP)][:limit]
+
+
+@pytest.fixture
+def fetch(tmp_path, monkeypatch):
+    monkeypatch.setattr(binance_api, "time", types.SimpleNamespace(time=lambda: NOW / 1000))
+    db_path = str(tmp_path / "klines.db")
+    api = FakeClient()
+
+    def run(limit):
+        return binance_api.get_historical_futures_klines("DOGEUSDT", "1m", limit, api=api, db_path=db_path)
+
+    run.api, run.db_path = api, db_path
+    return run
+
+
+def test_cold_fetch_downloads_whole_range(fetch):
+    df = fetch(2000)
+
+    # 2000 свічок - дві сторінки по MAX_KLINES_PER_REQUEST без перекриття
+    assert fetch.api.requests == [(OPEN - 1999 * STEP, OPEN, 1500), (OPEN - 499 * STEP, OPEN, 500)]
+    assert len(df) == 2000
+    assert df.index.is_monotonic_increasing and df.index.is_unique
+    assert df.index[-1].value // 1_000_000 == OPEN
+
+
+def test_warm_call_requests_only_open_candle(fetch):
+    fetch(500)
+    fetch.api.requests.clear()
+
+    df = fetch(500)
+
+    assert fetch.api.requests == [(OPEN, OPEN, 1)]
+    assert len(df) == 500
+
+
+def test_interior_gap_is_refetched(fetch):
+    fetch(500)
+    hole = (OPEN - 300 * STEP, OPEN - 291 * STEP)
+    conn = kline_store._connect(fetch.db_path)
+    with conn:
+        conn.execute("DELETE FROM klines WHERE open_time BETWEEN ? AND ?", hole)
+    conn.close()
+    fetch.api.requests.clear()
+
+    df = fetch(500)
+
+    assert fetch.api.requests == [(*hole, 10), (OPEN, OPEN, 1)]
+    assert len(df) == 500
+    assert (df.index.to_series().diff().dropna() == "1min").all()
+
+
+def test_offline_falls_back_to_cache(fetch):
+    fetch(500)
+    fetch.api.offline = True
+
+    df = fetch(500)
+
+    assert len(df) == 500
+    assert list(df.columns) == kline_store.COLUMNS
+
+
+def test_offline_without_cache_raises(fetch):
+    fetch.api.offline = True
+    with pytest.raises(ConnectionError):
+        fetch(500)
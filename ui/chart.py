@@ -1,32 +1,173 @@
-import mplfinance as mpf
+import numpy as np
+import pandas as pd
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+from matplotlib.collections import LineCollection, PolyCollection
 from matplotlib.figure import Figure
+from matplotlib.lines import Line2D
+from matplotlib.patches import Rectangle
+from matplotlib.ticker import FuncFormatter, MaxNLocator
 
+# Кольори стилю "charles" з mplfinance
+UP_COLOR = "#006340"
+DOWN_COLOR = "#a02128"
+BODY_WIDTH = 0.6
 
-def create_candlestick_chart(parent, df):
+
+class CandlestickChart:
     """
-    Малює свічковий графік у Tkinter Frame.
-    :param parent: Tkinter Frame, у якому буде графік
-    :param df: DataFrame з колонками [Open, High, Low, Close, Volume], індекс - datetime
-    :return: canvas (FigureCanvasTkAgg)
+    Свічковий графік у Tkinter Frame, що живе весь час роботи програми.
+
+    Історичні свічки намальовані двома колекціями (тіла та тіні), а остання свічка -
+    окремими artist'ами, тож тик усередині бару змінює лише їх. Перемальовування
+    обмежене `fps`: часті оновлення зливаються в одне, а якщо масштаб осі не змінився,
+    остання свічка домальовується через blitting поверх збереженого фону.
     """
 
-    # Створюємо фігуру
-    fig = Figure(figsize=(5, 4), dpi=100)
-    ax = fig.add_subplot(111)
-
-    # Малюємо свічки без volume
-    mpf.plot(
-        df,
-        type="candle",
-        style="charles",
-        ax=ax,
-        ylabel="Price (USDT)"
-    )
-
-    # Вставляємо у Tkinter
-    canvas = FigureCanvasTkAgg(fig, master=parent)
-    canvas.draw()
-    canvas.get_tk_widget().pack(fill="both", expand=True)
-
-    return canvas
+    def __init__(self, parent, max_candles: int = 100, fps: int = 10):
+        self.parent = parent
+        self.max_candles = max_candles
+        self.interval_ms = max(1, int(1000 / fps))
+
+        self.fig = Figure(figsize=(5, 4), dpi=100)
+        self.ax = self.fig.add_subplot(111)
+        self.ax.set_ylabel("Price (USDT)")
+        self.ax.grid(True, alpha=0.3)
+
+        self.times = np.array([], dtype="datetime64[ms]")
+        self.ohlc = np.zeros((0, 4))
+
+        self.wicks = LineCollection([], linewidths=1)
+        self.bodies = PolyCollection([], linewidths=0.5)
+        self.ax.add_collection(self.wicks)
+        self.ax.add_collection(self.bodies)
+        self.last_wick = Line2D([], [], linewidth=1, animated=True)
+        self.last_body = Rectangle((0, 0), BODY_WIDTH, 0, linewidth=0.5, animated=True)
+        self.ax.add_line(self.last_wick)
+        self.ax.add_patch(self.last_body)
+
+        self.ax.xaxis.set_major_locator(MaxNLocator(nbins=5, integer=True))
+        self.ax.xaxis.set_major_formatter(FuncFormatter(self._format_x))
+
+        self.canvas = FigureCanvasTkAgg(self.fig, master=parent)
+        self.canvas.get_tk_widget().pack(fill="both", expand=True)
+        self.canvas.mpl_connect("draw_event", self._on_draw)
+
+        self._background = None
+        self._full_redraw = False
+        self._scheduled = None
+
+    # ===== дані =====
+    def set_data(self, df: pd.DataFrame):
+        """Повністю замінює свічки (завантаження історії, зміна таймфрейму чи пари)."""
+        df = df.tail(self.max_candles)
+        self.times = np.array(df.index.values, dtype="datetime64[ms]")
+        self.ohlc = np.array(df[["open", "high", "low", "close"]].to_numpy(dtype=float))  # власна копія
+        self._rebuild_history()
+        self._update_last_artists()
+        self._rescale()
+        self.request_draw(full=True)
+
+    def update_candle(self, open_time: int, o: float, h: float, l: float, c: float):
+        """Оновлює останню свічку (тик усередині бару) або додає нову, якщо open_time (мс) новий."""
+        t = np.datetime64(int(open_time), "ms")
+        if len(self.times) and t < self.times[-1]:
+            return  # запізніле оновлення (напр. після зміни таймфрейму)
+        if len(self.times) and t == self.times[-1]:
+            self.ohlc[-1] = (o, h, l, c)
+            self._update_last_artists()
+            self.request_draw(full=self._rescale())
+            return
+
+        self.times = np.append(self.times, t)[-self.max_candles:]
+        self.ohlc = np.vstack([self.ohlc, (o, h, l, c)])[-self.max_candles:]
+        self._rebuild_history()
+        self._update_last_artists()
+        self._rescale()
+        self.request_draw(full=True)
+
+    # ===== artist'и =====
+    @staticmethod
+    def _colors(ohlc: np.ndarray) -> list:
+        return [UP_COLOR if close >= open_ else DOWN_COLOR for open_, _, _, close in ohlc]
+
+    def _rebuild_history(self):
+        """Малює усі свічки, крім останньої, двома колекціями."""
+        hist = self.ohlc[:-1]
+        x = np.arange(len(hist))
+        o, h, l, c = hist.T if len(hist) else (np.array([]),) * 4
+        self.wicks.set_segments([((xi, lo), (xi, hi)) for xi, lo, hi in zip(x, l, h)])
+        left, right = x - BODY_WIDTH / 2, x + BODY_WIDTH / 2
+        bottom, top = np.minimum(o, c), np.maximum(o, c)
+        self.bodies.set_verts([((a, b), (a, t), (r, t), (r, b)) for a, r, b, t in zip(left, right, bottom, top)])
+        colors = self._colors(hist)
+        self.wicks.set_color(colors)
+        self.bodies.set_facecolor(colors)
+        self.bodies.set_edgecolor(colors)
+        self.ax.set_xlim(-1, max(len(self.ohlc), 1))
+
+    def _update_last_artists(self):
+        if not len(self.ohlc):
+            self.last_wick.set_data([], [])
+            self.last_body.set_height(0)
+            return
+        x = len(self.ohlc) - 1
+        o, h, l, c = self.ohlc[-1]
+        color = UP_COLOR if c >= o else DOWN_COLOR
+        self.last_wick.set_data([x, x], [l, h])
+        self.last_wick.set_color(color)
+        self.last_body.set_xy((x - BODY_WIDTH / 2, min(o, c)))
+        self.last_body.set_height(abs(c - o))
+        self.last_body.set_facecolor(color)
+        self.last_body.set_edgecolor(color)
+
+    def _rescale(self) -> bool:
+        """Підганяє вісь Y під видимі свічки; True, якщо межі змінились."""
+        if not len(self.ohlc):
+            return False
+        low, high = self.ohlc[:, 2].min(), self.ohlc[:, 1].max()
+        pad = (high - low) * 0.05 or abs(high) * 0.001 or 1.0
+        current = self.ax.get_ylim()
+        fits = low >= current[0] and high <= current[1]
+        too_wide = (current[1] - current[0]) > (high - low + 2 * pad) * 1.5
+        if fits and not too_wide:
+            return False
+        self.ax.set_ylim(low - pad, high + pad)
+        return True
+
+    def _format_x(self, x, _pos=None) -> str:
+        i = int(round(x))
+        if 0 <= i < len(self.times):
+            return pd.Timestamp(self.times[i]).strftime("%d %H:%M")
+        return ""
+
+    # ===== малювання =====
+    def request_draw(self, full: bool = False):
+        """Планує перемальовування не частіше за `fps`; кілька запитів зливаються в один."""
+        self._full_redraw = self._full_redraw or full
+        if self._scheduled is None:
+            self._scheduled = self.parent.after(self.interval_ms, self._flush)
+
+    def _flush(self):
+        self._scheduled = None
+        if self._full_redraw or self._background is None:
+            self._full_redraw = False
+            self.canvas.draw_idle()  # фон перезбережеться в _on_draw
+            return
+        # лише остання свічка: відновлюємо фон і малюємо її поверх
+        self.canvas.restore_region(self._background)
+        self._draw_animated()
+        self.canvas.blit(self.ax.bbox)
+
+    def _on_draw(self, _event):
+        self._background = self.canvas.copy_from_bbox(self.ax.bbox)
+        self._draw_animated()
+
+    def _draw_animated(self):
+        self.ax.draw_artist(self.last_body)
+        self.ax.draw_artist(self.last_wick)
+
+    def destroy(self):
+        if self._scheduled is not None:
+            self.parent.after_cancel(self._scheduled)
+            self._scheduled = None
+        self.canvas.get_tk_widget().destroy()
@@ -0,0 +1,122 @@
+import logging
+import queue
+import threading
+from collections import deque
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from tkinter import scrolledtext
+
+# Скільки останніх повідомлень тримати в пам'яті
+LOG_CAPACITY = 5000
+# Скільки рядків лишати у віджеті (старші обрізаються)
+LOG_MAX_LINES = 1000
+# Як часто віджет забирає нові рядки (мс) і скільки звичайних рядків показує за раз
+LOG_FLUSH_MS = 500
+LOG_LINES_PER_FLUSH = 5
+# Ротація файлу логів
+LOG_FILE_MAX_BYTES = 5 * 1024 * 1024
+LOG_FILE_BACKUPS = 3
+
+
+class LogBuffer:
+    """
+    Потокобезпечне кільце останніх повідомлень (без Tk).
+
+    `append` можна викликати з будь-якого потоку. `take` віддає нові рядки з моменту
+    попереднього виклику: важливі (force) - завжди, звичайні - не більше `limit`
+    останніх; решта рахується в `suppressed`, а не зникає мовчки. З `path` усі
+    повідомлення пишуться у файл з ротацією у фоновому потоці (`QueueListener`).
+    """
+
+    def __init__(self, capacity: int = LOG_CAPACITY, path: str = None, max_bytes: int = LOG_FILE_MAX_BYTES,
+                 backups: int = LOG_FILE_BACKUPS):
+        self._lines = deque(maxlen=capacity)  # (номер, повідомлення, force)
+        self._lock = threading.Lock()
+        self._seq = 0
+        self._taken = 0
+        self.suppressed = 0
+        self._logger = None
+        self._listener = None
+        if path:
+            handler = RotatingFileHandler(path, maxBytes=max_bytes, backupCount=backups, encoding="utf-8")
+            handler.setFormatter(logging.Formatter("%(asctime)s %(message)s"))
+            log_queue = queue.SimpleQueue()
+            self._listener = QueueListener(log_queue, handler)
+            self._listener.start()
+            self._logger = logging.getLogger(f"dogetrade.log.{id(self)}")
+            self._logger.propagate = False
+            self._logger.setLevel(logging.INFO)
+            self._logger.addHandler(QueueHandler(log_queue))
+
+    def append(self, message: str, force: bool = False):
+        with self._lock:
+            self._seq += 1
+            self._lines.append((self._seq, message, force))
+        if self._logger is not None:
+            self._logger.info(message)
+
+    def take(self, limit: int = LOG_LINES_PER_FLUSH) -> tuple:
+        """Нові рядки (у порядку надходження) і скільки звичайних рядків пропущено."""
+        with self._lock:
+            new = min(self._seq - self._taken, len(self._lines))
+            skipped = self._seq - self._taken - new  # витіснені з кільця до показу
+            self._taken = self._seq
+            fresh = [self._lines[i] for i in range(len(self._lines) - new, len(self._lines))]
+        shown = []
+        quota = limit
+        for _, message, force in reversed(fresh):
+            if force or quota > 0:
+                shown.append(message)
+                quota -= not force
+            else:
+                skipped += 1
+        shown.reverse()
+        self.suppressed += skipped
+        return shown, skipped
+
+    def close(self):
+        if self._listener is not None:
+            self._listener.stop()  # дописує чергу у файл
+            for handler in self._listener.handlers:
+                handler.close()
+            self._listener = None
+
+
+class LogPanel:
+    """
+    ScrolledText для логів, що оновлюється пачками не частіше ніж раз на `flush_ms`
+    і тримає не більше `max_lines` рядків.
+    """
+
+    def __init__(self, parent, buffer: LogBuffer, flush_ms: int = LOG_FLUSH_MS, max_lines: int = LOG_MAX_LINES,
+                 lines_per_flush: int = LOG_LINES_PER_FLUSH, **text_options):
+        self.buffer = buffer
+        self.flush_ms = flush_ms
+        self.max_lines = max_lines
+        self.lines_per_flush = lines_per_flush
+        self.text = scrolledtext.ScrolledText(parent, **text_options)
+        self._after_id = self.text.after(self.flush_ms, self._flush)
+
+    def pack(self, **kwargs):
+        self.text.pack(**kwargs)
+
+    def _flush(self):
+        lines, skipped = self.buffer.take(self.lines_per_flush)
+        if skipped:
+            lines.insert(0, f"... {skipped} messages suppressed")
+        if lines:
+            at_end = self.text.yview()[1] >= 1.0
+            self.text.insert("end", "\n".join(lines) + "\n")
+            excess = int(self.text.index("end-1c").split(".")[0]) - 1 - self.max_lines
+            if excess > 0:
+                self.text.delete("1.0", f"{excess + 1}.0")
+            if at_end:
+                self.text.see("end")
+        self._after_id = self.text.after(self.flush_ms, self._flush)
+
+    def clear(self):
+        self.text.delete("1.0", "end")
+
+    def stop(self):
+        if self._after_id is not None:
+            self.text.after_cancel(self._after_id)
+            self._after_id = None
@@ -1,16 +1,38 @@
 # ui/main_window.py
 import tkinter as tk
-from tkinter import ttk, scrolledtext
+from tkinter import ttk
 import customtkinter as ctk
-from binance import ThreadedWebsocketManager
-import pandas as pd
+import os
+import threading
 import time
-from core import signals
 
 from core.binance_api import get_historical_futures_klines
+from core import kline_store, strategies
 # from core import config
-from ui.chart import create_candlestick_chart
-from core.database import get_settings, save_settings
+from ui.chart import CandlestickChart
+from ui.log_panel import LogBuffer, LogPanel
+from ui.signal_history import ROW_HEIGHT, SignalHistoryView
+from ui.update_queue import UiUpdateQueue
+from core.database import SignalStore, close_db, get_settings, save_settings
+from core.compute_worker import ComputeWorker
+from core.live import LiveSession, is_open_update
+from core.resample import BASE_INTERVAL
+from core.instrumentation import tracer
+from core.recorder import MessageRecorder, replay
+
+# Скільки свічок тримати в пам'яті live-сесії та скільки показувати на графіку
+CANDLE_CAPACITY = 5000
+CHART_CANDLES = 100
+# Скільки 1m-свічок історії завантажувати: з них локально будуються старші таймфрейми
+BASE_HISTORY = 6000
+INTERVALS = ["1m", "5m", "15m", "1h", "4h", "1d"]
+TRADING_PAIRS = ["DOGEUSDT", "SOLUSDT", "BTCUSDT", "ETHUSDT"]
+# Період тіку, на якому GUI забирає накопичені оновлення (мс)
+UI_TICK_MS = 100
+# Куди періодично пишеться знімок затримок, коли інструментація увімкнена
+DIAGNOSTICS_PATH = os.path.join(os.path.dirname(__file__), "..", "diagnostics.json")
+DIAGNOSTICS_EXPORT_SEC = 30
+SIGNAL_COLORS = {"BUY": "green", "SELL": "red", "HOLD": "gray"}
 
 
 def _symbol_to_label(symbol: str) -> str:
@@ -19,13 +41,25 @@ def _symbol_to_label(symbol: str) -> str:
 
 
 class DogeTradeApp(ctk.CTk):
-    def __init__(self):
+    def __init__(self, candle_capacity: int = CANDLE_CAPACITY, record_path: str = None,
+                 replay_path: str = None, replay_speed: float = 1.0, offline: bool = False, log_path: str = None):
+        """
+        record_path - дописувати сирі повідомлення сокетів у журнал (`core/recorder.py`);
+        replay_path - замість сокетів відтворити журнал зі швидкістю replay_speed (0 - максимальна);
+        offline - лише кешовані свічки, без REST і сокетів;
+        log_path - дублювати лог у файл з ротацією.
+
+        Вікно з'являється одразу зі свічками з локального кешу; свіжа історія та сокети
+        підключаються у фоновому потоці.
+        """
         super().__init__()
 
         self.title("DogeTrade Signals (Futures)")
         self.geometry("1000x600")
         self.protocol("WM_DELETE_WINDOW", self.on_closing)
         self.running = True
+        # лог накопичується в кільці й показується пачками (`ui/log_panel.py`)
+        self.logs = LogBuffer(path=log_path)
 
         # === settings from DB (fallback to config) ===
         s = get_settings() or {}
@@ -34,10 +68,17 @@ class DogeTradeApp(ctk.CTk):
         self.api_key = s.get("api_key", "")
         self.api_secret = s.get("api_secret", "")
 
-        self.df = None
         self.kline_socket_key = None
         self.ticker_socket_key = None
         self.selected_strategy = "EMA"  # 🔹 стратегія за замовчуванням
+        # сигнали пишуться в БД пачками у фоновому потоці
+        self.signal_store = SignalStore()
+
+        # оновлення з потоків сокетів/обчислень накопичуються тут і забираються на тіку GUI
+        self.ui_queue = UiUpdateQueue()
+        # буфер свічок + потокова стратегія (O(1) на свічку)
+        self.session = LiveSession(candle_capacity, self.selected_strategy, sink=self.ui_queue, interval=default_tf,
+                                   symbol=self.symbol)
 
         # === top bar ===
         top = ctk.CTkFrame(self, height=50)
@@ -52,14 +93,20 @@ class DogeTradeApp(ctk.CTk):
         self.signal_label = ctk.CTkLabel(top, text="Signal: HOLD", font=("Arial", 16), text_color="gray")
         self.signal_label.pack(side="left", padx=20)
 
-        # right side order: Test Log | 1m | ⚙️
+        # глибина черги обчислень та кількість відкинутих/злитих повідомлень
+        self.queue_label = ctk.CTkLabel(top, text="", font=("Arial", 11), text_color="gray")
+        self.queue_label.pack(side="left", padx=10)
+
+        # right side order: Test Log | 1m | 📊 | ⚙️
         self.interval_var = tk.StringVar(value=default_tf)
-        intervals = ["1m", "5m", "15m", "1h", "4h", "1d"]
 
         settings_btn = ctk.CTkButton(top, text="⚙️", width=40, command=self.open_settings_window)
         settings_btn.pack(side="right", padx=10)
 
-        interval_menu = ctk.CTkOptionMenu(top, variable=self.interval_var, values=intervals, command=self.change_interval)
+        diag_btn = ctk.CTkButton(top, text="📊", width=40, command=self.open_diagnostics_window)
+        diag_btn.pack(side="right", padx=(10, 0))
+
+        interval_menu = ctk.CTkOptionMenu(top, variable=self.interval_var, values=INTERVALS, command=self.change_interval)
         interval_menu.pack(side="right", padx=10)
 
         test_btn = ctk.CTkButton(top, text="Test Log", command=self.test_log)
@@ -76,8 +123,10 @@ class DogeTradeApp(ctk.CTk):
         self.chart_frame = ctk.CTkFrame(hpane)
         hpane.add(self.chart_frame, stretch="always")
 
-        self.df = get_historical_futures_klines(self.symbol, self.interval_var.get(), 100)
-        self.chart_canvas = create_candlestick_chart(self.chart_frame, self.df)
+        self.chart = CandlestickChart(self.chart_frame, max_candles=CHART_CANDLES)
+        self._load_cached_candles()
+        self.update_chart()
+        self._show_last_signal()
 
         # signal history (right)
         right = ctk.CTkFrame(hpane, width=250)
@@ -85,22 +134,13 @@ class DogeTradeApp(ctk.CTk):
 
         ctk.CTkLabel(right, text="Signal History", font=("Arial", 14, "bold")).pack(pady=5)
 
-        self.tree = ttk.Treeview(right, columns=("time", "signal", "price"), show="headings", height=15)
         style = ttk.Style()
-        style.configure("Treeview", font=("Arial", 13))
+        style.configure("Treeview", font=("Arial", 13), rowheight=ROW_HEIGHT)
         style.configure("Treeview.Heading", font=("Arial", 14, "bold"))
 
-        self.tree.heading("time", text="Time")
-        self.tree.heading("signal", text="Signal")
-        self.tree.heading("price", text="Price")
-        self.tree.column("time", width=100)
-        self.tree.column("signal", width=70)
-        self.tree.column("price", width=80)
-        self.tree.pack(side="left", fill="both", expand=True)
-
-        sbar = ttk.Scrollbar(right, orient="vertical", command=self.tree.yview)
-        self.tree.configure(yscroll=sbar.set)
-        sbar.pack(side="right", fill="y")
+        # історія з таблиці signals: у Treeview лише видимі рядки, решта - сторінками з БД
+        self.history = SignalHistoryView(right, self.signal_store)
+        self.history.refresh()
 
         # logs (bottom)
         bottom = ctk.CTkFrame(vpane, height=100)
@@ -110,10 +150,8 @@ class DogeTradeApp(ctk.CTk):
         logs_frame = ctk.CTkFrame(bottom)
         logs_frame.pack(side="left", fill="both", expand=True)
 
-        self.log_text = scrolledtext.ScrolledText(
-            logs_frame, height=5, bg="#1e1e1e", fg="white", font=("Consolas", 13)
-        )
-        self.log_text.pack(fill="both", expand=True)
+        self.log_panel = LogPanel(logs_frame, self.logs, height=5, bg="#1e1e1e", fg="white", font=("Consolas", 13))
+        self.log_panel.pack(fill="both", expand=True)
 
         # Права частина (для кнопок)
         right_controls = ctk.CTkFrame(bottom, width=120)
@@ -130,58 +168,152 @@ class DogeTradeApp(ctk.CTk):
         )
         self.clear_btn.pack(side="top", padx=5, pady=5)
 
-        # Кнопки вибору стратегії
-        self.ema_button = ctk.CTkButton(
-            right_controls, text="EMA", width=100,
-            command=lambda: self.set_strategy("EMA")
-        )
-        self.ema_button.pack(side="top", padx=5, pady=5)
-
-        self.rsi_button = ctk.CTkButton(
-            right_controls, text="RSI", width=100,
-            command=lambda: self.set_strategy("RSI")
-        )
-        self.rsi_button.pack(side="top", padx=5, pady=5)
-
-        self.macd_button = ctk.CTkButton(
-            right_controls, text="MACD", width=100,
-            command=lambda: self.set_strategy("MACD")
-        )
-        self.macd_button.pack(side="top", padx=5, pady=5)
+        # Кнопки вибору стратегії - по одній на кожну стратегію з реєстру
+        self.strategy_buttons = {}
+        for name in strategies.names():
+            button = ctk.CTkButton(right_controls, text=name, width=100,
+                                   command=lambda n=name: self.set_strategy(n))
+            button.pack(side="top", padx=5, pady=5)
+            self.strategy_buttons[name] = button
 
         self.highlight_strategy_button("EMA")
-        self.last_log_time = 0
-
-        # websockets (start once)
-        self.twm = ThreadedWebsocketManager(api_key=self.api_key, api_secret=self.api_secret)
-        self.twm.start()
-        self._start_sockets()
 
-        self.add_log("Connected to Binance Futures WebSocket", force=True)
+        # стратегії рахуються в окремому потоці, а не в потоці websocket
+        self.worker = ComputeWorker(
+            self._process_kline,
+            on_error=lambda e: self.ui_queue.log(f"Kline error: {e}", True),
+            droppable=lambda item: is_open_update(item[1]),  # закриті свічки не губляться
+        ).start()
+        self._next_tick = tracer.now() + UI_TICK_MS / 1000
+        self.after(UI_TICK_MS, self._ui_tick)
+
+        # запис повідомлень сокетів у журнал (для відтворення та навантажувальних тестів)
+        self.recorder = MessageRecorder(record_path) if record_path else None
+        self._ticker_callback = self.handle_ticker
+        self._kline_callback = self.handle_kline
+        if self.recorder is not None:
+            self._ticker_callback = self.recorder.wrap("ticker", self.handle_ticker)
+            self._kline_callback = self.recorder.wrap("kline", self.handle_kline)
+
+        self.twm = None
+        self._replay_stop = threading.Event()
+        if replay_path:
+            self._start_replay(replay_path, replay_speed)
+        elif not offline:
+            self._start_background_load()
 
     # ===== strategy controls =====
     def set_strategy(self, strategy: str):
         self.selected_strategy = strategy
+        self.session.set_strategy(strategy)
         self.highlight_strategy_button(strategy)
         self.add_log(f"Strategy switched to {strategy}", force=True)
 
     def highlight_strategy_button(self, strategy: str):
-        # Скидаємо стилі
-        self.ema_button.configure(fg_color="transparent")
-        self.rsi_button.configure(fg_color="transparent")
-        self.macd_button.configure(fg_color="transparent")
-
-        # Виділяємо активну
-        if strategy == "EMA":
-            self.ema_button.configure(fg_color="blue")
-        elif strategy == "RSI":
-            self.rsi_button.configure(fg_color="blue")
-        elif strategy == "MACD":
-            self.macd_button.configure(fg_color="blue")
+        for name, button in self.strategy_buttons.items():
+            button.configure(fg_color="blue" if name == strategy else "transparent")
+
+    def _load_cached_candles(self):
+        """Свічки з локального кешу `kline_store` - без мережі, для миттєвого старту."""
+        interval = self.interval_var.get()
+        step = kline_store.INTERVAL_MS[BASE_INTERVAL]
+        end_ms = int(time.time() * 1000) // step * step
+        df = kline_store.load_klines(self.symbol, BASE_INTERVAL, end_ms - (BASE_HISTORY - 1) * step, end_ms)
+        self.session.set_interval(interval)
+        self.session.load(df, self._cached_history(interval))
+
+    def _fetch_history(self, symbol: str, interval: str) -> tuple:
+        """
+        REST: 1m-історія (з неї будуються всі таймфрейми) та старші свічки інтервалу,
+        яких вона не покриває. Викликається з фонового потоку.
+        """
+        df = get_historical_futures_klines(symbol, BASE_INTERVAL, BASE_HISTORY)
+        older = None
+        if interval != BASE_INTERVAL:
+            older = get_historical_futures_klines(symbol, interval, CHART_CANDLES)
+        return df, older
+
+    def _apply_history(self, symbol: str, interval: str, df, older):
+        """Tk-потік: підміняє кешовані свічки свіжими і прогріває стратегію."""
+        if symbol != self.symbol:
+            return  # пару змінили, поки йшло завантаження
+        self.session.load(df, older if interval == self.session.interval else None)
+        self.update_chart()
+        self._show_last_signal()
+        self._prefetch_history()
+
+    def _start_background_load(self):
+        """Свіжа історія з REST і підключення сокетів - у фоні, щоб вікно не чекало мережі."""
+        symbol, interval = self.symbol, self.interval_var.get()
+
+        def run():
+            try:
+                df, older = self._fetch_history(symbol, interval)
+            except Exception as e:
+                self.ui_queue.log(f"History load failed, showing cached candles: {e}", True)
+            else:
+                self.ui_queue.post(lambda: self._apply_history(symbol, interval, df, older))
+            if not self.running:
+                return
+            try:
+                self._connect_sockets()
+            except Exception as e:
+                self.ui_queue.log(f"WebSocket connection failed: {e}", True)
+
+        threading.Thread(target=run, name="startup-load", daemon=True).start()
+
+    def _connect_sockets(self):
+        if self.twm is None:
+            from binance import ThreadedWebsocketManager  # імпорт пакета binance - лише тут, не на старті
+            self.twm = ThreadedWebsocketManager(api_key=self.api_key, api_secret=self.api_secret)
+            self.twm.start()
+        self._start_sockets()
+        self.ui_queue.log("Connected to Binance Futures WebSocket", True)
+
+    def _prefetch_history(self):
+        """
+        Кешує в `kline_store` старшу історію всіх інтервалів (і 1m-історію інших пар зі
+        списку налаштувань), щоб перемикання інтервалу чи пари не чекало мережі.
+        """
+        symbol = self.symbol
+        requests = [(pair, BASE_INTERVAL, BASE_HISTORY) for pair in TRADING_PAIRS if pair != symbol]
+        requests += [(pair, interval, CHART_CANDLES) for pair in [symbol] + [p for p in TRADING_PAIRS if p != symbol]
+                     for interval in INTERVALS if interval != BASE_INTERVAL]
+
+        def run():
+            try:
+                from core import async_fetch  # тягне aiohttp - лише тут, не на старті GUI
+                async_fetch.fetch_many(requests)
+                return
+            except ImportError:
+                pass  # без aiohttp - послідовно, лише поточна пара
+            except Exception as e:
+                self.ui_queue.log(f"History prefetch failed: {e}", True)
+                return
+            for interval in INTERVALS:
+                if interval == BASE_INTERVAL:
+                    continue
+                try:
+                    get_historical_futures_klines(symbol, interval, CHART_CANDLES)
+                except Exception as e:
+                    self.ui_queue.log(f"History prefetch {interval} failed: {e}", True)
+                    return
+
+        threading.Thread(target=run, name="history-prefetch", daemon=True).start()
+
+    def _cached_history(self, interval: str):
+        """Старші свічки інтервалу з локального кешу (без мережі) або None."""
+        if interval == BASE_INTERVAL:
+            return None
+        step = kline_store.INTERVAL_MS[interval]
+        end_ms = int(time.time() * 1000) // step * step
+        df = kline_store.load_klines(self.symbol, interval, end_ms - (CHART_CANDLES - 1) * step, end_ms)
+        return df[kline_store.COLUMNS] if len(df) else None
 
     # ===== sockets =====
     def _start_sockets(self):
-        interval = self.interval_var.get()
+        if self.twm is None:
+            return  # сокети ще не підключені або режим відтворення журналу
         sym = self.symbol.lower()
 
         # stop old
@@ -205,23 +337,38 @@ class DogeTradeApp(ctk.CTk):
 
         # start new
         self.ticker_socket_key = self.twm.start_futures_multiplex_socket(
-            callback=self.handle_ticker,
+            callback=self._ticker_callback,
             streams=[f"{sym}@ticker"]
         )
         self.kline_socket_key = self.twm.start_futures_multiplex_socket(
-            callback=self.handle_kline,
-            streams=[f"{sym}@kline_{interval}"]
+            callback=self._kline_callback,
+            streams=[f"{sym}@kline_{BASE_INTERVAL}"]  # старші інтервали будуються з 1m локально
         )
 
+    def _start_replay(self, path: str, speed: float):
+        """Відтворює журнал через handle_ticker/handle_kline у фоновому потоці."""
+        self.session.set_symbol(None)  # у журналі - пара, на якій його записали
+
+        def run():
+            try:
+                stats = replay(path, {"ticker": self.handle_ticker, "kline": self.handle_kline},
+                               speed=speed, stop=self._replay_stop)
+            except Exception as e:
+                self.ui_queue.log(f"Replay error: {e}", True)
+                return
+            self.ui_queue.log(f"Replay finished: {stats['messages']} messages in {stats['seconds']:.2f}s "
+                              f"({stats['messages_per_sec']:.0f} msg/s)", True)
+
+        threading.Thread(target=run, name="replay", daemon=True).start()
+        self.add_log(f"Replaying {path} at {f'{speed:g}x' if speed else 'max'} speed", force=True)
+
     # ===== logs & ui =====
     def add_log(self, message: str, force: bool = False):
-        now = time.time()
-        if force or now - self.last_log_time >= 5:
-            self.log_text.insert("end", message + "\n")
-            self.last_log_time = now
+        """force - показати навіть у потоці частих повідомлень (звичайні можуть бути пропущені)."""
+        self.logs.append(message, force)
 
     def clear_logs(self):
-        self.log_text.delete("1.0", tk.END)
+        self.log_panel.clear()
 
     def test_log(self):
         import random
@@ -230,71 +377,148 @@ class DogeTradeApp(ctk.CTk):
         self.add_log(f"Test log message: {sig}", force=True)
 
     # ===== handlers =====
+    # Викликаються з потоку websocket: лише кладуть дані в черги, без звернень до Tk
     def handle_ticker(self, msg):
         if not self.running:
             return
+        received = tracer.now()
         try:
-            data = msg.get("data", msg)
-            price = float(data["c"])
-            self.after(0, self.update_price_label, price)
+            with tracer.span("ticker.parse"):
+                data = msg.get("data", msg)
+                price = float(data["c"])
+            self.ui_queue.set_price(price, received)
         except Exception as e:
             if self.running:
-                self.after(0, self.add_log, f"Ticker error: {e}", True)
+                self.ui_queue.log(f"Ticker error: {e}", True)
+
+    def handle_kline(self, msg):
+        if not self.running:
+            return
+        self.worker.submit((tracer.now(), msg))
+
+    def _process_kline(self, item):
+        """Обробник ComputeWorker: (час отримання, повідомлення) → LiveSession."""
+        received, msg = item
+        tracer.record_since("kline.queue_wait", received)
+        self.session.process_kline(msg, received)
+
+    # ===== ui tick =====
+    def _ui_tick(self):
+        """Раз на UI_TICK_MS застосовує накопичені оновлення однією пачкою."""
+        if not self.running:
+            return
+        # наскільки пізно Tk виконав тік відносно запланованого часу
+        tracer.record_since("ui.tick_lag", self._next_tick)
+        with tracer.span("ui.tick"):
+            batch = self.ui_queue.drain()
+            if batch["price"] is not None:
+                self.update_price_label(batch["price"])
+                tracer.record_since("ticker.end_to_end", batch["price_received"])
+            with tracer.span("ui.chart_update"):
+                for open_time, (o, h, l, c) in batch["candles"]:
+                    self.chart.update_candle(open_time, o, h, l, c)
+            if batch["signals"]:
+                self.show_signals(batch["signals"])
+            for message, force in batch["logs"]:
+                self.add_log(message, force)
+            for callback in batch["calls"]:
+                callback()
+            self._update_queue_label()
+        self._next_tick = tracer.now() + UI_TICK_MS / 1000
+        self.after(UI_TICK_MS, self._ui_tick)
+
+    def _update_queue_label(self):
+        stats = self.worker.stats()
+        coalesced = self.ui_queue.coalesced
+        text = (f"Queue: {stats['depth']} (max {stats['max_depth']}) | dropped: {stats['dropped']} | "
+                f"coalesced: {coalesced['price'] + coalesced['candle']} | log suppressed: {self.logs.suppressed}")
+        if text != self.queue_label.cget("text"):
+            self.queue_label.configure(text=text)
 
     def update_price_label(self, price: float):
         self.price_label.configure(text=f"Last Price: {price:.5f}")
         self.add_log(f"Futures Price updated: {price:.5f}")
 
     def update_signal(self, signal: str, price: float):
-        colors = {"BUY": "green", "SELL": "red", "HOLD": "gray"}
-        self.signal_label.configure(text=f"Signal: {signal}", text_color=colors.get(signal, "gray"))
-        tag = signal.lower()
-        self.tree.insert("", "end",
-                         values=(pd.Timestamp.now().strftime("%H:%M:%S"), signal, f"{price:.5f}"),
-                         tags=(tag,))
-        self.tree.yview_moveto(1.0)
-        self.tree.tag_configure("buy", foreground="green")
-        self.tree.tag_configure("sell", foreground="red")
-        self.tree.tag_configure("hold", foreground="gray")
-
-    def handle_kline(self, msg):
-        if not self.running:
-            return
-        try:
-            data = msg.get("data", msg)
-            k = data["k"]
-            t = pd.to_datetime(k["t"], unit="ms")
-            o, h, l, c, v = map(float, [k["o"], k["h"], k["l"], k["c"], k["v"]])
-            if k["x"]:  # свічка закрита
-                self.df.loc[t] = [o, h, l, c, v]
-
-                self.after(0, self.update_chart)
-
-                # 🔹 вибір стратегії
-                if self.selected_strategy == "EMA":
-                    signal = signals.ema_crossover(self.df, fast=9, slow=21)
-                elif self.selected_strategy == "RSI":
-                    signal = signals.rsi_strategy(self.df, period=14)
-                elif self.selected_strategy == "MACD":
-                    signal = signals.macd_strategy(self.df, fast=12, slow=26, signal=9)
-                else:
-                    signal = "HOLD"
-
-                self.after(0, self.update_signal, signal, c)
-                self.after(0, self.add_log, f"New Futures candle: {t} Close={c:.5f}", True)
-        except Exception as e:
-            if self.running:
-                self.after(0, self.add_log, f"Kline error: {e}", True)
+        self.show_signals([(time.time(), signal, price, None)])
+
+    def show_signals(self, rows: list):
+        """
+        Додає пачку сигналів (час, сигнал, ціна, час отримання кадру) в історію;
+        мітка показує останній.
+        """
+        interval, strategy = self.session.interval, self.session.strategy_name
+        for ts, signal, price, _ in rows:
+            self.signal_store.add(ts, signal, price, self.symbol, interval, strategy)
+        self.history.refresh()
+        signal = rows[-1][1]
+        self.signal_label.configure(text=f"Signal: {signal}", text_color=SIGNAL_COLORS.get(signal, "gray"))
+        # від кадру websocket до зміни мітки сигналу
+        for row in rows:
+            tracer.record_since("kline.end_to_end", row[3])
+
+    def _show_last_signal(self):
+        """Сигнал стратегії на останній закритій свічці історії (до першого live-сигналу)."""
+        live = self.session.strategy
+        if live is not None and live.count:
+            signal = live.last_signal
+            self.signal_label.configure(text=f"Signal: {signal}", text_color=SIGNAL_COLORS.get(signal, "gray"))
 
     def update_chart(self):
-        self.chart_canvas.get_tk_widget().destroy()
-        self.chart_canvas = create_candlestick_chart(self.chart_frame, self.df)
+        self.chart.set_data(self.session.to_frame(CHART_CANDLES))
 
     def change_interval(self, new_interval):
+        """Перемикання без мережі: свічки з 1m-буфера + старша історія з локального кешу."""
         self.add_log(f"Changing timeframe to {new_interval}", force=True)
-        self.df = get_historical_futures_klines(self.symbol, new_interval, 100)
+        self.session.set_interval(new_interval, self._cached_history(new_interval))
+        self.ui_queue.discard_candles()  # свічки попереднього інтервалу, що ще чекають тіку
         self.update_chart()
-        self._start_sockets()
+
+    # ===== diagnostics =====
+    def open_diagnostics_window(self):
+        """Вікно з p50/p95/p99 затримок по етапах; оновлюється раз на секунду."""
+        win = ctk.CTkToplevel(self)
+        win.title("Diagnostics")
+        win.geometry("620x420")
+
+        controls = ctk.CTkFrame(win)
+        controls.pack(side="top", fill="x", padx=5, pady=5)
+
+        enabled_var = tk.BooleanVar(value=tracer.enabled)
+
+        def toggle():
+            tracer.enabled = enabled_var.get()
+            if tracer.enabled:
+                tracer.start_export(DIAGNOSTICS_PATH, DIAGNOSTICS_EXPORT_SEC)
+            else:
+                tracer.stop_export()
+            self.add_log(f"Latency tracing {'enabled' if tracer.enabled else 'disabled'}", True)
+
+        def export():
+            tracer.export(DIAGNOSTICS_PATH)
+            self.add_log(f"Diagnostics exported to {os.path.abspath(DIAGNOSTICS_PATH)}", True)
+
+        ctk.CTkCheckBox(controls, text="Enable tracing", variable=enabled_var, command=toggle).pack(side="left", padx=10)
+        ctk.CTkButton(controls, text="Reset", width=80, command=tracer.reset).pack(side="right", padx=5)
+        ctk.CTkButton(controls, text="Export", width=80, command=export).pack(side="right", padx=5)
+
+        columns = ("stage", "count", "p50", "p95", "p99", "max")
+        tree = ttk.Treeview(win, columns=columns, show="headings")
+        for col in columns:
+            tree.heading(col, text=col if col in ("stage", "count") else f"{col}, ms")
+            tree.column(col, width=200 if col == "stage" else 80, anchor="w" if col == "stage" else "e")
+        tree.pack(fill="both", expand=True, padx=5, pady=5)
+
+        def refresh():
+            if not win.winfo_exists():
+                return
+            tree.delete(*tree.get_children())
+            for stage, st in tracer.snapshot().items():
+                tree.insert("", "end", values=(stage, st["count"], f"{st['p50']:.3f}", f"{st['p95']:.3f}",
+                                               f"{st['p99']:.3f}", f"{st['max']:.3f}"))
+            win.after(1000, refresh)
+
+        refresh()
 
     # ===== settings modal =====
     def _attach_paste_support(self, entry: ctk.CTkEntry):
@@ -359,12 +583,12 @@ class DogeTradeApp(ctk.CTk):
         ctk.CTkLabel(win, text="Trading Pair:").pack(anchor="w", padx=20, pady=(8, 0))
         tp_var = tk.StringVar(value=s.get("trading_pair", "DOGEUSDT"))
         ctk.CTkOptionMenu(win, variable=tp_var,
-                          values=["DOGEUSDT", "SOLUSDT", "BTCUSDT", "ETHUSDT"]).pack(fill="x", padx=20)
+                          values=TRADING_PAIRS).pack(fill="x", padx=20)
 
         ctk.CTkLabel(win, text="Default Timeframe:").pack(anchor="w", padx=20, pady=(8, 0))
         tf_var = tk.StringVar(value=s.get("default_timeframe", "1m"))
         ctk.CTkOptionMenu(win, variable=tf_var,
-                          values=["1m", "5m", "15m", "1h", "4h", "1d"]).pack(fill="x", padx=20)
+                          values=INTERVALS).pack(fill="x", padx=20)
 
         def save_and_close():
             new_api_key = api_key_entry.get().strip()
@@ -383,17 +607,29 @@ class DogeTradeApp(ctk.CTk):
         self.api_key = new_api_key
         self.api_secret = new_api_secret
         self.symbol = new_symbol
+        # події старої пари, що ще чекають у черзі, вже не потрібні; нові кадри звіряються з парою сесії
+        self.session.set_symbol(new_symbol)
+        self.worker.clear()
         self.interval_var.set(new_tf)
         self.pair_label.configure(text=_symbol_to_label(self.symbol))
 
-        self.df = get_historical_futures_klines(self.symbol, self.interval_var.get(), 100)
+        self._load_cached_candles()
         self.update_chart()
-        self._start_sockets()
+        self._start_background_load()
         self.add_log(f"Settings applied: {self.symbol} @ {self.interval_var.get()}", True)
 
     # ===== closing =====
     def on_closing(self):
         self.running = False
+        self.worker.stop()
+        tracer.stop_export()
+        self._replay_stop.set()
+        if self.recorder is not None:
+            self.recorder.close()
+        self.signal_store.close()
+        close_db()
+        self.log_panel.stop()
+        self.logs.close()
         try:
             if self.kline_socket_key:
                 try:
@@ -0,0 +1,97 @@
+from tkinter import ttk
+
+import pandas as pd
+
+# Висота рядка таблиці (пікселі) - з неї рахується, скільки рядків видно
+ROW_HEIGHT = 24
+# Скільки рядків над і під видимим вікном тримати в пам'яті, щоб прокрутка не йшла в БД
+PAGE_BUFFER = 50
+
+
+class SignalHistoryView:
+    """
+    Віртуалізована історія сигналів поверх `SignalStore`.
+
+    Treeview містить лише видимі рядки; навколо них у пам'яті тримається невеликий
+    буфер, а решта довантажується сторінками з БД при прокрутці. Смуга прокрутки
+    керується вручну (позиція = offset / count). Якщо вікно стоїть у кінці історії,
+    нові сигнали прокручують його за собою.
+    """
+
+    def __init__(self, parent, store, buffer: int = PAGE_BUFFER):
+        self.store = store
+        self.buffer = buffer
+        self.rows = 15
+        self.offset = 0
+        self.total = 0
+        self.follow = True
+        self._cache_start = 0
+        self._cache = []
+
+        self.tree = ttk.Treeview(parent, columns=("time", "signal", "price"), show="headings", height=self.rows)
+        self.tree.heading("time", text="Time")
+        self.tree.heading("signal", text="Signal")
+        self.tree.heading("price", text="Price")
+        self.tree.column("time", width=100)
+        self.tree.column("signal", width=70)
+        self.tree.column("price", width=80)
+        self.tree.tag_configure("buy", foreground="green")
+        self.tree.tag_configure("sell", foreground="red")
+        self.tree.tag_configure("hold", foreground="gray")
+        self.tree.pack(side="left", fill="both", expand=True)
+
+        self.sbar = ttk.Scrollbar(parent, orient="vertical", command=self._on_scrollbar)
+        self.sbar.pack(side="right", fill="y")
+
+        self.tree.bind("<Configure>", self._on_resize)
+        self.tree.bind("<MouseWheel>", lambda e: self.scroll(-1 if e.delta > 0 else 1))
+        self.tree.bind("<Button-4>", lambda e: self.scroll(-1))
+        self.tree.bind("<Button-5>", lambda e: self.scroll(1))
+
+    def refresh(self):
+        """Перечитує кількість сигналів; у режимі стеження показує останні."""
+        self.total = self.store.count()
+        if self.follow:
+            self.offset = max(0, self.total - self.rows)
+        self._render()
+
+    def scroll(self, delta: int):
+        self._move_to(self.offset + delta)
+        return "break"
+
+    def _move_to(self, offset: int):
+        self.offset = max(0, min(offset, self.total - self.rows))
+        self.follow = self.offset + self.rows >= self.total
+        self._render()
+
+    def _on_scrollbar(self, action, value, unit=None):
+        if action == "moveto":
+            self._move_to(round(float(value) * self.total))
+        elif action == "scroll":
+            self.scroll(int(value) * (self.rows if unit == "pages" else 1))
+
+    def _on_resize(self, event):
+        heading = ROW_HEIGHT + 4
+        rows = max(1, (event.height - heading) // ROW_HEIGHT)
+        if rows != self.rows:
+            self.rows = rows
+            self.refresh()
+
+    def _visible_rows(self) -> list:
+        end = min(self.offset + self.rows, self.total)
+        cache_end = self._cache_start + len(self._cache)
+        if not (self._cache_start <= self.offset and end <= cache_end):
+            self._cache_start = max(0, self.offset - self.buffer)
+            self._cache = self.store.page(self._cache_start, end + self.buffer - self._cache_start)
+        return self._cache[self.offset - self._cache_start:end - self._cache_start]
+
+    def _render(self):
+        self.tree.delete(*self.tree.get_children())
+        for ts, signal, price in self._visible_rows():
+            self.tree.insert("", "end",
+                             values=(pd.Timestamp.fromtimestamp(ts).strftime("%H:%M:%S"), signal, f"{price:.5f}"),
+                             tags=(signal.lower(),))
+        if self.total:
+            self.sbar.set(self.offset / self.total, min(1.0, (self.offset + self.rows) / self.total))
+        else:
+            self.sbar.set(0.0, 1.0)
@@ -0,0 +1,77 @@
+import threading
+import time
+
+
+class UiUpdateQueue:
+    """
+    Потокобезпечний накопичувач оновлень для GUI.
+
+    Потоки сокетів і обчислень лише записують сюди дані, а Tk-потік раз на тик
+    забирає все накопичене через `drain()`: для ціни та свічок виграє останнє
+    значення, рядки логів і сигнали віддаються пачкою. Скільки оновлень злилося
+    в одне, видно в `coalesced`.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._price = None
+        self._price_received = None
+        self._candles = {}  # open_time → (o, h, l, c); останнє значення для кожної свічки
+        self._signals = []  # (час, сигнал, ціна, tracer.now() отримання кадру)
+        self._logs = []     # (повідомлення, force)
+        self._calls = []    # функції, які треба виконати в Tk-потоці
+        self.coalesced = {"price": 0, "candle": 0}
+
+    def set_price(self, price: float, received: float = None):
+        with self._lock:
+            if self._price is not None:
+                self.coalesced["price"] += 1
+            self._price = price
+            self._price_received = received
+
+    def set_candle(self, open_time: int, o: float, h: float, l: float, c: float):
+        with self._lock:
+            if open_time in self._candles:
+                self.coalesced["candle"] += 1
+            self._candles[open_time] = (o, h, l, c)
+
+    def discard_candles(self):
+        """Відкидає ще не забрані свічки (напр. після зміни інтервалу)."""
+        with self._lock:
+            self._candles = {}
+
+    def add_signal(self, signal: str, price: float, received: float = None):
+        with self._lock:
+            self._signals.append((time.time(), signal, price, received))
+
+    def log(self, message: str, force: bool = False):
+        with self._lock:
+            self._logs.append((message, force))
+
+    def post(self, callback):
+        """Виконати `callback()` у Tk-потоці на найближчому тіку (напр. з фонового завантаження)."""
+        with self._lock:
+            self._calls.append(callback)
+
+    def drain(self) -> dict:
+        """Забирає все накопичене з часу попереднього виклику."""
+        with self._lock:
+            batch = {
+                "price": self._price,
+                "price_received": self._price_received,
+                "candles": sorted(self._candles.items()),
+                "signals": self._signals,
+                "logs": self._logs,
+                "calls": self._calls,
+            }
+            self._price = None
+            self._candles = {}
+            self._signals = []
+            self._logs = []
+            self._calls = []
+        return batch
+
+    def pending(self) -> int:
+        with self._lock:
+            return ((self._price is not None) + len(self._candles) + len(self._signals) + len(self._logs)
+                    + len(self._calls))